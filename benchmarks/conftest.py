@@ -0,0 +1,79 @@
+"""Fixtures for the steeldesign benchmark suite.
+
+The suite uses pytest-benchmark and fixed synthetic inputs. Run it from the repository root::
+
+    python -m pytest benchmarks --benchmark-autosave
+
+Results are saved under ``.benchmarks/``. Compare them between revisions with
+``pytest-benchmark compare``. Print scaling curves with
+``python benchmarks/scaling.py .benchmarks/<machine>/<run>.json``.
+"""
+
+import numpy as np
+import pytest
+from steeldesign.codes import DesignCode, SteelGrade, Restraint
+from steeldesign.sections import UBSection
+from steeldesign.member import Member
+from steeldesign.library import read_csv
+
+
+# catalogue shipped with the tests
+UB_CSV = 'steeldesign/tests/ub.csv'
+
+
+@pytest.fixture(scope='session')
+def code():
+    return DesignCode()
+
+
+@pytest.fixture(scope='session')
+def grade():
+    return SteelGrade('3679.1-300')
+
+
+@pytest.fixture
+def section(code, grade):
+    """250UB37.3 section with an empty cache."""
+
+    props = [4750, None, 55700000, 435000, 486000, 108, 5660000, 77500, 119000, 34.5, 158000,
+             85200000000, 1]
+
+    return UBSection(code=code, name='250UB37.3', d=256, bf=146, tf=10.9, tw=6.4, r=8.9,
+                     grade=grade, props=props)
+
+
+@pytest.fixture(scope='session')
+def catalogue_data():
+    """Structured array of the UB catalogue."""
+
+    return read_csv(UB_CSV)
+
+
+def make_catalogue(data, size):
+    """Returns a synthetic catalogue of *size* sections by repeating *data* with the flange
+    widths scaled slightly so that no two sections are identical."""
+
+    catalogue = np.resize(data, size).copy()
+    catalogue['bf'] *= 1 + 1e-3 * (np.arange(size) // len(data))
+
+    return catalogue
+
+
+def make_bmd(n_points):
+    """Returns a parabolic bending moment diagram with a point load offset, sampled at
+    *n_points* stations."""
+
+    x = np.linspace(0, 1, n_points)
+
+    return np.column_stack((x, 200 * x * (1 - x) + 60 * np.minimum(x, 1 - x)))
+
+
+def make_member(section, n_segments):
+    """Returns a 12 m member with *n_segments* equal segments, fully restrained at its ends and
+    laterally restrained in between."""
+
+    positions = np.linspace(0, 1, n_segments + 1)
+    restraints = [Restraint('F' if i in (0, n_segments) else 'L', pos)
+                  for (i, pos) in enumerate(positions)]
+
+    return Member(section=section, length=12000, restraints=restraints)
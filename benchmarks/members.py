@@ -0,0 +1,84 @@
+"""Member construction benchmark of the steeldesign package.
+
+Builds a large number of members, each with a number of lateral restraints, and reports the
+construction time and the memory held per member (measured with :mod:`tracemalloc`).
+
+Usage::
+
+    python benchmarks/members.py [--members N] [--restraints N]
+
+Run from the repository root so that the local package is imported.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+from steeldesign.codes import DesignCode, SteelGrade, Restraint  # noqa: E402
+from steeldesign.sections import UBSection  # noqa: E402
+from steeldesign.member import Member  # noqa: E402
+
+
+def build_section():
+    """Returns a 250UB37.3 section."""
+
+    props = [4750, None, 55700000, 435000, 486000, 108, 5660000, 77500, 119000, 34.5, 158000,
+             85200000000, 1]
+
+    return UBSection(code=DesignCode(), name='250UB37.3', d=256, bf=146, tf=10.9, tw=6.4, r=8.9,
+                     grade=SteelGrade('3679.1-300'), props=props)
+
+
+def build_members(section, n_members, n_restraints):
+    """Builds *n_members* members with *n_restraints* intermediate restraints in random order."""
+
+    rng = random.Random(0)
+    members = []
+
+    for i in range(n_members):
+        restraints = [Restraint('F', 0), Restraint('F', 1)]
+        restraints += [Restraint('L', rng.random()) for j in range(n_restraints)]
+        rng.shuffle(restraints)
+
+        member = Member(section=section, length=12000, restraints=restraints[:2])
+
+        for restraint in restraints[2:]:
+            member.add_restraint(restraint)
+
+        members.append(member)
+
+    return members
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=100000, help='number of members')
+    parser.add_argument('--restraints', type=int, default=4,
+                        help='intermediate restraints per member')
+    args = parser.parse_args()
+
+    section = build_section()
+
+    start = time.perf_counter()
+    build_members(section, args.members, args.restraints)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    members = build_members(section, args.members, args.restraints)
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print('members:             {0}'.format(len(members)))
+    print('restraints/member:   {0}'.format(args.restraints + 2))
+    print('construction time:   {0:0.3f} s ({1:0.2f} us/member)'.format(
+        elapsed, elapsed / args.members * 1e6))
+    print('memory:              {0:0.1f} MB ({1:0.0f} B/member)'.format(
+        current / 1e6, current / args.members))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
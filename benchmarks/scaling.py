@@ -0,0 +1,43 @@
+"""Prints scaling curves from a saved pytest-benchmark json file.
+
+For each benchmark group whose benchmarks record a ``size`` in their extra info, prints the
+median time against size and the fitted exponent of time ~ size^k.
+
+Usage::
+
+    python benchmarks/scaling.py .benchmarks/<machine>/<run>.json
+"""
+
+import json
+import math
+import sys
+
+
+def main(path):
+    with open(path) as f:
+        results = json.load(f)
+
+    groups = {}
+
+    for bench in results['benchmarks']:
+        size = bench.get('extra_info', {}).get('size')
+
+        if size is not None:
+            groups.setdefault(bench['group'], []).append((size, bench['stats']['median']))
+
+    for (group, points) in sorted(groups.items()):
+        points.sort()
+        print(group)
+
+        for (size, median) in points:
+            print('    {0:>10}  {1:>12.3f} us'.format(size, median * 1e6))
+
+        if len(points) > 1:
+            ((s0, t0), (s1, t1)) = (points[0], points[-1])
+            print('    exponent    {0:>12.2f}'.format(math.log(t1 / t0) / math.log(s1 / s0)))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1]))
@@ -0,0 +1,141 @@
+"""Latency benchmark of the steeldesign HTTP service.
+
+Starts the service in a separate process and sends member checks from concurrent clients, each
+over its own keep-alive connection, then prints the request rate, the batching achieved and the
+latency percentiles.
+
+Usage::
+
+    python benchmarks/service.py [--clients N] [--requests N] [--cases N] [--workers N]
+        [--batch-window S]
+
+Run from the repository root so that the local package is imported.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+UB_CSV = os.path.join(os.path.dirname(__file__), '..', 'steeldesign', 'tests', 'ub.csv')
+
+SECTIONS = ['310UB40.4', '360UB50.7', '410UB59.7', '460UB74.6', '530UB92.4']
+
+
+def make_request(i, n_cases):
+    """Returns the body of the *i*-th member check."""
+
+    positions = [k / 10 for k in range(11)]
+    bmds = [[[x, (50 + i % 7 + case) * 4 * x * (1 - x)] for x in positions]
+            for case in range(n_cases)]
+
+    return json.dumps({
+        'section': SECTIONS[i % len(SECTIONS)],
+        'length': 4000 + 500 * (i % 9),
+        'restraints': [['F', 0], ['L', 0.5], ['F', 1]],
+        'load_position': ['WS', 'WT'],
+        'bmds': bmds,
+    }).encode()
+
+
+async def request(reader, writer, method, path, body=b''):
+    """Sends a request over a connection and returns the decoded response."""
+
+    writer.write('{0} {1} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {2}\r\n\r\n'.format(
+        method, path, len(body)).encode() + body)
+    await writer.drain()
+
+    headers = {}
+    await reader.readline()
+
+    while True:
+        line = await reader.readline()
+
+        if line == b'\r\n':
+            break
+
+        (name, value) = line.decode().split(':', 1)
+        headers[name.strip().lower()] = value.strip()
+
+    return json.loads(await reader.readexactly(int(headers['content-length'])))
+
+
+async def client(port, bodies, latencies):
+    """Sends checks one after the other, recording the latency of each."""
+
+    (reader, writer) = await asyncio.open_connection('127.0.0.1', port)
+
+    for body in bodies:
+        start = time.perf_counter()
+        response = await request(reader, writer, 'POST', '/check', body)
+        latencies.append(time.perf_counter() - start)
+
+        if 'error' in response:
+            raise Exception(response['error'])
+
+    writer.close()
+
+
+async def run(args):
+    # wait for the service to start
+    for i in range(100):
+        try:
+            (reader, writer) = await asyncio.open_connection('127.0.0.1', args.port)
+            break
+        except ConnectionError:
+            await asyncio.sleep(0.1)
+
+    await request(reader, writer, 'GET', '/health')
+
+    bodies = [make_request(i, args.cases) for i in range(args.requests)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args.port, bodies[k::args.clients], latencies)
+                           for k in range(args.clients)])
+    elapsed = time.perf_counter() - start
+
+    health = await request(reader, writer, 'GET', '/health')
+    writer.close()
+
+    latencies.sort()
+    print('requests        {0:>10}'.format(len(latencies)))
+    print('requests/s      {0:>10.0f}'.format(len(latencies) / elapsed))
+    print('batches         {0:>10}'.format(health['batches']))
+    print('pooled batches  {0:>10}'.format(health['pooled_batches']))
+
+    for (label, q) in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+        print('{0:<16}{1:>10.2f} ms'.format(label, latencies[int(q * (len(latencies) - 1))] * 1000))
+
+    print('{0:<16}{1:>10.2f} ms'.format('mean', statistics.mean(latencies) * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32, help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=10000, help='total requests')
+    parser.add_argument('--cases', type=int, default=1, help='load cases per request')
+    parser.add_argument('--workers', type=int, default=0, help='service worker processes')
+    parser.add_argument('--batch-window', default='0.001', help='service batch window [s]')
+    parser.add_argument('--port', type=int, default=8199, help='service port')
+    args = parser.parse_args()
+
+    service = subprocess.Popen([sys.executable, '-m', 'steeldesign.service', '--sections', UB_CSV,
+                                '--port', str(args.port), '--workers', str(args.workers),
+                                '--batch-window', args.batch_window])
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        service.terminate()
+        service.wait()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
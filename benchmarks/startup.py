@@ -0,0 +1,98 @@
+"""Start-up benchmark of the steeldesign package.
+
+Measures the wall time of importing each steeldesign module in a fresh interpreter, relative to
+starting an interpreter that imports nothing, and checks it against an import-time budget. Also
+checks that heavy optional dependencies are not imported until they are used.
+
+Usage::
+
+    python benchmarks/startup.py [--repeat N] [--budget MS]
+
+Run from the repository root so that the local package is imported.
+
+Exits with a non-zero status if a module exceeds the budget or imports a lazy dependency.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+# modules whose import time is measured
+MODULES = [
+    'steeldesign.codes',
+    'steeldesign.sections',
+    'steeldesign.member',
+    'steeldesign.tables',
+    'steeldesign.batch',
+    'steeldesign.library',
+    'steeldesign.selection',
+    'steeldesign.parallel',
+    'steeldesign.cli',
+    'steeldesign.service',
+]
+
+# dependencies that must only be imported on first use
+LAZY_MODULES = ['scipy', 'matplotlib', 'pyarrow']
+
+# import-time budget per module in excess of a bare interpreter start-up [ms]
+IMPORT_BUDGET_MS = 250
+
+
+def time_command(code, repeat):
+    """Returns the median wall time [ms] of running *code* in a fresh interpreter."""
+
+    times = []
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(times)
+
+
+def lazy_modules_imported(module):
+    """Returns the lazy dependencies that are imported by importing *module*."""
+
+    code = 'import sys, {0}; print(" ".join(sys.modules))'.format(module)
+    loaded = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout.split()
+
+    return [lazy for lazy in LAZY_MODULES if lazy in loaded]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=7, help='runs per module')
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_MS,
+                        help='import-time budget per module [ms]')
+    args = parser.parse_args()
+
+    baseline = time_command('pass', args.repeat)
+    print('{0:<24}{1:>10.1f} ms'.format('interpreter', baseline))
+
+    failed = False
+
+    for module in MODULES:
+        import_time = time_command('import {0}'.format(module), args.repeat) - baseline
+        lazy = lazy_modules_imported(module)
+        status = 'ok'
+
+        if import_time > args.budget:
+            status = 'OVER BUDGET'
+            failed = True
+
+        if lazy:
+            status = 'imports {0}'.format(', '.join(lazy))
+            failed = True
+
+        print('{0:<24}{1:>10.1f} ms   {2}'.format(module, import_time, status))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
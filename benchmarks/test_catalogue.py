@@ -0,0 +1,61 @@
+import pytest
+from steeldesign.library import SectionLibrary, compile_csv, read_csv
+from steeldesign.tables import SectionTable
+from conftest import UB_CSV, make_catalogue
+pytest.importorskip('pytest_benchmark')
+
+
+CATALOGUE_SIZES = [28, 280, 2800, 28000]
+
+
+@pytest.mark.benchmark(group='catalogue-import')
+def test_read_csv(benchmark):
+    benchmark(read_csv, UB_CSV)
+
+
+@pytest.mark.benchmark(group='catalogue-import')
+def test_library_open(benchmark, tmp_path, code, grade):
+    npy_path = compile_csv(UB_CSV, str(tmp_path / 'ub.npy'))
+
+    def run():
+        library = SectionLibrary(npy_path, code, grade)
+        return [section for section in library]
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize('size', CATALOGUE_SIZES)
+@pytest.mark.benchmark(group='catalogue-phi_msx vs sections')
+def test_table_phi_msx(benchmark, catalogue_data, code, grade, size):
+    table = SectionTable(code, grade, make_catalogue(catalogue_data, size))
+    benchmark.extra_info['size'] = size
+
+    benchmark(table.calc_phi_msx)
+
+
+@pytest.mark.parametrize('size', CATALOGUE_SIZES[:3])
+@pytest.mark.benchmark(group='catalogue-objects phi_msx vs sections')
+def test_objects_phi_msx(benchmark, catalogue_data, code, grade, size):
+    sections = SectionTable(code, grade, make_catalogue(catalogue_data, size))
+    sections = [sections.get_section(i) for i in range(size)]
+    benchmark.extra_info['size'] = size
+
+    def run():
+        phi_msx = []
+
+        for section in sections:
+            section.clear_cache()
+            phi_msx.append(section.calc_phi_msx())
+
+        return phi_msx
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize('size', CATALOGUE_SIZES)
+@pytest.mark.benchmark(group='catalogue-full restraint length vs sections')
+def test_table_full_restraint_length(benchmark, catalogue_data, code, grade, size):
+    table = SectionTable(code, grade, make_catalogue(catalogue_data, size))
+    benchmark.extra_info['size'] = size
+
+    benchmark(table.full_restraint_length, [1.0, 1.13, 1.35, 1.75, 2.5])
@@ -0,0 +1,27 @@
+import pytest
+from conftest import make_bmd, make_member
+pytest.importorskip('pytest_benchmark')
+
+
+SEGMENTS = [1, 4, 16, 64]
+BMD_POINTS = [11, 101, 1001, 10001]
+
+
+@pytest.mark.parametrize('n_segments', SEGMENTS)
+@pytest.mark.benchmark(group='member-phi_mbx vs segments')
+def test_member_phi_mbx_segments(benchmark, section, n_segments):
+    member = make_member(section, n_segments)
+    bmd = make_bmd(101)
+    benchmark.extra_info['size'] = n_segments
+
+    benchmark(member.calc_phi_mbx, bmd, ['WS'] * n_segments)
+
+
+@pytest.mark.parametrize('n_points', BMD_POINTS)
+@pytest.mark.benchmark(group='member-phi_mbx vs bmd points')
+def test_member_phi_mbx_points(benchmark, section, n_points):
+    member = make_member(section, 4)
+    bmd = make_bmd(n_points)
+    benchmark.extra_info['size'] = n_points
+
+    benchmark(member.calc_phi_mbx, bmd, ['WS'] * 4)
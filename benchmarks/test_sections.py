@@ -0,0 +1,45 @@
+import pytest
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.benchmark(group='section')
+def test_calc_phi_msx(benchmark, section):
+    def run():
+        section.clear_cache()
+        return section.calc_phi_msx()
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group='section')
+def test_calc_phi_msx_cached(benchmark, section):
+    benchmark(section.calc_phi_msx)
+
+
+@pytest.mark.benchmark(group='section')
+def test_calc_m0(benchmark, section):
+    def run():
+        section.clear_cache()
+        return section.calc_m0(4000)
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group='section')
+def test_calc_phi_mbx(benchmark, section):
+    def run():
+        section.clear_cache()
+        return section.calc_phi_mbx(4000, 1.13)
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group='section')
+def test_full_restraint_length(benchmark, section):
+    pytest.importorskip('scipy')
+
+    def run():
+        section.clear_cache()
+        return section.full_restraint_length(1.13)
+
+    benchmark(run)
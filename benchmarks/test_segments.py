@@ -0,0 +1,29 @@
+import pytest
+from steeldesign.codes import Restraint
+from steeldesign.member import Segment
+from conftest import make_bmd
+pytest.importorskip('pytest_benchmark')
+
+
+BMD_POINTS = [11, 101, 1001, 10001]
+
+
+@pytest.mark.parametrize('n_points', BMD_POINTS)
+@pytest.mark.benchmark(group='segment-init vs bmd points')
+def test_segment_init(benchmark, section, n_points):
+    bmd = make_bmd(n_points)
+    restraint1 = Restraint('F', 0.2)
+    restraint2 = Restraint('L', 0.7)
+    benchmark.extra_info['size'] = n_points
+
+    benchmark(Segment, 12000, restraint1, restraint2, 'WS', bmd, section)
+
+
+@pytest.mark.parametrize('n_points', BMD_POINTS)
+@pytest.mark.benchmark(group='segment-alpha_m vs bmd points')
+def test_segment_calc_alpha_m(benchmark, section, n_points):
+    segment = Segment(12000, Restraint('F', 0.2), Restraint('L', 0.7), 'WS', make_bmd(n_points),
+                      section)
+    benchmark.extra_info['size'] = n_points
+
+    benchmark(segment.calc_alpha_m)
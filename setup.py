@@ -15,7 +15,13 @@ if (sys.version_info[0] < 3 or
         sys.version_info[0] == 3 and sys.version_info[1] < 5):
     sys.exit('Sorry, Python < 3.5 is not supported')
 
-install_requires = ['numpy', 'matplotlib']
+install_requires = ['numpy']
+
+# optional dependencies, imported on first use only
+extras_require = {
+    'solvers': ['scipy'],
+    'columnar': ['pyarrow'],
+}
 
 setup(name='steeldesign',
       version='0.0.1',
@@ -35,5 +41,10 @@ setup(name='steeldesign',
       license='MIT',
       packages=['steeldesign'],
       install_requires=install_requires,
+      extras_require=extras_require,
+      entry_points={
+          'console_scripts': ['steeldesign = steeldesign.cli:main',
+                              'steeldesign-service = steeldesign.service:main'],
+      },
       include_package_data=True,
       zip_safe=False)
@@ -0,0 +1,299 @@
+import numpy as np
+from steeldesign.member import QUARTERS, calc_alpha_m_segments
+from steeldesign.profiling import instrument
+
+
+# restraint codes (sorted characters) for which the twist restraint factor is 1
+KT_UNITY_CODES = ('FF', 'FL', 'LL', 'FU')
+
+# restraint codes (sorted characters) with one partially restrained end
+KT_PARTIAL_CODES = ('FP', 'LP', 'PU')
+
+# restraint codes (sorted characters) with two partially restrained ends
+KT_PARTIAL2_CODES = ('PP',)
+
+# restraint codes (sorted characters) with an unrestrained end
+UNRESTRAINED_CODES = ('FU', 'PU')
+
+
+@instrument()
+def calc_phi_mbx_batch(members, bmds, load_positions, alpha_m=None):
+    """Calculates phiMbx for every segment of many members under many load cases in one call.
+
+    Segmentation, alpha_m and effective lengths are evaluated with array operations over all
+    segments and load cases of a member rather than by building
+    :class:`~steeldesign.member.Segment` objects. Results match those of
+    :meth:`steeldesign.member.Member.calc_phi_mbx`.
+
+    :param members: List of members to check
+    :type members: list[:class:`~steeldesign.member.Member`]
+    :param bmds: Bending moment diagrams of each member. Either a single stack of size
+        *(n_cases x n_points x 2)* applied to all members, or a list with one entry per member
+        that is either a stack of size *(n_cases x n_points x 2)* or a list of *n_cases* arrays
+        of size *(n_points x 2)* with varying *n_points*
+    :type bmds: :class:`numpy.ndarray` or list
+    :param load_positions: List with one list of load position strings per member, see
+        :meth:`~steeldesign.member.Member.calc_phi_mbx`
+    :type load_positions: list[list[string]]
+    :param alpha_m: Optional list with one list of alpha_m values per member to override those
+        calculated from the bmds
+    :type alpha_m: list[list[float]]
+    :returns: phiMbx of size *(n_members x n_cases x max_segments)*, padded with *nan* for
+        members with fewer segments
+    :rtype: :class:`numpy.ndarray`
+
+    :raises Exception: If the number of bmds or load positions does not equal the number of
+        members, or the members do not have the same number of load cases
+    """
+
+    if isinstance(bmds, np.ndarray) and bmds.ndim == 3:
+        bmds = [bmds] * len(members)
+
+    if len(bmds) != len(members) or len(load_positions) != len(members):
+        raise Exception('Size of bmds and load_positions must equal number of members')
+
+    n_cases = len(bmds[0]) if len(members) else 0
+    n_seg_max = max([len(member.restraints) - 1 for member in members] + [0])
+    phi_mbx = np.full((len(members), n_cases, n_seg_max), np.nan)
+
+    for (i, member) in enumerate(members):
+        if len(bmds[i]) != n_cases:
+            raise Exception('All members must have the same number of load cases')
+
+        positions = np.array([restraint.pos for restraint in member.restraints])
+        n_seg = len(positions) - 1
+
+        # effective lengths are independent of the load case
+        le = calc_effective_lengths(member, load_positions[i])
+
+        if alpha_m is None:
+            am = calc_alpha_m_segments(bmds[i], positions)
+        else:
+            if len(alpha_m[i]) != n_seg:
+                raise Exception('Size of alpha_m must equal number of segments')
+
+            am = np.broadcast_to(np.asarray(alpha_m[i], dtype=float), (n_cases, n_seg))
+
+        phi_mbx[i, :, :n_seg] = member.section.calc_phi_mbx(le=le[None, :], alpha_m=am)
+
+    return phi_mbx
+
+
+@instrument()
+def calc_phi_mbx_ragged(members, bmds, load_positions):
+    """Returns M* and phiMbx for every segment of many members, each with its own number of load
+    cases, segments and bending moment diagram stations.
+
+    Unlike :func:`calc_phi_mbx_batch` the calculations are not looped per member or load case,
+    only the inputs of each member are gathered into flat arrays: the bending moment diagrams of
+    all load cases of all members are concatenated, with each diagram offset along the stations
+    so that they remain in ascending order, and interpolated at all segment ends and quarter
+    points in one pass. Effective lengths and phiMbx are then evaluated once per distinct
+    section. This suits many small checks, e.g. concurrent requests to a service.
+    Results match :func:`calc_phi_mbx_batch` and
+    :func:`~steeldesign.member.calc_design_moments`.
+
+    :param members: List of members to check
+    :type members: list[:class:`~steeldesign.member.Member`]
+    :param bmds: List with one list of bending moment diagrams of size *(n_points x 2)*, with
+        ascending positions, (or stack of size *(n_cases x n_points x 2)*) per member
+    :type bmds: list
+    :param load_positions: List with one list of load position strings per member
+    :type load_positions: list[list[string]]
+    :returns: M* and phiMbx, each of size *(n_cases x n_segments)*, of each member
+    :rtype: list[tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`)]
+
+    :raises Exception: If the number of bmds or load positions does not equal the number of
+        members, the number of load positions of a member does not equal its number of segments
+        or a restraint code is invalid
+    """
+
+    if len(bmds) != len(members) or len(load_positions) != len(members):
+        raise Exception('Size of bmds and load_positions must equal number of members')
+
+    positions = [np.array([restraint.pos for restraint in member.restraints])
+                 for member in members]
+    n_cases = np.array([len(member_bmds) for member_bmds in bmds], dtype=int)
+    n_seg = np.array([len(pos) - 1 for pos in positions], dtype=int)
+
+    if (np.array([len(lp) for lp in load_positions], dtype=int) != n_seg).any():
+        raise Exception('Size of load_position must equal number of segments')
+
+    if not n_cases.any():
+        return [(np.zeros((0, n)), np.zeros((0, n))) for n in n_seg]
+
+    # rows (member, load case) and their stations offset by row
+    row_member = np.repeat(np.arange(len(members)), n_cases)
+    rows = [np.asarray(bmd, dtype=float) for member_bmds in bmds for bmd in member_bmds]
+    n_pts = np.array([len(bmd) for bmd in rows], dtype=int)
+    x = np.concatenate([bmd[:, 0] for bmd in rows])
+    m = np.concatenate([bmd[:, 1] for bmd in rows])
+    pos = np.concatenate([positions[i] for i in row_member])
+    span = np.ptp(np.concatenate((x, pos))) + 1
+    x_row = np.repeat(np.arange(len(rows)), n_pts)
+    x = x + span * x_row
+
+    # restraint positions of each row and the station range of each row, which interpolation is
+    # clipped to so that the bmd is held constant beyond its ends as by numpy.interp
+    pos_row = np.repeat(np.arange(len(rows)), n_seg[row_member] + 1)
+    pos = pos + span * pos_row
+    first = np.cumsum(n_pts) - n_pts
+    (x_min, x_max) = (x[first][pos_row], x[first + n_pts - 1][pos_row])
+
+    # segments lie between consecutive positions of the same row
+    seg = np.flatnonzero(pos_row[1:] == pos_row[:-1])
+    (start, end) = (pos[seg], pos[seg + 1])
+    bm_ends = np.interp(np.clip(pos, x_min, x_max), x, m)
+    bm_quarters = np.interp(np.clip(start[:, None] + QUARTERS * (end - start)[:, None],
+                                    x_min[seg, None], x_max[seg, None]), x, m)
+
+    # maxima of the stations strictly within each segment
+    bm_max = np.full(len(pos), -np.inf)
+    m_star = np.full(len(pos), -np.inf)
+    k = np.searchsorted(pos, x, side='left')
+    inside = (k > 0) & (k < len(pos))
+    inside[inside] &= (pos[k[inside]] != x[inside]) & (pos_row[k[inside] - 1] == x_row[inside])
+    np.maximum.at(bm_max, k[inside] - 1, m[inside])
+    np.maximum.at(m_star, k[inside] - 1, np.abs(m[inside]))
+    bm_max = np.maximum(bm_max[seg], np.maximum(bm_ends[seg], bm_ends[seg + 1]))
+    m_star = np.maximum(m_star[seg], np.maximum(np.abs(bm_ends[seg]), np.abs(bm_ends[seg + 1])))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alpha_m = np.minimum(2.5, 1.7 * bm_max / np.sqrt((bm_quarters ** 2).sum(axis=-1)))
+
+    # segments of the members, their section index, restraint codes, lengths and load positions
+    seg_first = np.cumsum(n_seg) - n_seg
+    sections = {}
+    member_section = np.array([sections.setdefault(id(member.section), len(sections))
+                               for member in members], dtype=int)
+    seg_section = np.repeat(member_section, n_seg)
+    res_codes = np.array([r[j].rtype + r[j + 1].rtype for r in
+                          (member.restraints for member in members) for j in range(len(r) - 1)],
+                         dtype='U2')
+    seg_length = np.concatenate([member.length * np.diff(pos)
+                                 for (member, pos) in zip(members, positions)])
+    seg_load_position = np.array([lp for member_lp in load_positions for lp in member_lp],
+                                 dtype='U2')
+
+    # member segment of each segment of each row
+    row_first = np.cumsum(n_seg[row_member]) - n_seg[row_member]
+    seg_index = (np.repeat(seg_first[row_member] - row_first, n_seg[row_member]) +
+                 np.arange(len(seg)))
+
+    # effective lengths and phiMbx of the segments of each section
+    le = np.empty(len(seg_section))
+    phi_mbx = np.empty(len(seg))
+    section_of = seg_section[seg_index]
+
+    for (k, i) in enumerate(np.unique(member_section, return_index=True)[1]):
+        section = members[i].section
+        in_section = seg_section == k
+        le[in_section] = calc_segment_effective_lengths(
+            section, res_codes[in_section], seg_length[in_section],
+            seg_load_position[in_section])
+
+        in_section = section_of == k
+        phi_mbx[in_section] = section.calc_phi_mbx(le=le[seg_index[in_section]],
+                                                   alpha_m=alpha_m[in_section])
+
+    # split the segments by member
+    bounds = np.cumsum(n_seg * n_cases)[:-1]
+
+    return [(m_i.reshape(-1, n_seg[i]), phi_i.reshape(-1, n_seg[i])) for (i, (m_i, phi_i)) in
+            enumerate(zip(np.split(m_star, bounds), np.split(phi_mbx, bounds)))]
+
+
+def calc_effective_lengths(member, load_position):
+    """Returns the effective length of every segment of a member.
+
+    Cl. 5.6.3 AS4100-1998
+
+    :param member: Member to calculate the effective lengths for
+    :type member: :class:`~steeldesign.member.Member`
+    :param load_position: List of strings defining the load position within each segment
+    :type load_position: list[string]
+    :returns: Effective length of each segment
+    :rtype: :class:`numpy.ndarray`
+
+    :raises Exception: Size of load_position is not equal to the number of segments
+    :raises Exception: If a restraint code is incorrect
+    :raises Exception: If a load_position code is incorrect
+    """
+
+    restraints = member.restraints
+
+    if len(load_position) != len(restraints) - 1:
+        raise Exception('Size of load_position must equal number of segments')
+
+    positions = np.array([restraint.pos for restraint in restraints])
+    res_codes = np.array([
+        restraints[i].rtype + restraints[i + 1].rtype for i in range(len(restraints) - 1)
+    ], dtype='U2')
+
+    return calc_segment_effective_lengths(member.section, res_codes,
+                                          member.length * np.diff(positions), load_position)
+
+
+def calc_segment_effective_lengths(section, res_codes, segment_length, load_position):
+    """Returns the effective lengths of segments given arrays of restraint codes, segment lengths
+    and load positions, which are broadcast against each other.
+
+    Cl. 5.6.3 AS4100-1998
+
+    :param section: Section of the segments
+    :type section: :class:`~steeldesign.sections.SteelSection`
+    :param res_codes: Restraint code(s) of the segment ends, e.g. 'FL'
+    :type res_codes: string or :class:`numpy.ndarray`
+    :param segment_length: Segment length(s)
+    :type segment_length: float or :class:`numpy.ndarray`
+    :param load_position: Load position code(s) - 'WS', 'ES', 'WT' or 'ET'
+    :type load_position: string or :class:`numpy.ndarray`
+    :returns: Effective length of each segment
+    :rtype: :class:`numpy.ndarray`
+
+    :raises Exception: If a restraint code is incorrect
+    :raises Exception: If a load_position code is incorrect
+    """
+
+    res_codes = np.asarray(res_codes, dtype='U2')
+    sorted_codes = np.array([''.join(sorted(code)) for code in res_codes.ravel().tolist()],
+                            dtype='U2').reshape(res_codes.shape)
+    segment_length = np.asarray(segment_length, dtype=float)
+    load_position = np.asarray(load_position, dtype='U2')
+
+    # calculate twist restraint factor
+    unity = np.isin(sorted_codes, KT_UNITY_CODES)
+    partial = np.isin(sorted_codes, KT_PARTIAL_CODES)
+    partial2 = np.isin(sorted_codes, KT_PARTIAL2_CODES)
+
+    invalid = ~(unity | partial | partial2)
+    if invalid.any():
+        raise Exception('Restraint code {0} is invalid'.format(res_codes[invalid][0]))
+
+    kt = np.ones(sorted_codes.shape)
+
+    if (partial | partial2).any():
+        d1 = section.calc_dw()
+        tf = section.get_tf()
+        tw = section.get_tw()
+        nw = section.get_nw()
+
+        kt_p = (d1 / segment_length) * (tf / 2 / tw) ** 3 / nw
+        kt = np.where(partial, 1 + kt_p, np.where(partial2, 1 + 2 * kt_p, kt))
+
+    # calculate load height factor
+    unrestrained = np.isin(sorted_codes, UNRESTRAINED_CODES)
+    shear_centre = np.isin(load_position, ['WS', 'ES'])
+    within_top = load_position == 'WT'
+    end_top = load_position == 'ET'
+
+    invalid = ~(shear_centre | within_top | end_top)
+    if invalid.any():
+        raise Exception('Load position code {0} is invalid'.format(load_position[invalid][0]))
+
+    kl = np.where(unrestrained & (within_top | end_top), 2, np.where(within_top, 1.4, 1))
+
+    # calculate lateral rotation restraint factor, see Segment.calc_effective_length
+    kr = 1
+
+    return kt * kl * kr * segment_length
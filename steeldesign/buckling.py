@@ -0,0 +1,553 @@
+import numpy as np
+from steeldesign.cache import CacheStats, LRUCache
+from steeldesign.profiling import count, instrument
+
+
+# default number of finite elements per segment
+N_ELEMENTS = 16
+
+# maximum number of factorised stiffness matrices cached
+STIFFNESS_CACHE_SIZE = 256
+
+# restraint types preventing twist of the cross-section
+TWIST_RESTRAINTS = ('F', 'P', 'R')
+
+# gauss points and weights on [0, 1], exact for the products of the hermite shape functions
+GAUSS_POINTS = 0.5 + 0.5 * np.polynomial.legendre.leggauss(4)[0]
+GAUSS_WEIGHTS = 0.5 * np.polynomial.legendre.leggauss(4)[1]
+
+# relative tolerance of the initial estimate of the lowest load factor
+ESTIMATE_TOLERANCE = 0.1
+
+# ratio of the shift of the eigensolver to the estimate of the lowest load factor
+SHIFT_RATIO = 0.9
+
+# maximum number of times the shift is halved to find a positive definite shifted matrix
+MAX_SHIFT_HALVINGS = 30
+
+# factorised stiffness matrices and uniform moment buckling moments keyed by their inputs
+STIFFNESS_CACHE = LRUCache(STIFFNESS_CACHE_SIZE, CacheStats())
+
+
+def shape_functions(xi, h):
+    """Returns the cubic hermite shape functions and their first and second derivatives of
+    elements of length *h* at the relative positions *xi*, for the element degrees of freedom
+    *(w1, w1', w2, w2')*.
+
+    :param xi: Relative position(s) within the elements *(0 <= xi <= 1)*
+    :type xi: :class:`numpy.ndarray`
+    :param h: Element length(s)
+    :type h: float or :class:`numpy.ndarray`
+    :returns: Shape functions and their first and second derivatives, each of size
+        *xi.shape + (4,)*
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+    """
+
+    xi = np.asarray(xi, dtype=float)
+    h = np.broadcast_to(h, xi.shape)
+
+    n = np.stack((1 - 3 * xi ** 2 + 2 * xi ** 3, h * (xi - 2 * xi ** 2 + xi ** 3),
+                  3 * xi ** 2 - 2 * xi ** 3, h * (xi ** 3 - xi ** 2)), axis=-1)
+    dn = np.stack(((-6 * xi + 6 * xi ** 2) / h, 1 - 4 * xi + 3 * xi ** 2,
+                   (6 * xi - 6 * xi ** 2) / h, 3 * xi ** 2 - 2 * xi), axis=-1)
+    ddn = np.stack(((-6 + 12 * xi) / h ** 2, (-4 + 6 * xi) / h, (6 - 12 * xi) / h ** 2,
+                    (6 * xi - 2) / h), axis=-1)
+
+    return (n, dn, ddn)
+
+
+class BucklingModel:
+    """Finite element model of the lateral-torsional buckling of a doubly symmetric beam bent
+    about its major axis.
+
+    The lateral deflection u and the twist phi of the shear centre are discretised with cubic
+    hermite elements, four degrees of freedom *(u, u', phi, phi')* per node. The elastic buckling
+    load factor lambda of a bending moment diagram is the smallest positive root of
+    det(K + lambda * G) = 0, where K is the stiffness matrix and G the geometric matrix of the
+    bending moments and of the loads applied above or below the shear centre. A rough estimate
+    of lambda, the largest eigenvalue of -G x = (1 / lambda) K x, is found with
+    :func:`scipy.sparse.linalg.eigsh` using a cached sparse factorisation of K, and refined by
+    shift-invert iteration about a shift verified to lie below lambda.
+
+    Restraints map to boundary conditions at the nodes:
+
+    * **F**, **P** - u = phi = 0 (the distortion of the web allowed by a partial restraint is
+      not modelled);
+    * **R** - u = u' = phi = 0;
+    * **L** - the critical flange is prevented from deflecting laterally;
+    * **U** - free.
+
+    :param section: Section of the beam
+    :type section: :class:`~steeldesign.sections.SteelSection`
+    :param nodes: Positions of the nodes along the beam [mm] in ascending order
+    :type nodes: :class:`numpy.ndarray`
+    """
+
+    def __init__(self, section, nodes):
+        """Inits the BucklingModel class."""
+
+        self.section = section
+        self.nodes = np.asarray(nodes, dtype=float)
+        self.n_dof = 4 * len(self.nodes)
+
+        e = section.code.elastic_modulus
+        g = section.code.shear_modulus
+        self.props = (e * section.iyy, g * section.j, e * section.iw,
+                      section.d - section.tf, section.d)
+
+        # element dofs and shape functions at the gauss points
+        n_el = len(self.nodes) - 1
+        self.h = np.diff(self.nodes)
+        first = 4 * np.arange(n_el)[:, None]
+        self.u_dofs = first + np.array([0, 1, 4, 5])
+        self.phi_dofs = first + np.array([2, 3, 6, 7])
+        (self.n, self.dn, self.ddn) = shape_functions(
+            np.broadcast_to(GAUSS_POINTS, (n_el, len(GAUSS_POINTS))), self.h[:, None])
+        self.weights = GAUSS_WEIGHTS * self.h[:, None]
+
+    def get_key(self):
+        """Returns a key identifying the stiffness of the model."""
+
+        return self.props + (self.nodes.tobytes(),)
+
+    def _assemble(self, rows, cols, values):
+        """Returns a sparse matrix from element blocks."""
+
+        from scipy import sparse
+
+        rows = np.broadcast_to(rows[:, :, None], values.shape)
+        cols = np.broadcast_to(cols[:, None, :], values.shape)
+
+        return sparse.coo_matrix((values.ravel(), (rows.ravel(), cols.ravel())),
+                                 shape=(self.n_dof, self.n_dof)).tocsc()
+
+    def calc_stiffness_matrix(self):
+        """Returns the elastic stiffness matrix.
+
+        :returns: Stiffness matrix
+        :rtype: :class:`scipy.sparse.csc_matrix`
+        """
+
+        (ei_y, gj, ei_w, h, d) = self.props
+        bending = np.einsum('eg,egi,egj->eij', self.weights, self.ddn, self.ddn)
+        torsion = np.einsum('eg,egi,egj->eij', self.weights, self.dn, self.dn)
+
+        return (self._assemble(self.u_dofs, self.u_dofs, ei_y * bending) +
+                self._assemble(self.phi_dofs, self.phi_dofs, ei_w * bending + gj * torsion))
+
+    def calc_geometric_matrix(self, moments, loads=None, load_height=0):
+        """Returns the geometric matrix of a bending moment diagram.
+
+        :param moments: Bending moment at the gauss points of each element [N.mm] of size
+            *(n_elements x 4)*
+        :type moments: :class:`numpy.ndarray`
+        :param loads: Transverse point loads *(position [mm], load [N])* of size *(n x 2)*, loads
+            in the direction producing positive moments are positive
+        :type loads: :class:`numpy.ndarray`
+        :param load_height: Height of the loads above the shear centre [mm], a single height or
+            the height of each load
+        :type load_height: float or :class:`numpy.ndarray`
+        :returns: Geometric matrix
+        :rtype: :class:`scipy.sparse.csc_matrix`
+        """
+
+        coupling = np.einsum('eg,egi,egj->eij', self.weights * moments, self.ddn, self.n)
+        geometric = (self._assemble(self.u_dofs, self.phi_dofs, coupling) +
+                     self._assemble(self.phi_dofs, self.u_dofs, coupling.transpose(0, 2, 1)))
+
+        if loads is not None and len(loads) and np.any(load_height):
+            # loads above the shear centre reduce the torsional stiffness
+            el = np.clip(np.searchsorted(self.nodes, loads[:, 0], side='right') - 1, 0,
+                         len(self.h) - 1)
+            (n, dn, ddn) = shape_functions((loads[:, 0] - self.nodes[el]) / self.h[el],
+                                           self.h[el])
+            values = -(loads[:, 1] * load_height)[:, None, None] * n[:, :, None] * n[:, None, :]
+            geometric = geometric + self._assemble(self.phi_dofs[el], self.phi_dofs[el], values)
+
+        return geometric
+
+    def calc_moments(self, bmd):
+        """Returns the bending moments at the gauss points of each element.
+
+        :param bmd: Bending moment diagram *(position [mm], moment [N.mm])* of size *(n x 2)*
+        :type bmd: :class:`numpy.ndarray`
+        :returns: Bending moments of size *(n_elements x 4)*
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        z = self.nodes[:-1, None] + GAUSS_POINTS * self.h[:, None]
+
+        return np.interp(z, bmd[:, 0], bmd[:, 1])
+
+    def get_constraints(self, restraints):
+        """Returns the fixed degrees of freedom and the flange restraints of a set of restraints.
+
+        :param restraints: Restraints *(node index, restraint type, critical flange)* where the
+            critical flange is +1 for the top flange (in compression under positive moments) and
+            -1 for the bottom flange
+        :type restraints: list[tuple(int, string, int)]
+        :returns: Fixed degrees of freedom and the *(node, flange)* of each flange restraint
+        :rtype: tuple(list[int], list[tuple(int, int)])
+
+        :raises Exception: If a restraint type is invalid
+        """
+
+        fixed = []
+        flanges = []
+
+        for (node, rtype, flange) in restraints:
+            if rtype in ('F', 'P'):
+                fixed += [4 * node, 4 * node + 2]
+            elif rtype == 'R':
+                fixed += [4 * node, 4 * node + 1, 4 * node + 2]
+            elif rtype == 'L':
+                flanges.append((node, flange))
+            elif rtype != 'U':
+                raise Exception('Restraint type {0} is invalid'.format(rtype))
+
+        return (fixed, flanges)
+
+    def get_solver(self, restraints):
+        """Returns the constrained stiffness matrix and its factorisation, cached by section,
+        mesh and restraints.
+
+        :param restraints: Restraints, see :meth:`get_constraints`
+        :type restraints: list[tuple(int, string, int)]
+        :returns: Transformation from the unconstrained degrees of freedom to all degrees of
+            freedom, constrained stiffness matrix and its factorisation
+        :rtype: tuple(:class:`scipy.sparse.csc_matrix`, :class:`scipy.sparse.csc_matrix`,
+            :class:`scipy.sparse.linalg.SuperLU`)
+        """
+
+        key = self.get_key() + (tuple(restraints),)
+
+        return STIFFNESS_CACHE.get(key, lambda: self._factorise(restraints))
+
+    def _factorise(self, restraints):
+        """Builds and factorises the constrained stiffness matrix, see :meth:`get_solver`."""
+
+        from scipy import sparse
+        from scipy.sparse import linalg
+
+        (fixed, flanges) = self.get_constraints(restraints)
+
+        # a restrained flange ties the lateral deflection to the twist, u = -flange * h / 2 * phi
+        tied = [4 * node for (node, flange) in flanges]
+        free = np.setdiff1d(np.arange(self.n_dof), fixed + tied)
+        column = np.full(self.n_dof, -1)
+        column[free] = np.arange(len(free))
+
+        rows = list(free)
+        cols = list(range(len(free)))
+        values = [1.0] * len(free)
+
+        for (node, flange) in flanges:
+            if column[4 * node + 2] >= 0:
+                rows.append(4 * node)
+                cols.append(column[4 * node + 2])
+                values.append(-flange * self.props[3] / 2)
+
+        t = sparse.coo_matrix((values, (rows, cols)), shape=(self.n_dof, len(free))).tocsc()
+        k = (t.T @ self.calc_stiffness_matrix() @ t).tocsc()
+        count('buckling.factorisations')
+
+        return (t, k, linalg.splu(k))
+
+    @instrument()
+    def calc_load_factor(self, restraints, geometric):
+        """Returns the lowest positive elastic buckling load factor.
+
+        :param restraints: Restraints, see :meth:`get_constraints`
+        :type restraints: list[tuple(int, string, int)]
+        :param geometric: Geometric matrix, see :meth:`calc_geometric_matrix`
+        :type geometric: :class:`scipy.sparse.csc_matrix`
+        :returns: Load factor, *inf* if the beam does not buckle
+        :rtype: float
+
+        :raises Exception: If no shift below the lowest load factor is found within
+            :data:`MAX_SHIFT_HALVINGS` halvings
+        """
+
+        from scipy.sparse import linalg
+
+        (t, k, lu) = self.get_solver(restraints)
+        a = (-(t.T @ geometric @ t)).tocsc()
+
+        # estimate, the ritz value never exceeds the largest eigenvalue 1 / lambda
+        inverse = linalg.LinearOperator(k.shape, matvec=lu.solve, dtype=float)
+        mu = linalg.eigsh(a, k=1, M=k, Minv=inverse, which='LA', tol=ESTIMATE_TOLERANCE,
+                          return_eigenvectors=False)[0]
+
+        if mu <= 0:
+            return np.inf
+
+        # shift below the lowest load factor, i.e. K - shift * a is positive definite and all
+        # pivots of its unpivoted factorisation are positive
+        shift = SHIFT_RATIO / mu
+
+        for i in range(MAX_SHIFT_HALVINGS + 1):
+            count('buckling.shift_factorisations')
+
+            try:
+                factor = linalg.splu((k - shift * a).tocsc(), permc_spec='NATURAL',
+                                     diag_pivot_thresh=0, options=dict(SymmetricMode=True))
+            except RuntimeError:
+                # exactly singular, the shift is a load factor
+                factor = None
+
+            if factor is not None and (factor.U.diagonal() > 0).all():
+                break
+
+            shift /= 2
+        else:
+            raise Exception('No shift below the lowest buckling load factor found within {0} '
+                            'halvings'.format(MAX_SHIFT_HALVINGS))
+
+        # shift-invert about the shift converges quickly even for clustered load factors
+        inverse = linalg.LinearOperator(k.shape, matvec=factor.solve, dtype=float)
+
+        return linalg.eigsh(k, k=1, M=a, sigma=shift, mode='buckling', which='LA',
+                            OPinv=inverse, return_eigenvectors=False)[0]
+
+
+def check_twist_restraint(rtypes):
+    """Raises an Exception if none of the restraint types prevents twist.
+
+    :param rtypes: Restraint types
+    :type rtypes: list[string]
+
+    :raises Exception: If no restraint prevents twist
+    """
+
+    if not any(rtype in TWIST_RESTRAINTS for rtype in rtypes):
+        raise Exception('Restraint types {0} do not prevent twist'.format(''.join(rtypes)))
+
+
+def get_load_height(section, load_position):
+    """Returns the height of the loads above the shear centre.
+
+    :param section: Section
+    :type section: :class:`~steeldesign.sections.SteelSection`
+    :param string load_position: Load position - 'WS', 'ES', 'WT' or 'ET'
+    :returns: Load height [mm]
+    :rtype: float
+
+    :raises Exception: If the load_position code is incorrect
+    """
+
+    if load_position in ('WS', 'ES'):
+        return 0
+    elif load_position in ('WT', 'ET'):
+        return section.d / 2
+
+    raise Exception('Load position code {0} is invalid'.format(load_position))
+
+
+def calc_point_loads(bmd):
+    """Returns the transverse point loads equivalent to a piecewise linear bending moment
+    diagram, i.e. the changes of shear force at its interior stations.
+
+    :param bmd: Bending moment diagram *(position [mm], moment [N.mm])* of size *(n x 2)*
+    :type bmd: :class:`numpy.ndarray`
+    :returns: Point loads *(position [mm], load [N])* of size *(n - 2 x 2)*
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    dx = np.diff(bmd[:, 0])
+    shear = np.divide(np.diff(bmd[:, 1]), dx, out=np.zeros(len(dx)), where=dx > 0)
+
+    return np.column_stack((bmd[1:-1, 0], shear[:-1] - shear[1:]))
+
+
+def get_flange(moment):
+    """Returns the critical flange (+1 for the top flange, -1 for the bottom flange) of a
+    bending moment."""
+
+    return -1 if moment < 0 else 1
+
+
+@instrument()
+def calc_segment_buckling(segment, n_elements=N_ELEMENTS):
+    """Returns the elastic buckling moments of a segment found by a finite element buckling
+    analysis of the segment under its bending moment diagram and end restraints.
+
+    Mob is the buckling moment (maximum bending moment at buckling) under the bending moment
+    diagram of the segment, including the height of the loads, and Moa the buckling moment under
+    uniform moment. The moment modification factor is alpha_m = Mob / Moa and the reference
+    buckling moment Moa replaces M0 = Mo(le), see Cl. 5.6.4 AS4100-1998.
+
+    As in Cl. 5.6.3, where kt = 1 for an **L** end, the twist of a laterally restrained (**L**)
+    end is taken as prevented by the adjacent segment, so the end is analysed as **F**; the
+    interaction of adjacent segments is not modelled. The supported end of a segment with an
+    unrestrained (**U**) end is taken as built-in laterally (**R**).
+
+    :param segment: Segment to analyse
+    :type segment: :class:`~steeldesign.member.Segment`
+    :param int n_elements: Number of finite elements
+    :returns: Buckling moments *(Mob, Moa)* [kN.m]
+    :rtype: tuple(float, float)
+
+    :raises Exception: If neither end restraint prevents twist, with **L** ends analysed as **F**
+    """
+
+    # the adjacent segment prevents the twist of a laterally restrained end
+    rtypes = tuple('F' if rtype == 'L' else rtype
+                   for rtype in (segment.restraint1.rtype, segment.restraint2.rtype))
+    check_twist_restraint(rtypes)
+
+    # the support of a cantilever segment prevents its rotation in plan
+    if 'U' in rtypes:
+        rtypes = tuple('R' if rtype in ('F', 'P') else rtype for rtype in rtypes)
+
+    section = segment.section
+    length = segment.segment_length
+    bmd = segment.bmd_segment
+
+    # bending moment diagram in mm and N.mm along the segment
+    bmd = np.column_stack(((bmd[:, 0] - bmd[0, 0]) * length / (bmd[-1, 0] - bmd[0, 0]),
+                           bmd[:, 1] * 1e6))
+    m_max = np.abs(bmd[:, 1]).max()
+    flange = get_flange(bmd[np.argmax(np.abs(bmd[:, 1])), 1])
+
+    model = BucklingModel(section, np.linspace(0, length, n_elements + 1))
+
+    # buckling under the bending moment diagram
+    restraints = [(0, rtypes[0], flange), (n_elements, rtypes[1], flange)]
+    geometric = model.calc_geometric_matrix(
+        model.calc_moments(bmd), calc_point_loads(bmd),
+        get_load_height(section, segment.load_position))
+    mob = model.calc_load_factor(restraints, geometric) * m_max * 1e-6
+
+    # buckling under uniform moment
+    moa = STIFFNESS_CACHE.get(model.get_key() + (rtypes, 'uniform'), lambda: calc_uniform(
+        model, [(0, rtypes[0], 1), (n_elements, rtypes[1], 1)]))
+
+    return (mob, moa)
+
+
+def calc_uniform(model, restraints):
+    """Returns the buckling moment of a model under uniform positive moment.
+
+    :param model: Buckling model
+    :type model: :class:`BucklingModel`
+    :param restraints: Restraints, see :meth:`BucklingModel.get_constraints`
+    :type restraints: list[tuple(int, string, int)]
+    :returns: Buckling moment [kN.m]
+    :rtype: float
+    """
+
+    moments = np.full((len(model.h), len(GAUSS_POINTS)), 1e6)
+
+    return model.calc_load_factor(restraints, model.calc_geometric_matrix(moments))
+
+
+@instrument()
+def calc_member_buckling(member, bmd, load_position, n_elements=N_ELEMENTS):
+    """Returns the elastic buckling load factor of a member found by a finite element buckling
+    analysis of the whole member, and the buckling moment and effective length of each segment.
+
+    All segments are assembled into a single sparse model, so adjacent segments restrain each
+    other and the lateral rotation restraint (kr) and the continuity over lateral restraints are
+    modelled rather than assumed. Each restraint maps to boundary conditions at its node, see
+    :class:`BucklingModel`; a lateral restraint (**L**) restrains the critical flange of the
+    adjacent segments, i.e. the compression flange under their largest bending moment, and does
+    not prevent twist. The support of a cantilever segment is taken as built-in laterally (**R**).
+
+    At the buckling load factor lambda every segment buckles together and its buckling moment is
+    Mob = lambda * M*. The effective length of a segment is the length at which alpha_m * Mo(le)
+    equals Mob, with alpha_m from :meth:`~steeldesign.member.Member.calc_alpha_m` for the
+    magnitude of the bending moments, so that
+    :meth:`~steeldesign.sections.SteelSection.calc_phi_mbx` gives phiMbx to Cl. 5.6.4. Segments
+    without bending have no buckling moment and an effective length of *nan*.
+
+    The stiffness matrix is banded, so its factorisation and the eigensolver scale linearly with
+    the number of elements.
+
+    :param member: Member to analyse
+    :type member: :class:`~steeldesign.member.Member`
+    :param bmd: Bending moment diagram for the member of size *(n x 2)*
+    :type bmd: :class:`numpy.ndarray`
+    :param load_position: List of strings defining the load position within each segment
+    :type load_position: list[string]
+    :param int n_elements: Number of finite elements per segment
+    :returns: Buckling load factor, and the buckling moment Mob [kN.m], effective length [mm] and
+        alpha_m the effective length is based on of each segment
+    :rtype: tuple(float, :class:`numpy.ndarray`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray`)
+
+    :raises Exception: Size of load_position is not equal to the number of segments
+    :raises Exception: If no restraint prevents twist
+    """
+
+    section = member.section
+    restraints = member.restraints
+    rtypes = [restraint.rtype for restraint in restraints]
+    positions = np.array([restraint.pos for restraint in restraints])
+
+    if len(load_position) != len(restraints) - 1:
+        raise Exception('Size of load_position must equal number of segments')
+
+    check_twist_restraint(rtypes)
+
+    # the support of a cantilever segment prevents its rotation in plan
+    for (i, rtype) in enumerate(rtypes):
+        if rtype == 'U':
+            for j in (i - 1, i + 1):
+                if 0 <= j < len(rtypes) and rtypes[j] in ('F', 'P'):
+                    rtypes[j] = 'R'
+
+    # bending moment diagram in mm and N.mm along the member
+    bmd_mm = np.column_stack((bmd[:, 0] * member.length, bmd[:, 1] * 1e6))
+    ends = positions * member.length
+    peaks = calc_segment_peaks(bmd_mm, ends)
+
+    # nodes of every segment, restraints at coincident positions share a node
+    nodes = np.unique(np.concatenate(
+        [np.linspace(a, b, n_elements + 1) for (a, b) in zip(ends[:-1], ends[1:])]))
+    model = BucklingModel(section, nodes)
+
+    # the critical flange of a restraint is that of the adjacent segment with the larger moment
+    adjacent = np.abs(np.concatenate(([0], peaks))) >= np.abs(np.concatenate((peaks, [0])))
+    critical = np.where(adjacent, np.concatenate(([0], peaks)), np.concatenate((peaks, [0])))
+    model_restraints = [(int(node), rtype, get_flange(moment)) for (node, rtype, moment) in
+                        zip(np.searchsorted(nodes, ends), rtypes, critical)]
+
+    # loads within a segment are applied at the height of its load position
+    loads = calc_point_loads(bmd_mm)
+    heights = np.array([get_load_height(section, lp) for lp in load_position])
+    segment = np.clip(np.searchsorted(ends, loads[:, 0], side='right') - 1, 0, len(heights) - 1)
+
+    geometric = model.calc_geometric_matrix(model.calc_moments(bmd_mm), loads, heights[segment])
+    load_factor = model.calc_load_factor(model_restraints, geometric)
+
+    # buckling moment and effective length of each segment
+    mob = load_factor * np.abs(peaks) * 1e-6
+    alpha_m = np.array(member.calc_alpha_m(np.column_stack((bmd[:, 0], np.abs(bmd[:, 1])))))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        le = section.calc_le(np.where(peaks != 0, mob / alpha_m, np.nan))
+
+    return (load_factor, mob, le, alpha_m)
+
+
+def calc_segment_peaks(bmd, ends):
+    """Returns the bending moment of largest magnitude of each segment of a bending moment
+    diagram, with its sign.
+
+    :param bmd: Bending moment diagram *(position, moment)* of size *(n x 2)*
+    :type bmd: :class:`numpy.ndarray`
+    :param ends: Positions of the segment ends in ascending order
+    :type ends: :class:`numpy.ndarray`
+    :returns: Peak bending moment of each segment
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    bm_ends = np.interp(ends, bmd[:, 0], bmd[:, 1])
+    peaks = []
+
+    for i in range(len(ends) - 1):
+        inside = (bmd[:, 0] > ends[i]) & (bmd[:, 0] < ends[i + 1])
+        moments = np.concatenate((bm_ends[i:i + 2], bmd[inside, 1]))
+        peaks.append(moments[np.argmax(np.abs(moments))])
+
+    return np.array(peaks)
@@ -0,0 +1,151 @@
+import functools
+from collections import OrderedDict
+
+
+class CacheStats:
+    """Hit/miss counters of a cache.
+
+    :cvar int hits: Number of lookups answered from the cache
+    :cvar int misses: Number of lookups that required a calculation
+    """
+
+    def __init__(self):
+        """Inits the CacheStats class."""
+
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        """Returns the proportion of lookups answered from the cache.
+
+        :returns: Hit rate *(0 <= hit_rate <= 1)*
+        :rtype: float
+        """
+
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+    def reset(self):
+        """Resets the hit and miss counters."""
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        """Returns a summary of the counters."""
+
+        return 'CacheStats(hits={0}, misses={1}, hit_rate={2:0.3f})'.format(
+            self.hits, self.misses, self.hit_rate())
+
+
+# statistics accumulated over the caches of all sections
+GLOBAL_STATS = CacheStats()
+
+
+class LRUCache:
+    """Bounded mapping that discards the least recently used entry once *maxsize* entries are
+    stored.
+
+    :param int maxsize: Maximum number of entries
+    :param stats: Statistics object to record hits and misses in
+    :type stats: :class:`~steeldesign.cache.CacheStats`
+    """
+
+    def __init__(self, maxsize=128, stats=None):
+        """Inits the LRUCache class."""
+
+        self.maxsize = maxsize
+        self.stats = CacheStats() if stats is None else stats
+        self._data = OrderedDict()
+
+    def get(self, key, func):
+        """Returns the value stored against *key*, calculating and storing it with *func* if
+        it is not in the cache.
+
+        :param key: Hashable key
+        :param func: Function without arguments that returns the value
+        :returns: Cached value
+        """
+
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            GLOBAL_STATS.misses += 1
+            value = self._data[key] = func()
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        else:
+            self.stats.hits += 1
+            GLOBAL_STATS.hits += 1
+            self._data.move_to_end(key)
+
+        return value
+
+    def clear(self):
+        """Removes all entries from the cache."""
+
+        self._data.clear()
+
+    def __len__(self):
+        """Returns the number of entries in the cache."""
+
+        return len(self._data)
+
+
+class Versioned:
+    """Mixin that increments a version counter whenever a public attribute is assigned, allowing
+    dependent caches to detect changes.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        """Sets the attribute and increments the version counter for public attributes."""
+
+        object.__setattr__(self, name, value)
+
+        if not name.startswith('_'):
+            object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+
+    def get_version(self):
+        """Returns the version counter of the object.
+
+        :returns: Number of public attribute assignments made to the object
+        :rtype: int
+        """
+
+        return getattr(self, '_version', 0)
+
+
+def cached(method):
+    """Decorator caching the result of a :class:`~steeldesign.sections.SteelSection` method that
+    does not depend on the effective length. Results are discarded when the state of the section
+    changes.
+
+    :param method: Method to cache, all arguments must be hashable
+    :returns: Wrapped method
+    """
+
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        cache = self.get_cache()
+
+        try:
+            value = cache[key]
+        except KeyError:
+            self.cache_stats.misses += 1
+            GLOBAL_STATS.misses += 1
+            value = cache[key] = method(self, *args, **kwargs)
+        else:
+            self.cache_stats.hits += 1
+            GLOBAL_STATS.hits += 1
+
+        return value
+
+    return wrapper
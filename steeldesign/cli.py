@@ -0,0 +1,230 @@
+import argparse
+import sys
+import time
+from steeldesign.codes import DesignCode, Restraint, SteelGrade
+from steeldesign.columnar import get_column, read_table
+from steeldesign.library import SectionLibrary
+from steeldesign.member import Member
+from steeldesign.streaming import CHUNK_ROWS, check_stream, read_bmd, write_results
+
+
+# default steel grade of the sections
+DEFAULT_GRADE = '3679.1-300'
+
+# default load position of the segments
+DEFAULT_LOAD_POSITION = 'WS'
+
+# default number of load cases checked at once
+CHUNK_SIZE = 256
+
+# minimum time between progress reports [s]
+PROGRESS_INTERVAL = 1
+
+# exit status when segments have an undefined phiMbx, argparse uses 2 for usage errors
+UNDEFINED_STATUS = 3
+
+
+def build_parser():
+    """Returns the parser of the command line arguments.
+
+    :returns: Argument parser
+    :rtype: :class:`argparse.ArgumentParser`
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='steeldesign',
+        description='Checks the member moment capacity (phiMbx) of every segment of every member '
+                    'under every load case to AS 4100-1998.',
+        epilog='Tables are read from and written to csv, Parquet (.parquet, .pq) or Arrow IPC '
+               '(.arrow, .feather, .ipc) files, Parquet and Arrow IPC files require pyarrow. '
+               'Segments with a hogging or zero bending moment have no phiMbx, they are written '
+               'as nan (null) and the exit status is {0}.'.format(UNDEFINED_STATUS))
+    parser.add_argument('--sections', required=True,
+                        help='table of sections with the columns of tests/ub.csv, or a '
+                             'catalogue compiled to .npy')
+    parser.add_argument('--members', required=True,
+                        help='table of members with the columns member, section, length')
+    parser.add_argument('--restraints', required=True,
+                        help='table of restraints with the columns member, pos, rtype and '
+                             'optionally load_position (of the segment starting at the '
+                             'restraint)')
+    parser.add_argument('--bmd', required=True,
+                        help='table of bending moment diagrams with the columns member, case, '
+                             'pos, moment, or a .npy file (and its .blocks.npy table) written '
+                             'by convert_bmd_csv; the rows of each (member, case) must be '
+                             'contiguous and in order of pos')
+    parser.add_argument('--output', required=True,
+                        help='table of results with the columns member, case, segment, m_star, '
+                             'phi_mbx, utilisation')
+    parser.add_argument('--grade', default=DEFAULT_GRADE,
+                        help='steel grade of the sections (default: %(default)s)')
+    parser.add_argument('--load-position', default=DEFAULT_LOAD_POSITION,
+                        choices=['WS', 'ES', 'WT', 'ET'],
+                        help='load position of segments without a load_position '
+                             '(default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='number of load cases checked at once (default: %(default)s)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help='number of rows read and written at once (default: %(default)s)')
+    parser.add_argument('--quiet', action='store_true', help='do not report progress')
+
+    return parser
+
+
+def read_members(members_path, restraints_path, library, load_position=DEFAULT_LOAD_POSITION):
+    """Reads members and their restraints from tables.
+
+    The members table has the columns *member, section, length* and the restraints table the
+    columns *member, pos, rtype* and optionally *load_position*, the load position of the segment
+    starting at the restraint.
+
+    :param string members_path: Path to the members table
+    :param string restraints_path: Path to the restraints table
+    :param library: Library of the sections
+    :type library: :class:`~steeldesign.library.SectionLibrary`
+    :param string load_position: Load position of segments without a load_position
+    :returns: Members and the list of load positions of each member, keyed by member id
+    :rtype: tuple(dict[string, :class:`~steeldesign.member.Member`],
+        dict[string, list[string]])
+
+    :raises Exception: If a column is missing, a member has fewer than two restraints, or a
+        restraint or section is not defined
+    """
+
+    table = read_table(members_path)
+    lengths = {}
+    sections = {}
+
+    for (member_id, section, length) in zip(get_column(table, 'member', members_path),
+                                            get_column(table, 'section', members_path),
+                                            get_column(table, 'length', members_path)):
+        if str(section) not in library:
+            raise Exception('Section {0} is not in the library'.format(section))
+
+        sections[str(member_id)] = library[str(section)]
+        lengths[str(member_id)] = float(length)
+
+    table = read_table(restraints_path)
+    positions = table.get('load_position')
+    restraints = {member_id: [] for member_id in lengths}
+
+    for (i, (member_id, pos, rtype)) in enumerate(zip(
+            get_column(table, 'member', restraints_path),
+            get_column(table, 'pos', restraints_path),
+            get_column(table, 'rtype', restraints_path))):
+        if str(member_id) not in restraints:
+            raise Exception('Member {0} is not defined'.format(member_id))
+
+        restraints[str(member_id)].append(
+            (Restraint(str(rtype), float(pos)), positions[i] if positions else None))
+
+    members = {}
+    load_positions = {}
+
+    for (member_id, member_restraints) in restraints.items():
+        if len(member_restraints) < 2:
+            raise Exception('Member {0} must have at least two restraints'.format(member_id))
+
+        member_restraints.sort(key=lambda restraint: restraint[0].pos)
+        members[member_id] = Member(sections[member_id], lengths[member_id],
+                                    [restraint for (restraint, lp) in member_restraints])
+        load_positions[member_id] = [lp or load_position for (restraint, lp)
+                                     in member_restraints[:-1]]
+
+    return (members, load_positions)
+
+
+def report_progress(rows, stream=sys.stderr, interval=PROGRESS_INTERVAL):
+    """Passes result rows through, reporting the number of load cases and rows produced to
+    *stream* at most every *interval* seconds.
+
+    :param rows: Iterable of result rows, e.g. from
+        :func:`~steeldesign.streaming.check_stream`
+    :param stream: Stream the progress is written to
+    :type stream: file
+    :param float interval: Minimum time between reports [s]
+    :returns: Generator of the result rows
+    :rtype: generator
+    """
+
+    start = last = time.perf_counter()
+    (n_cases, n_rows, key) = (0, 0, None)
+
+    for row in rows:
+        if row[:2] != key:
+            (n_cases, key) = (n_cases + 1, row[:2])
+
+        n_rows += 1
+        yield row
+
+        now = time.perf_counter()
+
+        if now - last >= interval:
+            last = now
+            stream.write('{0} load cases, {1} rows, {2:.0f} rows/s\n'.format(
+                n_cases, n_rows, n_rows / (now - start)))
+            stream.flush()
+
+    stream.write('{0} load cases, {1} rows in {2:.1f} s\n'.format(
+        n_cases, n_rows, time.perf_counter() - start))
+
+
+def run(args, stats=None):
+    """Runs the checks of the parsed command line arguments.
+
+    :param args: Parsed arguments, see :func:`build_parser`
+    :type args: :class:`argparse.Namespace`
+    :param stats: Counters updated by :func:`~steeldesign.streaming.check_stream`, e.g. the
+        number of segments with an undefined phiMbx
+    :type stats: dict[string, int]
+    :returns: Number of result rows written
+    :rtype: int
+    """
+
+    library = SectionLibrary(args.sections, DesignCode(), SteelGrade(args.grade))
+    (members, load_positions) = read_members(args.members, args.restraints, library,
+                                             args.load_position)
+
+    rows = check_stream(read_bmd(args.bmd, args.chunk_rows), members, load_positions,
+                        chunk_size=args.chunk_size, stats=stats)
+
+    if not args.quiet:
+        rows = report_progress(rows)
+
+    return write_results(rows, args.output, args.chunk_rows)
+
+
+def main(argv=None):
+    """Entry point of the ``steeldesign`` command.
+
+    Segments with a hogging or zero bending moment have no meaningful phiMbx and are written
+    with a phiMbx and utilisation of *nan* (null); their number is reported on stderr, even with
+    ``--quiet``, and the exit status is :data:`UNDEFINED_STATUS`.
+
+    :param argv: Command line arguments, defaults to :data:`sys.argv`
+    :type argv: list[string]
+    :returns: Exit status
+    :rtype: int
+    """
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    stats = {}
+
+    try:
+        run(args, stats)
+    except Exception as e:
+        parser.exit(1, '{0}: error: {1}\n'.format(parser.prog, e))
+
+    if stats.get('undefined'):
+        sys.stderr.write('{0}: warning: {1} segments with an undefined phiMbx (hogging or zero '
+                         'bending moment)\n'.format(parser.prog, stats['undefined']))
+
+        return UNDEFINED_STATUS
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
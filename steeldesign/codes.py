@@ -1,4 +1,140 @@
-class DesignCode:
+import numpy as np
+from steeldesign.cache import Versioned
+
+
+# integer codes for the compactness of a section
+COMPACT = 0
+NON_COMPACT = 1
+SLENDER = 2
+
+# compactness labels indexed by the integer compactness codes
+COMPACTNESS_LABELS = ('C', 'NC', 'S')
+
+# plate element types and residual stress classes of T.5.2 AS4100-1998 indexed by their integer
+# codes
+PLATE_TYPES = ('Uniform1', 'Bending1', 'Uniform2', 'Bending2', 'CHS')
+RESIDUAL_STRESSES = ('SR', 'HR', 'LW', 'CF', 'HW')
+
+# integer codes keyed by plate type and residual stress class
+PLATE_TYPE_CODES = {name: i for (i, name) in enumerate(PLATE_TYPES)}
+RESIDUAL_STRESS_CODES = {name: i for (i, name) in enumerate(RESIDUAL_STRESSES)}
+
+
+def _readonly(array):
+    """Returns *array* flagged as read-only."""
+
+    array.setflags(write=False)
+
+    return array
+
+
+# plate element slenderness limits (plasticity, yield, deformation) indexed by
+# [plate type code, residual stress code], nan where there is no deformation limit,
+# T.5.2 AS4100-1998
+SLENDERNESS_LIMITS = _readonly(np.array([
+    # Uniform1
+    [(10, 16, 35), (9, 16, 35), (8, 15, 35), (8, 15, 35), (8, 14, 35)],
+    # Bending1
+    [(10, 25, np.nan), (9, 25, np.nan), (8, 22, np.nan), (8, 22, np.nan), (8, 22, np.nan)],
+    # Uniform2
+    [(30, 45, 90), (30, 45, 90), (30, 40, 90), (30, 40, 90), (30, 35, 90)],
+    # Bending2
+    [(82, 115, np.nan), (82, 115, np.nan), (82, 115, np.nan), (82, 115, np.nan),
+     (82, 115, np.nan)],
+    # CHS
+    [(50, 120, np.nan), (50, 120, np.nan), (42, 120, np.nan), (42, 120, np.nan),
+     (42, 120, np.nan)],
+], dtype=float))
+
+# yield stress by thickness band and tensile strength of each steel grade *(thickness band edges,
+# yield stress of each band, tensile strength)*; a plate of thickness t lies in band
+# searchsorted(edges, t, side='right'), edges of bands including their upper bound are moved up
+# to the next float
+STEEL_GRADES = {
+    '3679.1-350': (
+        _readonly(np.array([np.nextafter(11, np.inf), 40])),
+        _readonly(np.array([360, 340, 330], dtype=float)),
+        480,
+    ),
+    '3679.1-300': (
+        _readonly(np.array([11, np.nextafter(17, np.inf)])),
+        _readonly(np.array([320, 300, 280], dtype=float)),
+        440,
+    ),
+}
+
+
+def get_codes(values, codes):
+    """Returns the integer codes of names or of an array of names, integer codes are returned
+    unchanged.
+
+    :param values: Name(s) or integer code(s)
+    :type values: string, int or :class:`numpy.ndarray`
+    :param codes: Integer codes keyed by name, e.g. :data:`PLATE_TYPE_CODES`
+    :type codes: dict[string, int]
+    :returns: Integer code(s)
+    :rtype: int or :class:`numpy.ndarray`
+
+    :raises Exception: If a name is not defined
+    """
+
+    values = np.asarray(values)
+
+    if values.dtype.kind not in 'US':
+        return values[()]
+
+    try:
+        return np.array([codes[value] for value in values.ravel().tolist()],
+                        dtype=int).reshape(values.shape)[()]
+    except KeyError as error:
+        raise Exception('{0} is not defined'.format(error.args[0]))
+
+
+def get_labels(values, names):
+    """Returns the names of integer codes or of an array of integer codes.
+
+    :param values: Integer code(s)
+    :type values: int or :class:`numpy.ndarray`
+    :param names: Names indexed by integer code, e.g. :data:`COMPACTNESS_LABELS`
+    :type names: tuple(string)
+    :returns: Name(s)
+    :rtype: string or :class:`numpy.ndarray`
+    """
+
+    if np.ndim(values) == 0:
+        return names[int(values)]
+
+    return np.asarray(names)[values]
+
+
+def classify_compactness(lambda_s, lambda_lims, labels=False):
+    """Returns the compactness of plate elements or sections given their slenderness and
+    slenderness limits.
+
+    Cl. 5.2.3 AS4100-1998
+
+    :param lambda_s: Slenderness(es)
+    :type lambda_s: float or :class:`numpy.ndarray`
+    :param lambda_lims: Slenderness limits of size *(... x 3)*, see
+        :meth:`DesignCode.plate_slenderness_limits`
+    :type lambda_lims: :class:`numpy.ndarray`
+    :param bool labels: Whether to return the labels *('C', 'NC', 'S')* rather than the integer
+        codes
+    :returns: Compactness code(s) *(COMPACT, NON_COMPACT, SLENDER)* or label(s)
+    :rtype: int, string or :class:`numpy.ndarray`
+    """
+
+    lambda_lims = np.asarray(lambda_lims, dtype=float)
+    compact = np.where(lambda_s < lambda_lims[..., 0], COMPACT,
+                       np.where(lambda_s < lambda_lims[..., 1], NON_COMPACT, SLENDER))
+
+    if labels:
+        return get_labels(compact, COMPACTNESS_LABELS)
+
+    return compact[()]
+
+
+class DesignCode(Versioned):
     """a"""
 
     def __init__(self):
@@ -23,85 +159,81 @@ class DesignCode:
         :rtype: tuple(float, float, float)
         """
 
-        slender_dict = {
-            'Uniform1': {
-                'SR': (10, 16, 35),
-                'HR': (9, 16, 35),
-                'LW': (8, 15, 35),
-                'CF': (8, 15, 35),
-                'HW': (8, 14, 35),
-            },
-            'Bending1': {
-                'SR': (10, 25, None),
-                'HR': (9, 25, None),
-                'LW': (8, 22, None),
-                'CF': (8, 22, None),
-                'HW': (8, 22, None),
-            },
-            'Uniform2': {
-                'SR': (30, 45, 90),
-                'HR': (30, 45, 90),
-                'LW': (30, 40, 90),
-                'CF': (30, 40, 90),
-                'HW': (30, 35, 90),
-            },
-            'Bending2': {
-                'SR': (82, 115, None),
-                'HR': (82, 115, None),
-                'LW': (82, 115, None),
-                'CF': (82, 115, None),
-                'HW': (82, 115, None),
-            },
-            'CHS': {
-                'SR': (50, 120, None),
-                'HR': (50, 120, None),
-                'LW': (42, 120, None),
-                'CF': (42, 120, None),
-                'HW': (42, 120, None),
-            },
-        }
-
-        return slender_dict[plate_type][res_stress]
-
-
-class SteelGrade:
+        lims = self.plate_slenderness_limits(plate_type, res_stress)
+
+        return tuple(None if np.isnan(lim) else lim for lim in lims.tolist())
+
+    def plate_slenderness_limits(self, plate_type, res_stress):
+        """Returns the plate slenderness limits for bending of arrays of plate types and residual
+        stress classes, given as names or integer codes.
+
+        T.5.2 AS4100-1998
+
+        :param plate_type: Type(s) of plate, see :data:`PLATE_TYPES`
+        :type plate_type: string, int or :class:`numpy.ndarray`
+        :param res_stress: Residual stress class(es), see :data:`RESIDUAL_STRESSES`
+        :type res_stress: string, int or :class:`numpy.ndarray`
+        :returns: Plate slenderness limits of size *(... x 3)* *(plasticity limit, yield limit,
+            deformation limit)*, *nan* where there is no deformation limit
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return SLENDERNESS_LIMITS[get_codes(plate_type, PLATE_TYPE_CODES),
+                                  get_codes(res_stress, RESIDUAL_STRESS_CODES)]
+
+
+class SteelGrade(Versioned):
     """a"""
 
+    __slots__ = ('grade', '_version')
+
     def __init__(self, grade):
         """a"""
 
         self.grade = grade
 
+    def get_grade_table(self):
+        """Returns the strength table of the steel grade.
+
+        :returns: Thickness band edges, yield stress of each band and tensile strength, see
+            :data:`STEEL_GRADES`
+        :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, float)
+
+        :raises Exception: If the steel grade is not defined
+        """
+
+        try:
+            return STEEL_GRADES[self.grade]
+        except KeyError:
+            raise Exception('Steel grade {0} is not defined'.format(self.grade))
+
     def get_yield_stress(self, t):
-        """a"""
+        """Returns the yield stress of a plate or of an array of plates.
 
-        if self.grade == '3679.1-350':
-            if t <= 11:
-                return 360
-            elif t < 40:
-                return 340
-            elif t >= 40:
-                return 330
-        elif self.grade == '3679.1-300':
-            if t < 11:
-                return 320
-            elif t <= 17:
-                return 300
-            elif t >= 17:
-                return 280
+        :param t: Plate thickness(es) [mm]
+        :type t: float or :class:`numpy.ndarray`
+        :returns: Yield stress(es) [MPa]
+        :rtype: float or :class:`numpy.ndarray`
+        """
+
+        (edges, fy, fu) = self.get_grade_table()
+
+        if np.ndim(t) == 0:
+            return float(fy[np.searchsorted(edges, t, side='right')])
+
+        return fy[np.searchsorted(edges, t, side='right')]
 
     def get_tensile_strength(self):
         """a"""
 
-        if self.grade == '3679.1-350':
-            return 480
-        elif self.grade == '3679.1-300':
-            return 440
+        return self.get_grade_table()[2]
 
 
 class Restraint:
     """a"""
 
+    __slots__ = ('rtype', 'pos')
+
     def __init__(self, rtype, pos):
         """Inits the Restraint class.
 
@@ -0,0 +1,191 @@
+import csv
+import itertools
+import os
+import numpy as np
+
+
+# file formats keyed by file extension
+FORMATS = {
+    '.csv': 'csv',
+    '.npy': 'npy',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+# formats read and written with pyarrow
+ARROW_FORMATS = ('parquet', 'arrow')
+
+
+def get_format(path, formats=None):
+    """Returns the format of a file from its extension.
+
+    :param string path: Path to the file
+    :param formats: Supported formats, defaults to all formats of :data:`FORMATS`
+    :type formats: list[string]
+    :returns: File format - 'csv', 'npy', 'parquet' or 'arrow' (Arrow IPC file)
+    :rtype: string
+
+    :raises Exception: If the format of the file is not supported
+    """
+
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+
+    if fmt is None or (formats is not None and fmt not in formats):
+        raise Exception('File format of {0} is not supported'.format(path))
+
+    return fmt
+
+
+def import_pyarrow():
+    """Returns the pyarrow module, which is only imported when a Parquet or Arrow IPC file is
+    read or written as it is an optional dependency.
+
+    :returns: pyarrow module
+    :rtype: module
+
+    :raises Exception: If pyarrow is not installed
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception('pyarrow is required to read and write Parquet and Arrow IPC files')
+
+    return pyarrow
+
+
+def read_table(path):
+    """Reads a small table, e.g. of members or restraints, from a csv, Parquet or Arrow IPC file.
+    Values of csv files are returned as strings.
+
+    :param string path: Path to the file
+    :returns: Values of each column keyed by column name
+    :rtype: dict[string, list]
+
+    :raises Exception: If the format of the file is not supported
+    """
+
+    fmt = get_format(path, ('csv',) + ARROW_FORMATS)
+
+    if fmt == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = [heading.strip() for heading in next(reader)]
+            rows = [row for row in reader if row]
+
+        return {heading: [row[i] for row in rows] for (i, heading) in enumerate(header)}
+
+    pa = import_pyarrow()
+
+    if fmt == 'parquet':
+        return pa.parquet.read_table(path).to_pydict()
+
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all().to_pydict()
+
+
+def get_column(table, column, path):
+    """Returns a column of a table read with :func:`read_table`.
+
+    :param table: Table
+    :type table: dict[string, list]
+    :param string column: Column name
+    :param string path: Path to the file the table was read from, for the error message
+    :returns: Values of the column
+    :rtype: list
+
+    :raises Exception: If the column is missing
+    """
+
+    try:
+        return table[column]
+    except KeyError:
+        raise Exception('Column {0} is missing from {1}'.format(column, path))
+
+
+def read_batches(path, columns, chunk_rows):
+    """Reads the columns of a Parquet or Arrow IPC file *chunk_rows* rows at a time.
+
+    :param string path: Path to the file
+    :param columns: Names of the columns to read
+    :type columns: list[string]
+    :param int chunk_rows: Maximum number of rows read at once
+    :returns: Generator of the values of each column keyed by column name
+    :rtype: generator
+
+    :raises Exception: If the format of the file is not supported
+    """
+
+    fmt = get_format(path, ARROW_FORMATS)
+    pa = import_pyarrow()
+
+    if fmt == 'parquet':
+        batches = pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_rows,
+                                                            columns=list(columns))
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        batches = (batch.slice(start, chunk_rows)
+                   for batch in (reader.get_batch(i) for i in range(reader.num_record_batches))
+                   for start in range(0, batch.num_rows, chunk_rows))
+
+    for batch in batches:
+        yield {column: batch.column(column).to_numpy(zero_copy_only=False)
+               for column in columns}
+
+
+def write_rows(rows, path, dtype, chunk_rows):
+    """Writes rows to a csv, Parquet or Arrow IPC file as they are produced, *chunk_rows* rows
+    at a time. Values of *nan* are written as null to Parquet and Arrow IPC files.
+
+    :param rows: Iterable of rows
+    :param string path: Path to the file
+    :param dtype: Names and types of the columns
+    :type dtype: :class:`numpy.dtype`
+    :param int chunk_rows: Number of rows written at once
+    :returns: Number of rows written
+    :rtype: int
+
+    :raises Exception: If the format of the file is not supported
+    """
+
+    fmt = get_format(path, ('csv',) + ARROW_FORMATS)
+    rows = iter(rows)
+    n_rows = 0
+
+    if fmt == 'csv':
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(dtype.names)
+
+            for chunk in iter(lambda: list(itertools.islice(rows, chunk_rows)), []):
+                writer.writerows(chunk)
+                n_rows += len(chunk)
+
+        return n_rows
+
+    pa = import_pyarrow()
+    schema = pa.schema([
+        (name, pa.string() if dtype[name].kind in 'SU' else pa.from_numpy_dtype(dtype[name]))
+        for name in dtype.names
+    ])
+
+    if fmt == 'parquet':
+        writer = pa.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    try:
+        for chunk in iter(lambda: list(itertools.islice(rows, chunk_rows)), []):
+            columns = [pa.array(column, type=field.type, from_pandas=True)
+                       for (column, field) in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            n_rows += len(chunk)
+    finally:
+        writer.close()
+
+    return n_rows
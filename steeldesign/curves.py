@@ -0,0 +1,149 @@
+import numpy as np
+
+
+# default range of effective lengths covered by a curve [mm]
+LE_MIN = 100
+LE_MAX = 100000
+
+# default maximum relative interpolation error
+TOLERANCE = 1e-5
+
+# smallest maximum relative interpolation error, finer tolerances approach the rounding error of
+# the exact phiMbx
+MIN_TOLERANCE = 1e-10
+
+# maximum number of refinements of the grid, each bisecting the intervals out of tolerance
+MAX_REFINEMENTS = 50
+
+# points within each grid interval at which the interpolation error is checked
+QUARTERS = np.array([0.25, 0.5, 0.75])
+
+
+class PhiMbxCurve:
+    """phiMbx of a section for alpha_m = 1 sampled on a log-spaced effective length grid.
+
+    phiMbx is proportional to alpha_m, so the curve gives phiMbx for any alpha_m by scaling. The
+    grid is refined adaptively: an interval is bisected until linear interpolation at its quarter
+    points is within half of *tol* of the exact value. Checking three points rather than the
+    midpoint alone catches intervals spanning an inflection of the curve, where the midpoint
+    error can vanish. :meth:`verify` measures the achieved error. Effective lengths outside the
+    grid are evaluated exactly.
+
+    The lookup pays off for the scalar evaluations of member checks and section selection loops;
+    :meth:`~steeldesign.sections.SteelSection.calc_phi_mbx` is already vectorised and remains the
+    faster choice for large arrays of effective lengths.
+
+    :param section: Section to build the curve for
+    :type section: :class:`~steeldesign.sections.SteelSection`
+    :param float le_min: Smallest effective length of the grid
+    :param float le_max: Largest effective length of the grid
+    :param float tol: Maximum relative interpolation error, at least :data:`MIN_TOLERANCE`
+    :param int n_initial: Number of points of the initial grid
+
+    :cvar le: Effective lengths of the grid, the curve covers *le_min* to *le_max*
+    :vartype le: :class:`numpy.ndarray`
+    :cvar phi_mbx: phiMbx at the grid points for alpha_m = 1
+    :vartype phi_mbx: :class:`numpy.ndarray`
+
+    :raises Exception: If *tol* is not between :data:`MIN_TOLERANCE` and 1, or the grid does not
+        reach the tolerance within :data:`MAX_REFINEMENTS` refinements
+    """
+
+    def __init__(self, section, le_min=LE_MIN, le_max=LE_MAX, tol=TOLERANCE, n_initial=33):
+        """Inits the PhiMbxCurve class."""
+
+        if not MIN_TOLERANCE <= tol < 1:
+            raise Exception('tol must be between {0} and 1'.format(MIN_TOLERANCE))
+
+        self.section = section
+        self.tol = tol
+
+        le = np.geomspace(le_min, le_max, n_initial)
+        phi_mbx = self.exact(le)
+
+        for i in range(MAX_REFINEMENTS + 1):
+            # compare the interpolated and exact values at the quarter points of each interval,
+            # refining to half the tolerance to allow for the error between the checked points
+            pts = le[:-1, None] + np.diff(le)[:, None] * QUARTERS
+            exact = self.exact(pts)
+            interp = phi_mbx[:-1, None] + np.diff(phi_mbx)[:, None] * QUARTERS
+            refine = (np.abs(interp - exact) > 0.5 * tol * np.abs(exact)).any(axis=1)
+
+            if not refine.any():
+                break
+
+            idx = np.flatnonzero(refine) + 1
+            le = np.insert(le, idx, pts[refine, 1])
+            phi_mbx = np.insert(phi_mbx, idx, exact[refine, 1])
+        else:
+            raise Exception('phiMbx curve did not reach tol = {0} within {1} refinements'.format(
+                tol, MAX_REFINEMENTS))
+
+        self.le = le
+        self.phi_mbx = phi_mbx
+        self.le_min = le[0]
+        self.le_max = le[-1]
+
+    def exact(self, le, alpha_m=1):
+        """Returns the exact phiMbx of the section.
+
+        :param le: Effective length(s)
+        :type le: float or :class:`numpy.ndarray`
+        :param alpha_m: Moment modification factor(s)
+        :type alpha_m: float or :class:`numpy.ndarray`
+        :returns: phiMbx [kN.m]
+        :rtype: float or :class:`numpy.ndarray`
+        """
+
+        le = np.asarray(le, dtype=float)
+
+        # scalar effective lengths use the M0 cache of the section
+        if le.ndim == 0:
+            le = float(le)
+
+        return self.section.calc_phi_mbx(le=le, alpha_m=alpha_m)
+
+    def __call__(self, le, alpha_m=1):
+        """Returns phiMbx interpolated from the curve.
+
+        :param le: Effective length(s)
+        :type le: float or :class:`numpy.ndarray`
+        :param alpha_m: Moment modification factor(s)
+        :type alpha_m: float or :class:`numpy.ndarray`
+        :returns: phiMbx [kN.m]
+        :rtype: float or :class:`numpy.ndarray`
+        """
+
+        if np.ndim(le) == 0:
+            le = float(le)
+
+            if self.le_min <= le <= self.le_max:
+                return alpha_m * float(np.interp(le, self.le, self.phi_mbx))
+
+            return self.exact(le, alpha_m)
+
+        le = np.asarray(le, dtype=float)
+        phi_mbx = np.interp(le, self.le, self.phi_mbx)
+        outside = (le < self.le_min) | (le > self.le_max)
+
+        if outside.any():
+            phi_mbx[outside] = self.exact(le[outside])
+
+        return alpha_m * phi_mbx
+
+    def verify(self, n_samples=10000):
+        """Returns the largest relative error of the curve compared with the exact phiMbx at
+        *n_samples* log-spaced effective lengths plus the quarter points of all intervals.
+
+        :param int n_samples: Number of samples
+        :returns: Maximum relative error
+        :rtype: float
+        """
+
+        le = np.concatenate((
+            np.geomspace(self.le_min, self.le_max, n_samples),
+            (self.le[:-1, None] + np.diff(self.le)[:, None] * QUARTERS).ravel()
+        ))
+        exact = self.exact(le)
+
+        return float(np.max(np.abs(self(le) - exact) / np.abs(exact)))
@@ -0,0 +1,84 @@
+import numpy as np
+from steeldesign.batch import calc_effective_lengths
+from steeldesign.member import calc_alpha_m_segments, calc_design_moments
+
+
+def calc_envelope(member, bmds):
+    """Returns the bending moment envelope and the alpha_m bounds of each segment of a member
+    across a set of load cases.
+
+    :param member: Member to calculate the envelope for
+    :type member: :class:`~steeldesign.member.Member`
+    :param bmds: Stack of bending moment diagrams of size *(n_cases x n_points x 2)*, or a list of
+        *n_cases* arrays of size *(n_points x 2)*
+    :type bmds: :class:`numpy.ndarray` or list[:class:`numpy.ndarray`]
+    :returns: M* of size *(n_cases x n_segments)*, alpha_m of size *(n_cases x n_segments)* and
+        the envelope *(max M*, min alpha_m, max alpha_m)* of each segment
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`,
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`))
+    """
+
+    positions = np.array([restraint.pos for restraint in member.restraints])
+    m_star = calc_design_moments(bmds, positions)
+    alpha_m = calc_alpha_m_segments(bmds, positions)
+
+    return (m_star, alpha_m, (m_star.max(axis=0), alpha_m.min(axis=0), alpha_m.max(axis=0)))
+
+
+def check_governing(member, bmds, load_position, case_ids=None):
+    """Returns the governing load case and utilisation of each segment of a member, running the
+    full capacity check on the governing candidates only.
+
+    The effective length of a segment does not depend on the load case and phiMbx is proportional
+    to alpha_m, so the utilisation M* / min(phiMbx, phiMsx) of a segment is largest either for
+    the case with the largest M* / alpha_m or for the case with the largest M*. A pre-pass over
+    the moment envelope and alpha_m of all cases selects these (at most two) candidates per
+    segment; the capacity is then evaluated for the candidates only.
+
+    Cases without moment in a segment (alpha_m of *nan*) or with a hogging moment (alpha_m of
+    zero or less) have no meaningful phiMbx; they remain candidates for the largest M* and are
+    checked against phiMsx alone, with a phiMbx of *nan* returned when they govern.
+
+    :param member: Member to check
+    :type member: :class:`~steeldesign.member.Member`
+    :param bmds: Stack of bending moment diagrams of size *(n_cases x n_points x 2)*, or a list of
+        *n_cases* arrays of size *(n_points x 2)*
+    :type bmds: :class:`numpy.ndarray` or list[:class:`numpy.ndarray`]
+    :param load_position: List of strings defining the load position within each segment
+    :type load_position: list[string]
+    :param case_ids: Ids of the load cases, defaults to the case indices
+    :type case_ids: list
+    :returns: Governing case id, utilisation and phiMbx of the governing case of each segment
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+    """
+
+    (m_star, alpha_m, envelope) = calc_envelope(member, bmds)
+    seg = np.arange(m_star.shape[1])
+
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(alpha_m) & (alpha_m > 0)
+
+    # governing candidates: largest buckling demand of the cases with a meaningful phiMbx and
+    # largest section demand of all cases
+    section_case = np.argmax(m_star, axis=0)
+    candidates = np.stack((
+        np.where(valid.any(axis=0), np.argmax(
+            np.where(valid, m_star / np.where(valid, alpha_m, 1), -np.inf), axis=0), section_case),
+        section_case))
+    candidate_valid = valid[candidates, seg]
+
+    # full check of the candidates, against phiMsx alone where phiMbx is undefined
+    le = calc_effective_lengths(member, load_position)
+    phi_msx = member.section.calc_phi_msx()
+    phi_mbx = member.section.calc_phi_mbx(
+        le=le[None, :], alpha_m=np.where(valid, alpha_m, np.nan)[candidates, seg])
+    capacity = np.where(candidate_valid, np.minimum(phi_mbx, phi_msx), phi_msx)
+    utilisation = m_star[candidates, seg] / capacity
+
+    governing = np.argmax(utilisation, axis=0)
+    cases = candidates[governing, seg]
+
+    if case_ids is not None:
+        cases = np.asarray(case_ids)[cases]
+
+    return (cases, utilisation[governing, seg], phi_mbx[governing, seg])
@@ -0,0 +1,186 @@
+import itertools
+import numpy as np
+from steeldesign.member import Segment
+
+
+class CheckModel:
+    """Model of members and load cases whose phiMbx results are recomputed lazily and only where
+    their inputs have changed.
+
+    Each segment result depends on the two restraints bounding the segment (type and position),
+    its load position, the member length, the state of the section (including its design code and
+    steel grade, see :meth:`~steeldesign.sections.SteelSection.state_token`) and the bending
+    moment diagram of the load case. When a result is requested these inputs are compared with
+    those of the cached result, so that:
+
+    * changing the position or type of a :class:`~steeldesign.codes.Restraint` recomputes the two
+      adjacent segments only;
+    * changing a section or its steel grade recomputes the members using that section only;
+    * changing a bending moment diagram with :meth:`set_bmd` recomputes that load case only.
+
+    :cvar stats: Number of segment results computed and reused
+    :vartype stats: dict[string, int]
+    """
+
+    def __init__(self):
+        """Inits the CheckModel class."""
+
+        self.members = {}
+        self.load_positions = {}
+        self.bmds = {}
+        self.stats = {'computed': 0, 'reused': 0}
+        self._segments = {}
+        self._versions = itertools.count(1)
+
+    def add_member(self, member_id, member, load_position):
+        """Adds a member to the model.
+
+        :param member_id: Member id
+        :param member: Member to add
+        :type member: :class:`~steeldesign.member.Member`
+        :param load_position: List of strings defining the load position within each segment
+        :type load_position: list[string]
+        """
+
+        self.members[member_id] = member
+        self.load_positions[member_id] = list(load_position)
+        self.bmds[member_id] = {}
+        self._segments[member_id] = {}
+
+    def set_load_position(self, member_id, load_position):
+        """Sets the load positions of a member, only segments whose load position changes are
+        recomputed.
+
+        :param member_id: Member id
+        :param load_position: List of strings defining the load position within each segment
+        :type load_position: list[string]
+        """
+
+        self.load_positions[member_id] = list(load_position)
+
+    def set_bmd(self, member_id, case_id, bmd):
+        """Sets the bending moment diagram of a load case of a member.
+
+        :param member_id: Member id
+        :param case_id: Load case id
+        :param bmd: Bending moment diagram for the member of size *(n x 2)*
+        :type bmd: :class:`numpy.ndarray`
+        """
+
+        self.bmds[member_id][case_id] = (next(self._versions), np.asarray(bmd, dtype=float))
+
+    def get_segment_keys(self, member_id):
+        """Returns the inputs defining each segment of a member, re-sorting its restraints if
+        their positions have been changed.
+
+        :param member_id: Member id
+        :returns: One key *(start restraint type, start position, end restraint type,
+            end position, load position, member length)* per segment
+        :rtype: list[tuple]
+
+        :raises Exception: Size of load_position is not equal to the number of segments
+        """
+
+        member = self.members[member_id]
+        restraints = member.restraints
+        load_position = self.load_positions[member_id]
+
+        if any(r1.pos > r2.pos for (r1, r2) in zip(restraints[:-1], restraints[1:])):
+            restraints.sort(key=lambda r: r.pos)
+
+        if len(load_position) != len(restraints) - 1:
+            raise Exception('Size of load_position must equal number of segments')
+
+        return [(r1.rtype, r1.pos, r2.rtype, r2.pos, lp, member.length)
+                for (r1, r2, lp) in zip(restraints[:-1], restraints[1:], load_position)]
+
+    def is_dirty(self, member_id, case_id):
+        """Returns whether any segment result of a load case of a member needs recomputing.
+
+        :param member_id: Member id
+        :param case_id: Load case id
+        :returns: Whether the result is out of date
+        :rtype: bool
+        """
+
+        token = self._section_token(member_id)
+        version = self.bmds[member_id][case_id][0]
+        segments = self._segments[member_id]
+
+        for key in self.get_segment_keys(member_id):
+            state = segments.get(key)
+
+            if (state is None or state['token'] != token or
+                    state['phi'].get(case_id, (None,))[0] != version):
+                return True
+
+        return False
+
+    def result(self, member_id, case_id):
+        """Returns phiMbx of each segment of a member for a load case, recomputing only the
+        segments whose inputs have changed.
+
+        :param member_id: Member id
+        :param case_id: Load case id
+        :returns: phiMbx of each segment
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        member = self.members[member_id]
+        (version, bmd) = self.bmds[member_id][case_id]
+        token = self._section_token(member_id)
+        keys = self.get_segment_keys(member_id)
+        segments = self._segments[member_id]
+        phi_mbx = np.empty(len(keys))
+
+        for (i, key) in enumerate(keys):
+            state = segments.get(key)
+
+            # effective lengths depend on the restraints and the section only
+            if state is None or state['token'] != token:
+                segment = Segment(member.length, member.restraints[i], member.restraints[i + 1],
+                                  key[4], bmd, member.section)
+                state = segments[key] = {
+                    'token': token,
+                    'le': segment.calc_effective_length(),
+                    'phi': {},
+                }
+
+            cached = state['phi'].get(case_id)
+
+            if cached is not None and cached[0] == version:
+                phi_mbx[i] = cached[1]
+                self.stats['reused'] += 1
+                continue
+
+            segment = Segment(member.length, member.restraints[i], member.restraints[i + 1],
+                              key[4], bmd, member.section)
+            segment.calc_alpha_m()
+            phi_mbx[i] = member.section.calc_phi_mbx(le=state['le'], alpha_m=segment.alpha_m)
+            state['phi'][case_id] = (version, phi_mbx[i])
+            self.stats['computed'] += 1
+
+        # discard segments that no longer exist
+        if len(segments) > len(keys):
+            for key in set(segments) - set(keys):
+                del segments[key]
+
+        return phi_mbx
+
+    def results(self):
+        """Returns phiMbx of each segment for every load case of every member, recomputing only
+        what has changed.
+
+        :returns: phiMbx of each segment keyed by (member id, load case id)
+        :rtype: dict[tuple, :class:`numpy.ndarray`]
+        """
+
+        return {(member_id, case_id): self.result(member_id, case_id)
+                for member_id in self.members for case_id in self.bmds[member_id]}
+
+    def _section_token(self, member_id):
+        """Returns a token identifying the section of a member and its state."""
+
+        section = self.members[member_id].section
+
+        return (id(section),) + section.state_token()
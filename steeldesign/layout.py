@@ -0,0 +1,153 @@
+import itertools
+import numpy as np
+from steeldesign.batch import (KT_PARTIAL2_CODES, KT_PARTIAL_CODES, KT_UNITY_CODES,
+                               calc_segment_effective_lengths)
+from steeldesign.codes import Restraint
+from steeldesign.member import calc_segment_pairs
+
+
+# default number of equal intervals of the grid of candidate restraint positions
+N_GRID = 20
+
+# restraint codes (sorted characters) of valid segments
+VALID_CODES = KT_UNITY_CODES + KT_PARTIAL_CODES + KT_PARTIAL2_CODES
+
+
+class RestraintOptimiser:
+    """Finds the layout of intermediate restraints of a member with the lowest cost for which
+    M* <= phiMsx and M* <= phiMbx in every segment.
+
+    The adequacy of a segment depends only on its two end restraints, so the adequacy of the
+    segment between every pair of candidate restraints (position and type) is evaluated once, in
+    a single vectorised batch, when the optimiser is built. A layout is a path from the first to
+    the last end restraint through adequate segments and the cheapest layout is found by dynamic
+    programming over the number of intermediate restraints. Trial layouts never recompute a
+    segment, and :meth:`optimise` can be called repeatedly with different costs and restraint
+    limits.
+
+    :param section: Section of the member
+    :type section: :class:`~steeldesign.sections.SteelSection`
+    :param float length: Length of the member
+    :param bmd: Bending moment diagram for the member of size *(n x 2)*
+    :type bmd: :class:`numpy.ndarray`
+    :param string load_position: Load position within every segment - 'WS', 'ES', 'WT' or 'ET'
+    :param grid: Candidate relative positions of the intermediate restraints, defaults to
+        *N_GRID* equal intervals
+    :type grid: :class:`numpy.ndarray`
+    :param rtypes: Candidate types of the intermediate restraints
+    :type rtypes: tuple(string)
+    :param ends: Types of the restraints at the start and end of the member
+    :type ends: tuple(string, string)
+
+    :cvar positions: Candidate positions including the member ends
+    :vartype positions: :class:`numpy.ndarray`
+    :cvar feasible: Adequacy of the segment between every pair of candidate restraints
+    :vartype feasible: :class:`numpy.ndarray`
+    """
+
+    def __init__(self, section, length, bmd, load_position, grid=None, rtypes=('L',),
+                 ends=('F', 'F')):
+        """Inits the RestraintOptimiser class."""
+
+        if grid is None:
+            grid = np.linspace(0, 1, N_GRID + 1)
+
+        self.positions = np.unique(np.concatenate(([0], np.asarray(grid, dtype=float), [1])))
+        self.rtypes = tuple(rtypes)
+        self.ends = tuple(ends)
+
+        # candidate restraints (position index, type) in order of position
+        n_pos = len(self.positions)
+        self.node_pos = np.concatenate(([0], np.repeat(np.arange(1, n_pos - 1), len(rtypes)),
+                                        [n_pos - 1]))
+        self.node_type = np.array(
+            [ends[0]] + list(rtypes) * (n_pos - 2) + [ends[1]], dtype='U1')
+
+        # segments between every pair of candidate restraints
+        (m_star, alpha_m) = calc_segment_pairs(bmd, self.positions)
+        (i, j) = np.meshgrid(self.node_pos, self.node_pos, indexing='ij')
+        res_codes = np.char.add(self.node_type[:, None], self.node_type[None, :])
+        valid_code = np.isin(
+            res_codes, [a + b for (a, b) in itertools.product('FPLU', repeat=2)
+                        if ''.join(sorted(a + b)) in VALID_CODES])
+        segment = (i < j) & valid_code
+
+        le = calc_segment_effective_lengths(
+            section, res_codes[segment],
+            length * (self.positions[j[segment]] - self.positions[i[segment]]), load_position)
+        phi_mbx = section.calc_phi_mbx(le=le, alpha_m=alpha_m[i[segment], j[segment]])
+
+        # segments without bending (alpha_m undefined) are adequate
+        m_star = m_star[i[segment], j[segment]]
+        self.feasible = np.zeros(segment.shape, dtype=bool)
+        self.feasible[segment] = ((m_star <= np.minimum(phi_mbx, section.calc_phi_msx())) |
+                                  (m_star == 0))
+
+    def optimise(self, max_restraints=None, costs=None):
+        """Returns the layout of restraints with the lowest cost, of the layouts with equal cost
+        the one with the fewest intermediate restraints.
+
+        :param int max_restraints: Maximum number of intermediate restraints, defaults to no
+            limit
+        :param costs: Cost of an intermediate restraint keyed by type, defaults to 1 for every
+            type (fewest restraints)
+        :type costs: dict[string, float]
+        :returns: Restraints of the member including the end restraints and the cost of the
+            layout, *(None, inf)* if no layout is adequate
+        :rtype: tuple(list[:class:`~steeldesign.codes.Restraint`], float)
+        """
+
+        n_nodes = len(self.node_pos)
+        n_inner = n_nodes - 2
+
+        if max_restraints is None:
+            max_restraints = n_inner
+
+        if costs is None:
+            costs = {rtype: 1 for rtype in self.rtypes}
+
+        node_cost = np.zeros(n_nodes)
+        node_cost[1:-1] = [costs[rtype] for rtype in self.node_type[1:-1].tolist()]
+
+        # cost of stepping from one restraint to the next
+        step = np.where(self.feasible, node_cost[None, :], np.inf)
+
+        # cheapest cost of reaching each restraint with k intermediate restraints
+        cost = np.full(n_nodes, np.inf)
+        cost[0] = 0
+        preds = []
+        best = (np.inf, None)
+
+        for k in range(min(max_restraints, n_inner) + 1):
+            # complete the layout with the end restraint
+            total = cost + step[:, -1]
+            last = int(np.argmin(total))
+
+            if total[last] < best[0]:
+                best = (total[last], (k, last))
+
+            # add an intermediate restraint
+            total = cost[:, None] + step[:, :-1]
+            pred = np.argmin(total, axis=0)
+            cost = np.append(total[pred, np.arange(n_nodes - 1)], np.inf)
+            preds.append(pred)
+
+            if np.isinf(cost).all():
+                break
+
+        if best[1] is None:
+            return (None, np.inf)
+
+        # trace the layout back from the end restraint
+        (k, node) = best[1]
+        nodes = [n_nodes - 1]
+
+        while k > 0:
+            nodes.append(node)
+            node = preds[k - 1][node]
+            k -= 1
+
+        restraints = [Restraint(str(self.node_type[n]), float(self.positions[self.node_pos[n]]))
+                      for n in [0] + nodes[::-1]]
+
+        return (restraints, float(best[0]))
@@ -0,0 +1,295 @@
+import csv
+import hashlib
+import os
+import uuid
+import numpy as np
+from steeldesign.columnar import ARROW_FORMATS, FORMATS, read_table
+from steeldesign.tables import SECTION_DTYPE, SectionTable, build_section, get_props
+
+
+# environment variable overriding the directory catalogues are compiled into
+CACHE_DIR_ENV = 'STEELDESIGN_CACHE_DIR'
+
+
+# mapping of section catalogue csv column headings to SECTION_DTYPE fields
+CSV_COLUMNS = {
+    'name': 'name',
+    'd': 'd',
+    'bf': 'bf',
+    'tf': 'tf',
+    'tw': 'tw',
+    'r': 'r',
+    'Ag': 'area',
+    'mass': 'mass',
+    'Ix': 'ixx',
+    'Zx': 'zxx',
+    'Sx': 'sxx',
+    'rx': 'rx',
+    'Iy': 'iyy',
+    'Zy': 'zyy',
+    'Sy': 'syy',
+    'ry': 'ry',
+    'J': 'j',
+    'Iw': 'iw',
+    'kf': 'kf',
+}
+
+
+def read_csv(csv_path):
+    """Reads a section catalogue csv file (in the format of ``tests/ub.csv``) into a structured
+    array. Rows without a name are skipped and properties missing from the file are set to *nan*.
+
+    :param string csv_path: Path to the csv file
+    :returns: Section data with dtype :data:`~steeldesign.tables.SECTION_DTYPE`
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f, delimiter=',')
+        header = next(reader)
+        columns = [(i, CSV_COLUMNS[heading.strip()]) for (i, heading) in enumerate(header)
+                   if heading.strip() in CSV_COLUMNS]
+        rows = [row for row in reader if row and row[0] != '']
+
+    data = np.full(len(rows), np.nan, dtype=SECTION_DTYPE)
+
+    for (i, field) in columns:
+        data[field] = [row[i] for row in rows]
+
+    return data
+
+
+def read_catalogue(path):
+    """Reads a section catalogue csv, Parquet or Arrow IPC file with the columns of
+    ``tests/ub.csv`` into a structured array, see :func:`read_csv`.
+
+    :param string path: Path to the file
+    :returns: Section data with dtype :data:`~steeldesign.tables.SECTION_DTYPE`
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    if FORMATS.get(os.path.splitext(path)[1].lower()) not in ARROW_FORMATS:
+        return read_csv(path)
+
+    table = read_table(path)
+    rows = [i for (i, name) in enumerate(table.get('name', [])) if name]
+    data = np.full(len(rows), np.nan, dtype=SECTION_DTYPE)
+
+    for (heading, field) in CSV_COLUMNS.items():
+        if heading in table:
+            data[field] = [table[heading][i] for i in rows]
+
+    return data
+
+
+def compile_csv(csv_path, npy_path=None):
+    """Compiles a section catalogue csv file (or Parquet or Arrow IPC file, see
+    :func:`read_catalogue`) into a binary ``.npy`` file that can be memory mapped by
+    :class:`SectionLibrary`.
+
+    The file is written to a temporary file which then replaces *npy_path*, so that concurrent
+    readers never memory map a partly written file.
+
+    :param string csv_path: Path to the csv file
+    :param string npy_path: Path to the binary file, defaults to *csv_path* with a ``.npy``
+        extension
+    :returns: Path to the binary file
+    :rtype: string
+    """
+
+    if npy_path is None:
+        npy_path = os.path.splitext(csv_path)[0] + '.npy'
+
+    data = read_catalogue(csv_path)
+    tmp_path = '{0}.{1}.tmp'.format(npy_path, uuid.uuid4().hex)
+
+    try:
+        with open(tmp_path, 'xb') as f:
+            np.save(f, data)
+
+        os.replace(tmp_path, npy_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return npy_path
+
+
+def get_cache_dir():
+    """Returns the directory catalogues are compiled into by :class:`SectionLibrary`, given by
+    the environment variable :data:`CACHE_DIR_ENV` or defaulting to ``steeldesign`` in the user
+    cache directory. The directory is created if it does not exist.
+
+    :returns: Path to the cache directory
+    :rtype: string
+    """
+
+    cache_dir = os.environ.get(CACHE_DIR_ENV) or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+        'steeldesign')
+    os.makedirs(cache_dir, exist_ok=True)
+
+    return cache_dir
+
+
+def get_cache_path(path):
+    """Returns the path of the binary file a catalogue is compiled to in the cache directory,
+    unique to the absolute path of the catalogue.
+
+    :param string path: Path to the csv, Parquet or Arrow IPC catalogue
+    :returns: Path to the binary file
+    :rtype: string
+    """
+
+    path = os.path.abspath(path)
+    digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+
+    return os.path.join(get_cache_dir(), '{0}-{1}.npy'.format(
+        os.path.splitext(os.path.basename(path))[0], digest))
+
+
+class SectionLibrary:
+    """Catalogue of Universal Beam type sections stored in a binary ``.npy`` file.
+
+    The file is memory mapped, so opening a library does not read the catalogue, and section
+    objects are only built when they are first accessed, by name or by index.
+
+    :param string path: Path to a ``.npy`` file written by :func:`compile_csv`, or to a csv,
+        Parquet or Arrow IPC catalogue which is compiled into the cache directory (see
+        :func:`get_cache_dir`) if its binary file is missing or older
+    :param code: Design code
+    :type code: :class:`~steeldesign.codes.DesignCode`
+    :param grade: Steel grade of the sections
+    :type grade: :class:`~steeldesign.codes.SteelGrade`
+    """
+
+    def __init__(self, path, code, grade):
+        """Inits the SectionLibrary class."""
+
+        if FORMATS.get(os.path.splitext(path)[1].lower()) in ('csv',) + ARROW_FORMATS:
+            npy_path = get_cache_path(path)
+
+            if (not os.path.exists(npy_path) or
+                    os.path.getmtime(npy_path) < os.path.getmtime(path)):
+                compile_csv(path, npy_path)
+
+            path = npy_path
+
+        self.path = path
+        self.code = code
+        self.grade = grade
+        self.data = np.load(path, mmap_mode='r')
+        self._index = None
+        self._sections = {}
+
+    def __len__(self):
+        """Returns the number of sections in the library."""
+
+        return len(self.data)
+
+    def __contains__(self, name):
+        """Returns whether a section called *name* is in the library."""
+
+        return name in self.get_index()
+
+    def __iter__(self):
+        """Iterates over the sections of the library."""
+
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, key):
+        """Returns the section with the name or index *key*, building it on first access.
+
+        :param key: Section name or row index
+        :type key: string or int
+        :returns: Section object
+        :rtype: :class:`~steeldesign.sections.UBSection`
+
+        :raises IndexError: If the index is out of range
+        """
+
+        if isinstance(key, str):
+            i = self.get_index()[key]
+        else:
+            i = int(key)
+            i = i + len(self) if i < 0 else i
+
+            if not 0 <= i < len(self):
+                raise IndexError('Section index {0} is out of range'.format(key))
+
+        try:
+            return self._sections[i]
+        except KeyError:
+            section = self._sections[i] = self.build_section(self.data[i])
+
+            return section
+
+    def get_index(self):
+        """Returns a dictionary mapping section names to row indices, built on first use.
+
+        :returns: Section name index
+        :rtype: dict
+        """
+
+        if self._index is None:
+            self._index = {str(name): i for (i, name) in enumerate(self.data['name'])}
+
+        return self._index
+
+    def get_names(self):
+        """Returns the names of the sections in the library.
+
+        :returns: Section names
+        :rtype: list[string]
+        """
+
+        return list(self.get_index())
+
+    def get_row(self, name):
+        """Returns the record of the section called *name*.
+
+        :param string name: Section name
+        :returns: Section record with dtype :data:`~steeldesign.tables.SECTION_DTYPE`
+        :rtype: :class:`numpy.void`
+
+        :raises Exception: If the section is not in the library
+        """
+
+        try:
+            return self.data[self.get_index()[name]]
+        except KeyError:
+            raise Exception('Section {0} is not in the library'.format(name))
+
+    def get_section_props(self, name):
+        """Returns the list of section properties expected by
+        :class:`~steeldesign.sections.SteelSection` for the section called *name*.
+
+        :param string name: Section name
+        :returns: List of section properties
+        :rtype: list[float]
+
+        :raises Exception: If the section is not in the library
+        """
+
+        return get_props(self.get_row(name))
+
+    def build_section(self, row):
+        """Builds a section object from a library record.
+
+        :param row: Section record with dtype :data:`~steeldesign.tables.SECTION_DTYPE`
+        :type row: :class:`numpy.void`
+        :returns: Section object
+        :rtype: :class:`~steeldesign.sections.UBSection`
+        """
+
+        return build_section(self.code, self.grade, row)
+
+    def get_table(self):
+        """Returns the whole library as a :class:`~steeldesign.tables.SectionTable`.
+
+        :returns: Section table
+        :rtype: :class:`~steeldesign.tables.SectionTable`
+        """
+
+        return SectionTable(self.code, self.grade, np.asarray(self.data))
@@ -1,4 +1,11 @@
+import bisect
 import numpy as np
+from steeldesign.buckling import calc_member_buckling, calc_segment_buckling
+from steeldesign.profiling import instrument
+
+
+# relative positions of the quarter points of a segment
+QUARTERS = np.array([0.25, 0.5, 0.75])
 
 
 class Member:
@@ -9,21 +16,35 @@ class Member:
 
         self.section = section
         self.length = length
-        self.restraints = []
 
-        for restraint in restraints:
-            self.add_restraint(restraint)
+        # sort the restraints once
+        self.restraints = sorted(restraints, key=lambda r: r.pos)
 
     def add_restraint(self, restraint):
         """a"""
 
-        # add the restraint to the list
-        self.restraints.append(restraint)
+        # insert the restraint after any restraints at the same position
+        positions = [r.pos for r in self.restraints]
+        self.restraints.insert(bisect.bisect_right(positions, restraint.pos), restraint)
+
+    @instrument()
+    def calc_alpha_m(self, bmd):
+        """Calculates alpha_m for each segment of the member in one pass.
+
+        :param bmd: Bending moment diagram for the member of size *(n x 2)*, or a stack of
+            bending moment diagrams of size *(n_cases x n x 2)*
+        :type bmd: :class:`numpy.ndarray`
+        :returns: alpha_m of size *(n_segments)*, or *(n_cases x n_segments)* for a stack
+        :rtype: :class:`numpy.ndarray`
+        """
 
-        # reorder restraints
-        self.restraints.sort(key=lambda r: r.pos)
+        positions = np.array([restraint.pos for restraint in self.restraints])
 
-    def calc_phi_mbx(self, bmd, load_position, alpha_m=None):
+        return calc_alpha_m_segments(bmd, positions)
+
+    @instrument()
+    def calc_phi_mbx(self, bmd, load_position, alpha_m=None, interpolate=False,
+                     buckling_analysis=False):
         """Calculates phiMbx for the member for each segment based on the applied restraints and
         supplied bending moment diagram *bmd*.
 
@@ -35,11 +56,21 @@ class Member:
         :type load_position: list[strings]
         :param alpha_m: Optional list of alpha_m values to override those calculated from the bmd
         :type alpha_m: list[float]
+        :param bool interpolate: Whether to look phiMbx up from the precomputed curve of the
+            section (see :meth:`~steeldesign.sections.SteelSection.get_phi_mbx_curve`)
+        :param buckling_analysis: Whether to determine phiMbx of each segment from an elastic
+            buckling analysis (Cl. 5.6.4) - *True* or 'segment' for an analysis of each segment
+            with alpha_m = Mob / Moa (see :func:`~steeldesign.buckling.calc_segment_buckling`),
+            'member' for an analysis of the whole member giving the effective length of each
+            segment (see :func:`~steeldesign.buckling.calc_member_buckling`); both determine
+            alpha_m, which cannot be overridden
+        :type buckling_analysis: bool or string
         :returns: A list of phiMbx values for each segment
         :rtype: list[float]
 
         :raises Exception: Size of load_position is not equal to the number of segments
         :raises Exception: Size of alpha_m is not equal to the number of segments
+        :raises Exception: If alpha_m is overridden in a buckling analysis
         """
 
         # check length of load_position equals number of segments
@@ -51,6 +82,9 @@ class Member:
             if len(alpha_m) != len(self.restraints) - 1:
                 raise Exception('Size of alpha_m must equal number of segments')
 
+            if buckling_analysis:
+                raise Exception('alpha_m cannot be overridden in a buckling analysis')
+
         # generate segments
         segments = []
 
@@ -58,14 +92,31 @@ class Member:
             segments.append(Segment(self.length, self.restraints[i], self.restraints[i+1],
                                     load_position[i], bmd, self.section))
 
+        if buckling_analysis == 'member':
+            (load_factor, mob, le, alpha_m) = calc_member_buckling(self, bmd, load_position)
+
+            return [self.section.calc_phi_mbx(le=le[i], alpha_m=alpha_m[i])
+                    for i in range(len(segments))]
+
+        if buckling_analysis:
+            phi_mbx = []
+
+            for segment in segments:
+                (mob, moa) = calc_segment_buckling(segment)
+                phi_mbx.append(self.section.calc_phi_mbx_from_m0(moa, alpha_m=mob / moa))
+
+            return phi_mbx
+
         # calculate alpha_m values
+        if alpha_m is None:
+            alpha_m = self.calc_alpha_m(bmd)
+
         for (i, segment) in enumerate(segments):
-            if alpha_m is None:
-                segment.calc_alpha_m()
-            else:
-                segment.alpha_m = alpha_m[i]
+            segment.alpha_m = alpha_m[i]
 
         phi_mbx = []
+        calc_phi_mbx = (self.section.get_phi_mbx_curve() if interpolate
+                        else self.section.calc_phi_mbx)
 
         # calculate phi_mbx for each segment
         for segment in segments:
@@ -73,7 +124,7 @@ class Member:
             le = segment.calc_effective_length()
             alpha_m = segment.alpha_m
 
-            phi_mbx.append(self.section.calc_phi_mbx(le=le, alpha_m=alpha_m))
+            phi_mbx.append(calc_phi_mbx(le=le, alpha_m=alpha_m))
 
         return phi_mbx
 
@@ -105,6 +156,10 @@ class Segment:
     :vartype: :class:`steeldesign.sections.SteelSection`
     """
 
+    __slots__ = ('segment_length', 'restraint1', 'restraint2', 'load_position', 'section',
+                 'bmd_segment', 'alpha_m')
+
+    @instrument()
     def __init__(self, member_length, restraint1, restraint2, load_position,
                  bmd, section):
         """Inits the Segment class."""
@@ -115,21 +170,17 @@ class Segment:
         self.load_position = load_position
         self.section = section
 
-        bmd_segment = []
-
-        # add start point for the segment bmd
-        bmd_segment.append([restraint1.pos, np.interp(restraint1.pos, bmd[:, 0], bmd[:, 1])])
-
-        # loop through bending moments
-        for bm in bmd:
-            if (bm[0] > restraint1.pos) and (bm[0] < restraint2.pos):
-                bmd_segment.append(bm)
-
-        # add end point for the segment bmd
-        bmd_segment.append([restraint2.pos, np.interp(restraint2.pos, bmd[:, 0], bmd[:, 1])])
+        # slice the bmd between the restraints, stations are assumed to be in ascending order
+        x = bmd[:, 0]
+        start = np.searchsorted(x, restraint1.pos, side='right')
+        end = np.searchsorted(x, restraint2.pos, side='left')
+        bm_ends = np.interp([restraint1.pos, restraint2.pos], x, bmd[:, 1])
 
-        self.bmd_segment = np.array(bmd_segment)
+        self.bmd_segment = np.vstack((
+            [restraint1.pos, bm_ends[0]], bmd[start:end], [restraint2.pos, bm_ends[1]]
+        ))
 
+    @instrument()
     def calc_alpha_m(self):
         """Calculates the alpha_m value for the segment based on the bending moment diagram.
 
@@ -137,26 +188,21 @@ class Segment:
         """
 
         # get start pos, end pos and length of segment
-        start_pos = self.bmd_segment[0][0]
-        end_pos = self.bmd_segment[-1][0]
+        start_pos = self.bmd_segment[0, 0]
+        end_pos = self.bmd_segment[-1, 0]
         length = end_pos - start_pos
 
         # get max bending moment
-        bm_max = self.bmd_segment.max(axis=0)[1]
+        bm_max = self.bmd_segment[:, 1].max()
 
         # get bending moment at quarter points
-        bm_quarters = []
-        for i in range(3):
-            mult = 0.25 * (i + 1)
-            bm_quarters.append(np.interp(
-                start_pos + mult * length, self.bmd_segment[:, 0], self.bmd_segment[:, 1])
-            )
+        bm_quarters = np.interp(start_pos + QUARTERS * length, self.bmd_segment[:, 0],
+                                self.bmd_segment[:, 1])
 
         # calculate calc_alpha_m
-        self.alpha_m = min(2.5, 1.7 * bm_max / np.sqrt(
-            bm_quarters[0] ** 2 + bm_quarters[1] ** 2 + bm_quarters[2] ** 2)
-        )
+        self.alpha_m = min(2.5, 1.7 * bm_max / np.sqrt(np.sum(bm_quarters ** 2)))
 
+    @instrument()
     def calc_effective_length(self):
         """Returns the effective length of the segment.
 
@@ -228,3 +274,186 @@ class Segment:
                 return True
 
         return False
+
+
+def calc_alpha_m_segments(bmds, positions):
+    """Returns alpha_m for every segment between consecutive restraint *positions*.
+
+    The bending moments at all segment ends and quarter points are found with a single
+    interpolation and the maximum bending moment of every segment with a single
+    :func:`numpy.maximum.reduceat`, for all bending moment diagrams at once.
+
+    Cl. 5.6.1.1(a)(iii) AS4100-1998
+
+    :param bmds: Bending moment diagram of size *(n_points x 2)*, a stack of bending moment
+        diagrams of size *(n_cases x n_points x 2)*, or a list of *n_cases* arrays of size
+        *(n_points x 2)* with varying *n_points*. Stations must be in ascending order.
+    :type bmds: :class:`numpy.ndarray` or list[:class:`numpy.ndarray`]
+    :param positions: Relative positions of the restraints in ascending order
+    :type positions: :class:`numpy.ndarray`
+    :returns: alpha_m of size *(n_segments)* for a single bmd, otherwise of size
+        *(n_cases x n_segments)*
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    positions = np.asarray(positions, dtype=float)
+
+    if isinstance(bmds, np.ndarray) and bmds.ndim == 2:
+        return _alpha_m_shared(bmds[:, 0], bmds[None, :, 1], positions)[0]
+
+    if isinstance(bmds, np.ndarray) and (bmds[:, :, 0] == bmds[:1, :, 0]).all():
+        return _alpha_m_shared(bmds[0, :, 0], bmds[:, :, 1], positions)
+
+    alpha_m = []
+
+    for bmd in bmds:
+        bmd = np.asarray(bmd, dtype=float)
+        alpha_m.append(_alpha_m_shared(bmd[:, 0], bmd[None, :, 1], positions))
+
+    return np.vstack(alpha_m)
+
+
+def _alpha_m_shared(x, m, positions):
+    """Returns alpha_m of size *(n_cases x n_segments)* for bending moments *m* of size
+    *(n_cases x n_points)* sharing the stations *x*."""
+
+    n_seg = len(positions) - 1
+    start = positions[:-1]
+    length = np.diff(positions)
+    quarters = (start[:, None] + QUARTERS * length[:, None]).ravel()
+
+    # bending moments at the segment ends and quarter points
+    bm = interp_rows(x, m, np.concatenate((positions, quarters)))
+    bm_ends = bm[:, :n_seg + 1]
+    bm_quarters = bm[:, n_seg + 1:].reshape(-1, n_seg, 3)
+
+    # maximum bending moment of each segment
+    bm_max = _segment_max(x, m, positions, bm_ends)
+
+    return np.minimum(2.5, 1.7 * bm_max / np.sqrt((bm_quarters ** 2).sum(axis=-1)))
+
+
+def calc_design_moments(bmds, positions):
+    """Returns the maximum absolute bending moment, M*, within every segment between
+    consecutive restraint *positions*.
+
+    :param bmds: Bending moment diagram(s), see :func:`calc_alpha_m_segments`
+    :type bmds: :class:`numpy.ndarray` or list[:class:`numpy.ndarray`]
+    :param positions: Relative positions of the restraints in ascending order
+    :type positions: :class:`numpy.ndarray`
+    :returns: M* of size *(n_segments)* for a single bmd, otherwise of size
+        *(n_cases x n_segments)*
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    positions = np.asarray(positions, dtype=float)
+
+    def design_moments(x, m):
+        bm_ends = np.abs(interp_rows(x, m, positions))
+
+        return _segment_max(x, np.abs(m), positions, bm_ends)
+
+    if isinstance(bmds, np.ndarray) and bmds.ndim == 2:
+        return design_moments(bmds[:, 0], bmds[None, :, 1])[0]
+
+    if isinstance(bmds, np.ndarray) and (bmds[:, :, 0] == bmds[:1, :, 0]).all():
+        return design_moments(bmds[0, :, 0], bmds[:, :, 1])
+
+    return np.vstack([
+        design_moments(bmd[:, 0], bmd[None, :, 1])
+        for bmd in (np.asarray(bmd, dtype=float) for bmd in bmds)
+    ])
+
+
+def calc_segment_pairs(bmd, positions):
+    """Returns M* and alpha_m of the segment between every pair of candidate restraint
+    *positions*, e.g. to assess all restraint layouts drawn from the positions at once.
+
+    The maxima over each pair are running maxima of the maxima between consecutive positions, so
+    the bending moment diagram is scanned once and every pair costs O(1).
+
+    :param bmd: Bending moment diagram of size *(n_points x 2)* with stations in ascending order
+    :type bmd: :class:`numpy.ndarray`
+    :param positions: Relative positions in ascending order
+    :type positions: :class:`numpy.ndarray`
+    :returns: M* and alpha_m of size *(n x n)*, entry *[i, j]* is the segment from position *i*
+        to position *j*, entries with *j <= i* are *nan*
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+    """
+
+    bmd = np.asarray(bmd, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    (x, m) = (bmd[:, 0], bmd[None, :, 1])
+    n = len(positions)
+    pair = np.triu(np.ones((n, n), dtype=bool), k=1)
+
+    # maxima between consecutive positions, accumulated over pairs
+    bm_ends = interp_rows(x, m, positions)
+    upper = pair[:-1, 1:]
+    bm_max = np.full((n, n), np.nan)
+    bm_max[:-1, 1:] = np.maximum.accumulate(
+        np.where(upper, _segment_max(x, m, positions, bm_ends)[0], -np.inf), axis=1)
+    m_star = np.full((n, n), np.nan)
+    m_star[:-1, 1:] = np.maximum.accumulate(
+        np.where(upper, _segment_max(x, np.abs(m), positions, np.abs(bm_ends))[0], -np.inf),
+        axis=1)
+    m_star[~pair] = np.nan
+
+    # bending moments at the quarter points of every pair
+    quarters = positions[:, None, None] + (positions[None, :] - positions[:, None])[
+        :, :, None] * QUARTERS
+    bm_quarters = interp_rows(x, m, quarters)[0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alpha_m = np.minimum(2.5, 1.7 * bm_max / np.sqrt((bm_quarters ** 2).sum(axis=-1)))
+
+    alpha_m[~pair] = np.nan
+
+    return (m_star, alpha_m)
+
+
+def _segment_max(x, m, positions, bm_ends):
+    """Returns the maximum of *m* (stations *x*) within each segment between consecutive
+    *positions*, given the values *bm_ends* at the positions, of size *(n_rows x n_segments)*."""
+
+    # stations strictly within the segments
+    n_pos = len(positions)
+    k = np.searchsorted(positions, x, side='left')
+    inside = (k > 0) & (k < n_pos) & (x != positions[np.minimum(k, n_pos - 1)])
+    m_inside = m[:, inside]
+
+    # merge the stations with the segment start values, each segment preceded by its start
+    starts = np.searchsorted(x[inside], positions[:-1]) + np.arange(n_pos - 1)
+    stations = np.ones(m_inside.shape[1] + n_pos - 1, dtype=bool)
+    stations[starts] = False
+    merged = np.empty((len(m), len(stations)))
+    merged[:, starts] = bm_ends[:, :-1]
+    merged[:, stations] = m_inside
+
+    return np.maximum(np.maximum.reduceat(merged, starts, axis=1), bm_ends[:, 1:])
+
+
+def interp_rows(x, m, q):
+    """Linearly interpolates each row of *m*, sampled at the stations *x*, at the positions *q*.
+    Equivalent to calling :func:`numpy.interp` for each row.
+
+    :param x: Stations in ascending order of size *(n_points)*
+    :type x: :class:`numpy.ndarray`
+    :param m: Values of size *(n_rows x n_points)*
+    :type m: :class:`numpy.ndarray`
+    :param q: Positions to interpolate at
+    :type q: :class:`numpy.ndarray`
+    :returns: Interpolated values of size *(n_rows,) + q.shape*
+    :rtype: :class:`numpy.ndarray`
+    """
+
+    if len(m) == 1:
+        return np.interp(q, x, m[0])[None]
+
+    idx = np.minimum(np.maximum(np.searchsorted(x, q, side='right') - 1, 0), len(x) - 2)
+    x0 = x[idx]
+    x1 = x[idx + 1]
+    w = np.divide(q - x0, x1 - x0, out=np.zeros(np.shape(q)), where=x1 > x0)
+    w = np.minimum(np.maximum(w, 0), 1)
+
+    return m[:, idx] * (1 - w) + m[:, idx + 1] * w
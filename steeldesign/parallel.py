@@ -0,0 +1,149 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from steeldesign.batch import calc_phi_mbx_batch
+
+
+# target number of chunks per worker, more chunks balance the load better at the cost of overhead
+CHUNKS_PER_WORKER = 4
+
+# upper bound on the number of checks sent to a worker at once
+MAX_CHUNKSIZE = 2048
+
+# design check data held by each worker process, set once by _init_worker
+_state = {}
+
+
+class ParallelChecker:
+    """Runs phiMbx checks of many (member, load case) pairs across a pool of worker processes.
+
+    The members (and through them the sections, design code and steel grades), bending moment
+    diagrams and load positions are sent to each worker once when the pool starts; tasks only
+    carry indices. Results are returned in the order of the tasks. With one worker the checks are
+    run in the calling process without starting a pool.
+
+    :param members: List of members to check
+    :type members: list[:class:`~steeldesign.member.Member`]
+    :param bmds: Bending moment diagrams of each member, a list with one entry per member that is
+        either a stack of size *(n_cases x n_points x 2)* or a list of arrays of size
+        *(n_points x 2)*
+    :type bmds: list
+    :param load_positions: List with one list of load position strings per member
+    :type load_positions: list[list[string]]
+    :param int max_workers: Number of worker processes, defaults to the number of CPUs
+    :param int chunksize: Number of checks per task sent to a worker, calculated from the number
+        of checks and workers if not supplied
+    """
+
+    def __init__(self, members, bmds, load_positions, max_workers=None, chunksize=None):
+        """Inits the ParallelChecker class."""
+
+        if len(bmds) != len(members) or len(load_positions) != len(members):
+            raise Exception('Size of bmds and load_positions must equal number of members')
+
+        self.members = members
+        self.bmds = bmds
+        self.load_positions = load_positions
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+
+    def all_tasks(self):
+        """Returns a (member index, load case index) task for every load case of every member.
+
+        :returns: List of tasks
+        :rtype: list[tuple(int, int)]
+        """
+
+        return [(i, j) for i in range(len(self.members)) for j in range(len(self.bmds[i]))]
+
+    def calc_chunksize(self, n_tasks):
+        """Returns the number of checks per chunk for *n_tasks* checks.
+
+        :param int n_tasks: Number of checks
+        :returns: Chunk size
+        :rtype: int
+        """
+
+        if self.chunksize is not None:
+            return self.chunksize
+
+        chunksize = math.ceil(n_tasks / (self.max_workers * CHUNKS_PER_WORKER))
+
+        return max(1, min(MAX_CHUNKSIZE, chunksize))
+
+    def run(self, tasks=None):
+        """Runs the checks.
+
+        :param tasks: List of (member index, load case index) pairs to check, defaults to
+            :meth:`all_tasks`
+        :type tasks: list[tuple(int, int)]
+        :returns: phiMbx of each segment for each task, in the order of *tasks*
+        :rtype: list[:class:`numpy.ndarray`]
+        """
+
+        if tasks is None:
+            tasks = self.all_tasks()
+
+        tasks = list(tasks)
+        chunksize = self.calc_chunksize(len(tasks))
+        chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+        data = (self.members, self.bmds, self.load_positions)
+
+        # run in process if parallel execution cannot help
+        if self.max_workers == 1 or len(chunks) <= 1:
+            _init_worker(*data)
+
+            try:
+                return [result for chunk in chunks for result in _check_chunk(chunk)]
+            finally:
+                _state.clear()
+
+        n_workers = min(self.max_workers, len(chunks))
+
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=data) as executor:
+            return [result for chunk_results in executor.map(_check_chunk, chunks)
+                    for result in chunk_results]
+
+
+def _init_worker(members, bmds, load_positions):
+    """Stores the design check data in the worker process."""
+
+    _state['members'] = members
+    _state['bmds'] = bmds
+    _state['load_positions'] = load_positions
+
+
+def _check_chunk(chunk):
+    """Checks a chunk of (member index, load case index) tasks in a worker process, evaluating the
+    load cases of each member in a single batch."""
+
+    members = _state['members']
+    bmds = _state['bmds']
+    load_positions = _state['load_positions']
+
+    # group the load cases of the chunk by member
+    cases = {}
+
+    for (i, j) in chunk:
+        cases.setdefault(i, []).append(j)
+
+    results = {}
+
+    for (i, case_ids) in cases.items():
+        member = members[i]
+        n_seg = len(member.restraints) - 1
+
+        if isinstance(bmds[i], np.ndarray):
+            member_bmds = bmds[i][case_ids]
+        else:
+            member_bmds = [bmds[i][j] for j in case_ids]
+
+        phi_mbx = calc_phi_mbx_batch(
+            [member], [member_bmds], [load_positions[i]])[0, :, :n_seg]
+
+        for (j, row) in zip(case_ids, phi_mbx):
+            results[(i, j)] = row
+
+    return [results[task] for task in chunk]
@@ -0,0 +1,215 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from steeldesign.cache import GLOBAL_STATS
+
+
+# profiler receiving measurements, None when instrumentation is disabled
+_active = None
+
+
+class Profiler:
+    """Records call counts and cumulative wall time of the instrumented design check functions,
+    as well as named counters such as root solver iterations and cache hits.
+
+    Use :func:`profile` to enable a profiler for a block of code.
+
+    :param bool trace: Whether to keep every call as an event for :meth:`to_chrome_trace`
+
+    :cvar timers: Number of calls and cumulative (inclusive) wall time [s] of each function
+    :vartype timers: dict[string, list[int, float]]
+    :cvar counters: Value of each counter
+    :vartype counters: dict[string, int]
+    :cvar events: Recorded calls *(name, start time, duration, thread id)* if *trace* is True
+    :vartype events: list[tuple(string, float, float, int)]
+    """
+
+    def __init__(self, trace=False):
+        """Inits the Profiler class."""
+
+        self.trace = trace
+        self.timers = {}
+        self.counters = {}
+        self.events = []
+        self.start_time = time.perf_counter()
+
+    def record(self, name, start, duration):
+        """Records a call of the function *name*.
+
+        :param string name: Function name
+        :param float start: Start time of the call (:func:`time.perf_counter`)
+        :param float duration: Duration of the call [s]
+        """
+
+        try:
+            timer = self.timers[name]
+        except KeyError:
+            timer = self.timers[name] = [0, 0.0]
+
+        timer[0] += 1
+        timer[1] += duration
+
+        if self.trace:
+            self.events.append((name, start, duration, threading.get_ident()))
+
+    def count(self, name, n=1):
+        """Increments the counter *name* by *n*.
+
+        :param string name: Counter name
+        :param int n: Increment
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        """Returns the recorded timers and counters.
+
+        :returns: Timers *(calls, total time [s], mean time [us])* sorted by total time, and
+            counters
+        :rtype: dict
+        """
+
+        timers = {}
+
+        for (name, (calls, total)) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            timers[name] = {'calls': calls, 'total_s': total, 'mean_us': total / calls * 1e6}
+
+        return {'timers': timers, 'counters': dict(self.counters)}
+
+    def to_json(self, path=None):
+        """Returns the recorded timers and counters as a json string, optionally writing them to
+        *path*.
+
+        :param string path: Path of the json file to write
+        :returns: json string
+        :rtype: string
+        """
+
+        text = json.dumps(self.to_dict(), indent=2)
+
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+
+        return text
+
+    def to_chrome_trace(self, path):
+        """Writes the recorded calls in the Chrome trace event format, viewable in
+        ``chrome://tracing`` or Perfetto. Requires the profiler to be created with
+        *trace=True*.
+
+        :param string path: Path of the trace file to write
+
+        :raises Exception: If the profiler does not record a trace
+        """
+
+        if not self.trace:
+            raise Exception('Profiler must be created with trace=True to export a trace')
+
+        pid = os.getpid()
+        events = [{
+            'name': name,
+            'ph': 'X',
+            'ts': (start - self.start_time) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': tid,
+        } for (name, start, duration, tid) in self.events]
+
+        for (name, value) in self.counters.items():
+            events.append({'name': name, 'ph': 'C', 'ts': 0, 'pid': pid,
+                           'args': {'value': value}})
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def report(self):
+        """Returns a table of the recorded timers and counters.
+
+        :returns: Report
+        :rtype: string
+        """
+
+        data = self.to_dict()
+        lines = ['{0:<40}{1:>10}{2:>14}{3:>14}'.format('function', 'calls', 'total [ms]',
+                                                       'mean [us]')]
+
+        for (name, timer) in data['timers'].items():
+            lines.append('{0:<40}{1:>10}{2:>14.3f}{3:>14.3f}'.format(
+                name, timer['calls'], timer['total_s'] * 1e3, timer['mean_us']))
+
+        for (name, value) in data['counters'].items():
+            lines.append('{0:<40}{1:>10}'.format(name, value))
+
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def profile(trace=False):
+    """Context manager enabling instrumentation of the design check functions.
+
+    Cache hits and misses of the section caches within the block are added to the counters
+    *cache.hits* and *cache.misses*.
+
+    :param bool trace: Whether to record every call for :meth:`Profiler.to_chrome_trace`
+    :returns: Profiler receiving the measurements
+    :rtype: :class:`~steeldesign.profiling.Profiler`
+    """
+
+    global _active
+
+    previous = _active
+    profiler = Profiler(trace=trace)
+    (hits, misses) = (GLOBAL_STATS.hits, GLOBAL_STATS.misses)
+    _active = profiler
+
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        profiler.count('cache.hits', GLOBAL_STATS.hits - hits)
+        profiler.count('cache.misses', GLOBAL_STATS.misses - misses)
+
+
+def instrument(name=None):
+    """Decorator recording the calls of a function in the active profiler. When no profiler is
+    active the only overhead is a check of a module level variable.
+
+    :param string name: Name to record the function under, defaults to its qualified name
+    :returns: Decorator
+    """
+
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(label, start, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name, n=1):
+    """Increments the counter *name* of the active profiler, if any.
+
+    :param string name: Counter name
+    :param int n: Increment
+    """
+
+    if _active is not None:
+        _active.count(name, n)
@@ -1,14 +1,48 @@
 import numpy as np
-from scipy import optimize
+from steeldesign.cache import CacheStats, LRUCache, Versioned, cached
+from steeldesign.codes import (COMPACTNESS_LABELS, PLATE_TYPE_CODES, PLATE_TYPES,
+                               classify_compactness, get_labels)
+from steeldesign.curves import LE_MAX, LE_MIN, TOLERANCE, PhiMbxCurve
+from steeldesign.profiling import count, instrument
 
 
-class SteelSection:
-    """a"""
+# maximum number of effective lengths for which M0 is cached per section
+M0_CACHE_SIZE = 256
+
+# density of steel [kg/m^3]
+STEEL_DENSITY = 7850
+
+
+class SteelSection(Versioned):
+    """a
+
+    Results that do not depend on the effective length are cached per section and the reference
+    buckling moment is cached for the most recently used effective lengths. Caches are discarded
+    when an attribute of the section, its design code or its steel grade is changed.
+
+    :cvar cache_stats: Hit/miss statistics of the section results cache
+    :vartype cache_stats: :class:`~steeldesign.cache.CacheStats`
+    """
 
     def __init__(self, code, props):
         """a"""
 
+        self._cache = {}
+        self._cache_token = None
+        self._m0_cache = LRUCache(maxsize=M0_CACHE_SIZE)
+        self.cache_stats = CacheStats()
+
         self.code = code
+        self.set_section_properties(props)
+
+    def set_section_properties(self, props):
+        """Sets the section properties from a list of values.
+
+        :param props: List of section properties *(area, mass, ixx, zxx, sxx, rx, iyy, zyy, syy,
+            ry, j, iw, kf)*
+        :type props: list[float]
+        """
+
         self.area = props[0]
         self.mass = props[1]
         self.ixx = props[2]
@@ -23,16 +57,89 @@ class SteelSection:
         self.iw = props[11]
         self.kf = props[12]
 
+    def state_token(self):
+        """Returns a token that changes whenever the section, its design code or its steel grade
+        is modified.
+
+        :returns: State token
+        :rtype: tuple
+        """
+
+        grade = getattr(self, 'grade', None)
+
+        return (self.get_version(), id(self.code), self.code.get_version(), id(grade),
+                None if grade is None else grade.get_version())
+
+    def get_cache(self):
+        """Returns the cache of results that do not depend on the effective length, discarding
+        all cached results if the state of the section has changed.
+
+        :returns: Results cache
+        :rtype: dict
+        """
+
+        token = self.state_token()
+
+        if token != self._cache_token:
+            self.clear_cache()
+            self._cache_token = token
+
+        return self._cache
+
+    def get_m0_cache(self):
+        """Returns the least recently used cache of reference buckling moments keyed by effective
+        length.
+
+        :returns: M0 cache
+        :rtype: :class:`~steeldesign.cache.LRUCache`
+        """
+
+        self.get_cache()
+
+        return self._m0_cache
+
+    def clear_cache(self):
+        """Discards all cached results of the section."""
+
+        self._cache.clear()
+        self._m0_cache.clear()
+
+    def cache_info(self):
+        """Returns the hit/miss statistics of the section caches.
+
+        :returns: Statistics of the results cache and of the M0 cache
+        :rtype: dict
+        """
+
+        return {
+            'hits': self.cache_stats.hits,
+            'misses': self.cache_stats.misses,
+            'size': len(self._cache),
+            'm0_hits': self._m0_cache.stats.hits,
+            'm0_misses': self._m0_cache.stats.misses,
+            'm0_size': len(self._m0_cache),
+        }
+
     def calc_section_properties(self):
         """a"""
 
         pass
 
-    def load_section_properties(self):
-        """a"""
+    def load_section_properties(self, library, name=None):
+        """Sets the section properties from a section library.
 
-        pass
+        :param library: Section library to load the properties from
+        :type library: :class:`~steeldesign.library.SectionLibrary`
+        :param string name: Name of the section in the library, defaults to the name of the
+            section
+
+        :raises Exception: If the section is not in the library
+        """
+
+        self.set_section_properties(library.get_section_props(name or self.name))
 
+    @instrument()
+    @cached
     def calc_ze(self, axis):
         """a
 
@@ -71,40 +178,81 @@ class SteelSection:
             else:
                 return z * (lambda_lims[1] / lambda_s) ** 2
 
+    @instrument()
+    @cached
     def calc_phi_msx(self):
         """a"""
 
         return self.code.phi_member * self.get_yield_stress() * self.calc_ze(
             axis='x') / 1e6
 
+    @instrument()
+    @cached
     def calc_phi_msy(self):
         """a"""
 
         return self.code.phi_member * self.get_yield_stress() * self.calc_ze(
             axis='y') / 1e6
 
+    @instrument()
     def calc_phi_mbx(self, le, alpha_m=1):
         """a
         """
 
-        # get section capacity
-        msx = self.calc_phi_msx() / self.code.phi_member
-
         # get reference buckling moment
         m0 = self.calc_m0(le)
 
+        return self.calc_phi_mbx_from_m0(m0, alpha_m)
+
+    def calc_phi_mbx_from_m0(self, m0, alpha_m=1):
+        """Returns phiMbx of the section for a given reference buckling moment, e.g. the elastic
+        buckling moment under uniform moment Moa of Cl. 5.6.4.
+
+        :param m0: Reference buckling moment(s) [kN.m]
+        :type m0: float or :class:`numpy.ndarray`
+        :param alpha_m: Moment modification factor(s)
+        :type alpha_m: float or :class:`numpy.ndarray`
+        :returns: phiMbx [kN.m]
+        :rtype: float or :class:`numpy.ndarray`
+        """
+
+        # get section capacity
+        msx = self.calc_phi_msx() / self.code.phi_member
+
         # calculate alpha_s
         alpha_s = 0.6 * (np.sqrt((msx / m0) ** 2 + 3) - msx / m0)
 
         return self.code.phi_member * alpha_m * alpha_s * msx
 
+    @cached
+    def get_phi_mbx_curve(self, le_min=LE_MIN, le_max=LE_MAX, tol=TOLERANCE):
+        """Returns the precomputed phiMbx curve of the section, the curve is built on first use
+        and discarded with the other cached results when the section changes.
+
+        :param float le_min: Smallest effective length of the curve
+        :param float le_max: Largest effective length of the curve
+        :param float tol: Maximum relative interpolation error
+        :returns: phiMbx curve
+        :rtype: :class:`~steeldesign.curves.PhiMbxCurve`
+        """
+
+        return PhiMbxCurve(self, le_min=le_min, le_max=le_max, tol=tol)
+
+    @instrument()
     def full_restraint_length(self, alpha_m):
         """a"""
 
+        # scipy is only imported when needed as it dominates the import time of the package
+        from scipy import optimize
+
         def f(x):
             return self.calc_phi_mbx(x, alpha_m) - self.calc_phi_msx()
 
-        return optimize.root_scalar(f, x0=500, x1=2000).root
+        result = optimize.root_scalar(f, x0=500, x1=2000)
+        count('full_restraint_length.iterations', result.iterations)
+        count('full_restraint_length.function_calls', result.function_calls)
+
+        return result.root
 
 
 class UBSection(SteelSection):
@@ -134,10 +282,44 @@ class UBSection(SteelSection):
         self.tw = tw
         self.r = r
         self.grade = grade
+        self._fyf = None
+        self._fyw = None
+
+    @property
+    @cached
+    def fyf(self):
+        """Yield stress of the flange, that of the steel grade for the flange thickness unless it
+        is assigned. Assigning *None* restores the yield stress of the steel grade.
+
+        :rtype: float
+        """
 
-        # calculate yield stresses
-        self.fyf = self.grade.get_yield_stress(self.tf)
-        self.fyw = self.grade.get_yield_stress(self.tw)
+        if self._fyf is not None:
+            return self._fyf
+
+        return self.grade.get_yield_stress(self.tf)
+
+    @fyf.setter
+    def fyf(self, value):
+        self._fyf = value
+
+    @property
+    @cached
+    def fyw(self):
+        """Yield stress of the web, that of the steel grade for the web thickness unless it is
+        assigned. Assigning *None* restores the yield stress of the steel grade.
+
+        :rtype: float
+        """
+
+        if self._fyw is not None:
+            return self._fyw
+
+        return self.grade.get_yield_stress(self.tw)
+
+    @fyw.setter
+    def fyw(self, value):
+        self._fyw = value
 
     def get_tf(self):
         """Returns the thickness of the flange.
@@ -204,6 +386,8 @@ class UBSection(SteelSection):
 
         return min(self.fyf, self.fyw)
 
+    @instrument()
+    @cached
     def bending_compact_x(self):
         """Returns the compactness of the section for bending about the x-axis.
 
@@ -242,6 +426,8 @@ class UBSection(SteelSection):
 
         return(compact, lambda_s, lambda_lims, plate_type)
 
+    @instrument()
+    @cached
     def bending_compact_y(self):
         """Returns the compactness of the section for bending about the y-axis.
 
@@ -265,6 +451,15 @@ class UBSection(SteelSection):
 
         return(compact, lambda_s, lambda_lims, plate_type)
 
+    def calc_section_properties(self):
+        """Calculates the section properties from the plate dimensions, see
+        :func:`calc_i_section_properties`. The root radius is ignored and the form factor kf is
+        left unchanged."""
+
+        props = calc_i_section_properties(self.d, self.bf, self.tf, self.tw)
+
+        self.set_section_properties([float(value) for value in props.values()] + [self.kf])
+
     def full_restraint_length_simple(self, beta_m=-1):
         """Returns the maximum segment length for which the section is considered fully laterally
         restrained as defined by Cl. 5.3.2.4 AS4100-1998.
@@ -284,6 +479,7 @@ class UBSection(SteelSection):
 
         return self.ry * (80 + 50 * beta_m) * np.sqrt(250 / self.get_yield_stress())
 
+    @instrument()
     def calc_m0(self, le):
         """Returns the reference buckling moment, M0, for a UB section.
 
@@ -292,9 +488,208 @@ class UBSection(SteelSection):
         :rtype: float
         """
 
+        if np.ndim(le) == 0:
+            return self.get_m0_cache().get(le, lambda: self._calc_m0(le))
+
+        return self._calc_m0(le)
+
+    def _calc_m0(self, le):
+        """Calculates the reference buckling moment, see :meth:`calc_m0`."""
+
         e = self.code.elastic_modulus
         g = self.code.shear_modulus
 
         return 1e-6 * np.sqrt(((np.pi ** 2 * e * self.iyy) / (le ** 2)) * (
             g * self.j + (np.pi ** 2 * e * self.iw / (le ** 2)))
         )
+
+    def calc_le(self, m0):
+        """Returns the effective length at which the reference buckling moment of the UB section
+        equals *m0*, i.e. the inverse of :meth:`calc_m0`.
+
+        :param float m0: Reference buckling moment [kN.m]
+        :returns: Effective length [mm]
+        :rtype: float
+        """
+
+        return calc_le_from_m0(m0, self.iyy, self.j, self.iw, self.code.elastic_modulus,
+                               self.code.shear_modulus)
+
+
+def calc_i_section_properties(d, bf, tf, tw):
+    """Returns the section properties of doubly symmetric I-sections with equal flanges given
+    arrays of plate dimensions, e.g. for all candidate geometries of a fabricated girder. Root
+    radii and fillet welds are ignored and J is calculated for thin-walled open sections. The form
+    factor kf depends on the steel grade and is not calculated.
+
+    :param d: Total depth(s) [mm]
+    :type d: float or :class:`numpy.ndarray`
+    :param bf: Flange width(s) [mm]
+    :type bf: float or :class:`numpy.ndarray`
+    :param tf: Flange thickness(es) [mm]
+    :type tf: float or :class:`numpy.ndarray`
+    :param tw: Web thickness(es) [mm]
+    :type tw: float or :class:`numpy.ndarray`
+    :returns: Section properties *area, mass, ixx, zxx, sxx, rx, iyy, zyy, syy, ry, j, iw* keyed
+        by name
+    :rtype: dict[string, :class:`numpy.ndarray`]
+    """
+
+    (d, bf, tf, tw) = (np.asarray(d, dtype=float), np.asarray(bf, dtype=float),
+                       np.asarray(tf, dtype=float), np.asarray(tw, dtype=float))
+    dw = d - 2 * tf
+
+    area = 2 * bf * tf + dw * tw
+    ixx = (bf * d ** 3 - (bf - tw) * dw ** 3) / 12
+    iyy = tf * bf ** 3 / 6 + dw * tw ** 3 / 12
+
+    return {
+        'area': area,
+        'mass': area * 1e-6 * STEEL_DENSITY,
+        'ixx': ixx,
+        'zxx': 2 * ixx / d,
+        'sxx': bf * tf * (d - tf) + tw * dw ** 2 / 4,
+        'rx': np.sqrt(ixx / area),
+        'iyy': iyy,
+        'zyy': 2 * iyy / bf,
+        'syy': tf * bf ** 2 / 2 + dw * tw ** 2 / 4,
+        'ry': np.sqrt(iyy / area),
+        'j': (2 * bf * tf ** 3 + dw * tw ** 3) / 3,
+        'iw': tf * bf ** 3 * (d - tf) ** 2 / 24,
+    }
+
+
+def calc_le_from_m0(m0, iyy, j, iw, e, g):
+    """Returns the effective length at which the reference buckling moment equals *m0*. With
+    u = 1 / le^2, M0^2 = a * u * (b + c * u) is a quadratic in u and is solved in closed form.
+    All arguments may be arrays and are broadcast together.
+
+    :param m0: Reference buckling moment [kN.m]
+    :type m0: float or :class:`numpy.ndarray`
+    :param iyy: Second moment of area about the y-axis
+    :param j: Torsion constant
+    :param iw: Warping constant
+    :param float e: Elastic modulus
+    :param float g: Shear modulus
+    :returns: Effective length [mm], *nan* where *m0* is not positive
+    :rtype: float or :class:`numpy.ndarray`
+    """
+
+    m0 = np.asarray(m0, dtype=float) * 1e6
+    a = np.pi ** 2 * e * iyy
+    b = g * j
+    c = np.pi ** 2 * e * iw
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = 2 * m0 ** 2 / (a * b + np.sqrt((a * b) ** 2 + 4 * a * c * m0 ** 2))
+
+        return np.where(m0 > 0, 1 / np.sqrt(u), np.nan)[()]
+
+
+def calc_moment_ratio(alpha_s):
+    """Returns the ratio Ms / M0 that gives the slenderness reduction factor *alpha_s*, i.e. the
+    inverse of alpha_s = 0.6 * (sqrt((Ms / M0)^2 + 3) - Ms / M0).
+
+    Cl. 5.6.1.1 AS4100-1998
+
+    :param alpha_s: Slenderness reduction factor
+    :type alpha_s: float or :class:`numpy.ndarray`
+    :returns: Ratio Ms / M0, *nan* where no positive ratio gives *alpha_s*
+    :rtype: float or :class:`numpy.ndarray`
+    """
+
+    k = np.asarray(alpha_s, dtype=float) / 0.6
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (3 - k ** 2) / (2 * k)
+
+    return np.where(ratio > 0, ratio, np.nan)[()]
+
+
+def calc_compactness_x(flange_slenderness, web_slenderness, fyf, fyw, code, res_stress='HR',
+                       labels=False):
+    """Returns the compactness of I-sections for bending about the x-axis given arrays of flange
+    and web slendernesses, e.g. for all plate combinations of a parametric study.
+
+    Cl. 5.2 AS4100-1998
+
+    :param flange_slenderness: Flange slenderness(es) (bf - tw) / (2 * tf)
+    :type flange_slenderness: float or :class:`numpy.ndarray`
+    :param web_slenderness: Web slenderness(es) d1 / tw
+    :type web_slenderness: float or :class:`numpy.ndarray`
+    :param fyf: Yield stress(es) of the flanges
+    :type fyf: float or :class:`numpy.ndarray`
+    :param fyw: Yield stress(es) of the webs
+    :type fyw: float or :class:`numpy.ndarray`
+    :param code: Design code
+    :type code: :class:`~steeldesign.codes.DesignCode`
+    :param res_stress: Residual stress class(es), names or integer codes
+    :type res_stress: string, int or :class:`numpy.ndarray`
+    :param bool labels: Whether to return compactness and plate type labels rather than integer
+        codes
+    :returns: Compactness *(COMPACT, NON_COMPACT, SLENDER)*, section slenderness, slenderness
+        limits of size *(... x 3)* and the plate type of the critical plate element
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray`)
+    """
+
+    # flange slenderness
+    lambda_f = flange_slenderness * np.sqrt(np.divide(fyf, 250))
+    lambda_f_lims = code.plate_slenderness_limits(PLATE_TYPE_CODES['Uniform1'], res_stress)
+    ratio_f = lambda_f / lambda_f_lims[..., 1]
+
+    # web slenderness
+    lambda_w = web_slenderness * np.sqrt(np.divide(fyw, 250))
+    lambda_w_lims = code.plate_slenderness_limits(PLATE_TYPE_CODES['Bending2'], res_stress)
+    ratio_w = lambda_w / lambda_w_lims[..., 1]
+
+    # section slenderness
+    flange = ratio_f > ratio_w
+    lambda_s = np.where(flange, lambda_f, lambda_w)
+    lambda_lims = np.where(flange[..., None], lambda_f_lims, lambda_w_lims)
+    plate_type = np.where(flange, PLATE_TYPE_CODES['Uniform1'], PLATE_TYPE_CODES['Bending2'])
+
+    return _compactness_result(lambda_s, lambda_lims, plate_type, labels)
+
+
+def calc_compactness_y(flange_slenderness, fyf, code, res_stress='HR', labels=False):
+    """Returns the compactness of I-sections for bending about the y-axis given an array of
+    flange slendernesses.
+
+    Cl. 5.2 AS4100-1998
+
+    :param flange_slenderness: Flange slenderness(es) (bf - tw) / (2 * tf)
+    :type flange_slenderness: float or :class:`numpy.ndarray`
+    :param fyf: Yield stress(es) of the flanges
+    :type fyf: float or :class:`numpy.ndarray`
+    :param code: Design code
+    :type code: :class:`~steeldesign.codes.DesignCode`
+    :param res_stress: Residual stress class(es), names or integer codes
+    :type res_stress: string, int or :class:`numpy.ndarray`
+    :param bool labels: Whether to return compactness and plate type labels rather than integer
+        codes
+    :returns: Compactness *(COMPACT, NON_COMPACT, SLENDER)*, section slenderness, slenderness
+        limits of size *(... x 3)* and the plate type
+    :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray`)
+    """
+
+    lambda_s = flange_slenderness * np.sqrt(np.divide(fyf, 250))
+    lambda_lims = code.plate_slenderness_limits(PLATE_TYPE_CODES['Bending1'], res_stress)
+    shape = np.broadcast(lambda_s, lambda_lims[..., 0]).shape
+    lambda_lims = np.broadcast_to(lambda_lims, shape + (3,))
+    plate_type = np.full(shape, PLATE_TYPE_CODES['Bending1'])
+
+    return _compactness_result(np.broadcast_to(lambda_s, shape), lambda_lims, plate_type, labels)
+
+
+def _compactness_result(lambda_s, lambda_lims, plate_type, labels):
+    """Returns the result tuple of :func:`calc_compactness_x` and :func:`calc_compactness_y`."""
+
+    compact = classify_compactness(lambda_s, lambda_lims)
+
+    if labels:
+        return (get_labels(compact, COMPACTNESS_LABELS), lambda_s[()], lambda_lims,
+                get_labels(plate_type, PLATE_TYPES))
+
+    return (compact, lambda_s[()], lambda_lims, plate_type[()])
@@ -0,0 +1,92 @@
+import numpy as np
+from steeldesign.member import Member, calc_alpha_m_segments, calc_design_moments
+from steeldesign.sections import STEEL_DENSITY
+
+
+class SectionSelector:
+    """Selects the lightest adequate section for a member from a catalogue.
+
+    The catalogue is indexed once by mass and by phiMsx. A section is adequate if, for every
+    segment, M* <= phiMsx and M* <= phiMbx. Sections with phiMsx < max(M*) are discarded with a
+    binary search of the phiMsx index, the full member buckling check is only run on the remaining
+    candidates in order of increasing mass and the search stops at the first section that passes.
+
+    :param sections: Catalogue of sections to select from
+    :type sections: list[:class:`~steeldesign.sections.UBSection`]
+
+    :cvar mass: Mass of each section [kg/m], estimated from the area if not tabulated
+    :vartype mass: :class:`numpy.ndarray`
+    :cvar phi_msx: phiMsx of each section [kN.m]
+    :vartype phi_msx: :class:`numpy.ndarray`
+    """
+
+    def __init__(self, sections):
+        """Inits the SectionSelector class."""
+
+        self.sections = list(sections)
+        self.mass = np.array([
+            section.area * 1e-6 * STEEL_DENSITY if section.mass is None else section.mass
+            for section in self.sections
+        ], dtype=float)
+        self.phi_msx = np.array([section.calc_phi_msx() for section in self.sections])
+
+        # catalogue indices
+        self.mass_order = np.argsort(self.mass, kind='stable')
+        self.mass_rank = np.empty(len(self.sections), dtype=int)
+        self.mass_rank[self.mass_order] = np.arange(len(self.sections))
+        self.msx_order = np.argsort(self.phi_msx, kind='stable')
+        self.msx_sorted = self.phi_msx[self.msx_order]
+
+    def candidates(self, m_star):
+        """Returns the indices of the sections with phiMsx >= *m_star* in order of increasing
+        mass.
+
+        :param float m_star: Design bending moment [kN.m]
+        :returns: Section indices
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        strong_enough = self.msx_order[np.searchsorted(self.msx_sorted, m_star, side='left'):]
+
+        return self.mass_order[np.sort(self.mass_rank[strong_enough])]
+
+    def select(self, length, restraints, bmd, load_position, alpha_m=None, interpolate=False):
+        """Returns the lightest section for which the member is adequate.
+
+        :param float length: Length of the member
+        :param restraints: List of restraints applied to the member
+        :type restraints: list[:class:`~steeldesign.codes.Restraint`]
+        :param bmd: Bending moment diagram for the member of size *(n x 2)*
+        :type bmd: :class:`numpy.ndarray`
+        :param load_position: List of strings defining the load position within each segment
+        :type load_position: list[string]
+        :param alpha_m: Optional list of alpha_m values to override those calculated from the bmd
+        :type alpha_m: list[float]
+        :param bool interpolate: Whether to look phiMbx up from the precomputed curve of each
+            section
+        :returns: The lightest adequate section *(None if no section is adequate)* and the number
+            of full member checks that were run
+        :rtype: tuple(:class:`~steeldesign.sections.UBSection`, int)
+        """
+
+        member = Member(section=None, length=length, restraints=restraints)
+        positions = np.array([restraint.pos for restraint in member.restraints])
+
+        # alpha_m and the design moments do not depend on the section
+        m_star = calc_design_moments(bmd, positions)
+
+        if alpha_m is None:
+            alpha_m = calc_alpha_m_segments(bmd, positions)
+
+        n_checks = 0
+
+        for i in self.candidates(m_star.max()):
+            member.section = self.sections[i]
+            n_checks += 1
+            phi_mbx = member.calc_phi_mbx(bmd=bmd, load_position=load_position, alpha_m=alpha_m,
+                                          interpolate=interpolate)
+
+            if (m_star <= np.asarray(phi_mbx)).all():
+                return (self.sections[i], n_checks)
+
+        return (None, n_checks)
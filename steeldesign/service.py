@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from steeldesign.batch import calc_phi_mbx_ragged
+from steeldesign.codes import DesignCode, Restraint, SteelGrade
+from steeldesign.library import SectionLibrary
+from steeldesign.member import Member
+
+
+# default address of the service
+HOST = '127.0.0.1'
+PORT = 8100
+
+# default steel grade of the sections
+DEFAULT_GRADE = '3679.1-300'
+
+# default load position of the segments
+DEFAULT_LOAD_POSITION = 'WS'
+
+# time for which concurrent requests are collected into a batch, a lone request is not delayed [s]
+BATCH_WINDOW = 0.001
+
+# maximum number of requests checked in one batch
+MAX_BATCH = 256
+
+# number of load cases of a batch above which it is checked in the process pool
+POOL_THRESHOLD = 2000
+
+# maximum size of a request body [bytes]
+MAX_BODY = 16 * 1024 * 1024
+
+# reason phrases of the response status codes
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large'}
+
+# section libraries held by each worker process, set once by _init_worker
+_state = {}
+
+
+class DesignService:
+    """Local HTTP service running member checks against a section catalogue held in memory.
+
+    The section library of each steel grade is opened once and its sections, with their cached
+    capacities, stay warm for the life of the service. Member checks are posted as JSON to
+    ``/check``, see :func:`parse_request`. While requests arrive concurrently those arriving
+    within *batch_window* of each other are collected into a batch, a lone request is checked
+    straight away. Batches are checked with
+    :func:`~steeldesign.batch.calc_phi_mbx_ragged`; batches of more than *pool_threshold* load
+    cases are checked in a pool of worker processes, each holding its own warm libraries, so that
+    the event loop keeps serving small requests. ``/health`` returns the request and batch
+    counts.
+
+    :param string path: Path to the section catalogue, see
+        :class:`~steeldesign.library.SectionLibrary`
+    :param int max_workers: Number of worker processes, no pool is started if 0
+    :param float batch_window: Time for which concurrent requests are collected [s]
+    :param int max_batch: Maximum number of requests in a batch
+    :param int pool_threshold: Number of load cases of a batch above which it is checked in the
+        pool
+
+    :cvar stats: Numbers of requests, batches and batches checked in the pool
+    :vartype stats: dict[string, int]
+    """
+
+    def __init__(self, path, max_workers=None, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH,
+                 pool_threshold=POOL_THRESHOLD):
+        """Inits the DesignService class."""
+
+        self.path = path
+        self.max_workers = max_workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pool_threshold = pool_threshold
+        self.libraries = {}
+        self.stats = {'requests': 0, 'batches': 0, 'pooled_batches': 0}
+
+        self.queue = None
+        self.pool = None
+        self._batcher = None
+
+    def warm(self, grade=DEFAULT_GRADE):
+        """Builds all sections of a steel grade and their length-independent capacities."""
+
+        warm_library(get_library(self.libraries, self.path, grade))
+
+    async def start(self, host=HOST, port=PORT):
+        """Starts the worker pool, the batcher and the server.
+
+        :param string host: Host name or address to listen on
+        :param int port: Port to listen on
+        :returns: Server
+        :rtype: :class:`asyncio.Server`
+        """
+
+        self.warm()
+
+        if self.max_workers != 0:
+            # workers are spawned rather than forked so that they do not inherit the listening
+            # socket, which would outlive the service
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_init_worker, initargs=(self.path,))
+
+        self.queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self.run_batcher())
+
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        """Stops the batcher and the worker pool."""
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def check(self, data):
+        """Checks a member check request, batched with concurrent requests.
+
+        :param dict data: Decoded JSON request, see :func:`parse_request`
+        :returns: Response, see :func:`format_result`
+        :rtype: dict
+
+        :raises Exception: If the request is invalid
+        """
+
+        spec = parse_request(data)
+
+        # validate the request before it joins a batch
+        check = build_check(self.libraries, self.path, spec)
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((spec, check, future))
+        self.stats['requests'] += 1
+
+        return format_result(*await future)
+
+    async def run_batcher(self):
+        """Collects queued requests into batches and checks them."""
+
+        batch = []
+
+        while True:
+            # only wait for more requests while they arrive concurrently, so that a lone request
+            # is not delayed by the batch window
+            concurrent = len(batch) > 1
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.batch_window if concurrent else 0)
+
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            self.stats['batches'] += 1
+            n_cases = sum(len(spec[5]) for (spec, check, future) in batch)
+
+            if self.pool is not None and n_cases > self.pool_threshold:
+                self.stats['pooled_batches'] += 1
+                asyncio.ensure_future(self.run_pooled(batch))
+            else:
+                set_results(batch, check_batch([check for (spec, check, future) in batch]))
+
+    async def run_pooled(self, batch):
+        """Checks a batch in the worker pool."""
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(
+                self.pool, _check_specs, [spec for (spec, check, future) in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        set_results(batch, results)
+
+    async def dispatch(self, method, path, body):
+        """Returns the status code and response of a request.
+
+        :param string method: Request method
+        :param string path: Request path
+        :param bytes body: Request body
+        :returns: Status code and response
+        :rtype: tuple(int, dict)
+        """
+
+        if path == '/health':
+            return (200, dict(self.stats, status='ok'))
+        elif path != '/check':
+            return (404, {'error': 'Path {0} is not defined'.format(path)})
+        elif method != 'POST':
+            return (405, {'error': 'Method {0} is not allowed'.format(method)})
+
+        try:
+            return (200, await self.check(json.loads(body)))
+        except Exception as e:
+            return (400, {'error': str(e)})
+
+    async def handle(self, reader, writer):
+        """Serves the HTTP/1.1 requests of a connection, keeping it alive between requests."""
+
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                (method, path, version) = line.decode('latin-1').split()
+                headers = {}
+
+                while True:
+                    line = await reader.readline()
+
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+
+                    (name, value) = line.decode('latin-1').split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+
+                if length > MAX_BODY:
+                    (status, response) = (413, {'error': 'Request body is too large'})
+                else:
+                    body = await reader.readexactly(length)
+                    (status, response) = await self.dispatch(method, path.split('?')[0], body)
+
+                keep_alive = (version == 'HTTP/1.1' and
+                              headers.get('connection', '').lower() != 'close' and
+                              status != 413)
+                content = json.dumps(response).encode()
+                writer.write(('HTTP/1.1 {0} {1}\r\nContent-Type: application/json\r\n'
+                              'Content-Length: {2}\r\nConnection: {3}\r\n\r\n').format(
+                    status, REASONS[status], len(content),
+                    'keep-alive' if keep_alive else 'close').encode('latin-1') + content)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def parse_request(data):
+    """Returns the specification of a member check from a JSON request of the form::
+
+        {
+            "section": "360UB50.7",
+            "grade": "3679.1-300",
+            "length": 6000,
+            "restraints": [["F", 0], ["L", 0.5], ["F", 1]],
+            "load_position": ["WS", "WS"],
+            "bmds": [[[0, 0], [0.5, 100], [1, 0]]]
+        }
+
+    in which *bmds* is a list of bending moment diagrams, one per load case, with relative
+    positions. A single case may be given as *bmd*. *grade* is optional and *load_position* may
+    be omitted or given as a single load position of all segments.
+
+    :param dict data: Decoded JSON request
+    :returns: Section name, steel grade, length, restraints *(rtype, pos)*, load positions and
+        bending moment diagrams
+    :rtype: tuple
+
+    :raises Exception: If the request is invalid
+    """
+
+    if not isinstance(data, dict):
+        raise Exception('Request must be a JSON object')
+
+    try:
+        bmds = data['bmds'] if 'bmds' in data else [data['bmd']]
+        restraints = [(str(rtype), float(pos)) for (rtype, pos) in data['restraints']]
+        load_position = data.get('load_position', DEFAULT_LOAD_POSITION)
+
+        if isinstance(load_position, str):
+            load_position = [load_position] * (len(restraints) - 1)
+
+        spec = (str(data['section']), str(data.get('grade', DEFAULT_GRADE)),
+                float(data['length']), restraints, [str(lp) for lp in load_position],
+                [np.asarray(bmd, dtype=float) for bmd in bmds])
+    except KeyError as e:
+        raise Exception('Request is missing {0}'.format(e))
+    except (TypeError, ValueError) as e:
+        raise Exception('Request is invalid: {0}'.format(e))
+
+    if not spec[5] or any(bmd.ndim != 2 or bmd.shape[1] != 2 or len(bmd) < 2
+                          for bmd in spec[5]):
+        raise Exception('Each bmd must be a list of at least two [pos, moment] pairs')
+
+    return spec
+
+
+def get_library(libraries, path, grade):
+    """Returns the section library of a steel grade, opened on first use.
+
+    :param libraries: Open libraries keyed by steel grade
+    :type libraries: dict[string, :class:`~steeldesign.library.SectionLibrary`]
+    :param string path: Path to the section catalogue
+    :param string grade: Steel grade
+    :returns: Section library
+    :rtype: :class:`~steeldesign.library.SectionLibrary`
+
+    :raises Exception: If the steel grade is not defined
+    """
+
+    try:
+        return libraries[grade]
+    except KeyError:
+        steel_grade = SteelGrade(grade)
+        steel_grade.get_grade_table()
+        library = libraries[grade] = SectionLibrary(path, DesignCode(), steel_grade)
+
+        return library
+
+
+def warm_library(library):
+    """Builds all sections of a library and their length-independent capacities."""
+
+    for section in library:
+        section.calc_phi_msx()
+
+
+def build_check(libraries, path, spec):
+    """Returns the member, bending moment diagrams and load positions of a check specification.
+
+    :param libraries: Open libraries keyed by steel grade
+    :type libraries: dict[string, :class:`~steeldesign.library.SectionLibrary`]
+    :param string path: Path to the section catalogue
+    :param spec: Check specification, see :func:`parse_request`
+    :type spec: tuple
+    :returns: Member, bending moment diagrams and load positions
+    :rtype: tuple(:class:`~steeldesign.member.Member`, list[:class:`numpy.ndarray`],
+        list[string])
+
+    :raises Exception: If the section is not in the library or the number of load positions does
+        not equal the number of segments
+    """
+
+    (section, grade, length, restraints, load_position, bmds) = spec
+    library = get_library(libraries, path, grade)
+
+    if section not in library:
+        raise Exception('Section {0} is not in the library'.format(section))
+
+    member = Member(library[section], length,
+                    [Restraint(rtype, pos) for (rtype, pos) in restraints])
+
+    if len(load_position) != len(member.restraints) - 1:
+        raise Exception('Size of load_position must equal number of segments')
+
+    return (member, bmds, load_position)
+
+
+def check_batch(checks):
+    """Checks a batch of members in a single call to
+    :func:`~steeldesign.batch.calc_phi_mbx_ragged`. A check that fails does not fail the rest of
+    the batch.
+
+    :param checks: Members, bending moment diagrams and load positions, see :func:`build_check`
+    :type checks: list[tuple]
+    :returns: M* and phiMbx of size *(n_cases x n_segments)* of each check, or the Exception
+        raised by the check
+    :rtype: list
+    """
+
+    try:
+        return calc_phi_mbx_ragged([member for (member, bmds, load_position) in checks],
+                                   [bmds for (member, bmds, load_position) in checks],
+                                   [load_position for (member, bmds, load_position) in checks])
+    except Exception as e:
+        if len(checks) == 1:
+            return [e]
+
+    # check one by one to find the failed checks
+    return [check_batch([check])[0] for check in checks]
+
+
+def set_results(batch, results):
+    """Sets the result or Exception of each request of a batch."""
+
+    for ((spec, check, future), result) in zip(batch, results):
+        if future.done():
+            continue
+        elif isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def format_result(m_star, phi_mbx):
+    """Returns the JSON response of a check, with *null* for undefined values.
+
+    phiMbx is only defined for a segment with a sagging bending moment, the signed alpha_m of a
+    hogging or zero bending moment gives a phiMbx of zero or less, or *nan*. phiMbx and the
+    utilisation of such segments are *null* and listed in *warnings*, so that they are not read
+    as passing.
+
+    :param m_star: M* of size *(n_cases x n_segments)*
+    :type m_star: :class:`numpy.ndarray`
+    :param phi_mbx: phiMbx of size *(n_cases x n_segments)*
+    :type phi_mbx: :class:`numpy.ndarray`
+    :returns: M*, phiMbx and utilisation of each segment for each load case and warnings
+    :rtype: dict[string, list]
+    """
+
+    with np.errstate(invalid='ignore'):
+        undefined = ~(phi_mbx > 0)
+
+    phi_mbx = np.where(undefined, np.nan, phi_mbx)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilisation = m_star / phi_mbx
+
+    response = {name: np.where(np.isfinite(values), values, None).tolist() for (name, values) in
+                (('m_star', m_star), ('phi_mbx', phi_mbx), ('utilisation', utilisation))}
+    response['warnings'] = [
+        'phiMbx of load case {0} segment {1} is undefined for a hogging or zero bending '
+        'moment'.format(case, segment) for (case, segment) in zip(*np.nonzero(undefined))]
+
+    return response
+
+
+def _init_worker(path):
+    """Opens the section catalogue in the worker process."""
+
+    _state['path'] = path
+    _state['libraries'] = {}
+    warm_library(get_library(_state['libraries'], path, DEFAULT_GRADE))
+
+
+def _check_specs(specs):
+    """Checks a batch of check specifications in a worker process."""
+
+    checks = []
+    errors = {}
+
+    for (i, spec) in enumerate(specs):
+        try:
+            checks.append(build_check(_state['libraries'], _state['path'], spec))
+        except Exception as e:
+            errors[i] = e
+
+    results = iter(check_batch(checks))
+
+    return [errors[i] if i in errors else next(results) for i in range(len(specs))]
+
+
+def main(argv=None):
+    """Entry point of the ``steeldesign-service`` command.
+
+    :param argv: Command line arguments, defaults to :data:`sys.argv`
+    :type argv: list[string]
+    :returns: Exit status
+    :rtype: int
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='steeldesign-service',
+        description='Serves member moment capacity checks to AS 4100-1998 over HTTP.')
+    parser.add_argument('--sections', required=True,
+                        help='table of sections with the columns of tests/ub.csv, or a '
+                             'catalogue compiled to .npy')
+    parser.add_argument('--host', default=HOST, help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=PORT,
+                        help='port to listen on (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes for large batches, 0 for none '
+                             '(default: number of CPUs)')
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW,
+                        help='time for which concurrent requests are batched [s] '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    service = DesignService(args.sections, max_workers=args.workers,
+                            batch_window=args.batch_window)
+
+    async def serve():
+        server = await service.start(args.host, args.port)
+        sys.stderr.write('steeldesign-service listening on {0}:{1}\n'.format(
+            args.host, args.port))
+
+        # stop cleanly, shutting down the worker pool, when terminated
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,
+                                                          asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
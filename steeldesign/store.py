@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import sqlite3
+import numpy as np
+from steeldesign.cache import CacheStats
+from steeldesign.codes import STEEL_GRADES
+from steeldesign.tables import PROPS_FIELDS
+
+
+# modules of the package whose source determines phiMbx, hashed into the salt of every key so
+# that results stored by a different version of the calculations are never reused
+CALC_MODULES = ('codes', 'sections', 'member', 'buckling', 'curves')
+
+# default maximum number of results kept in a store
+MAX_ENTRIES = 1000000
+
+# plate dimensions of a section included in a key
+GEOMETRY_FIELDS = ('d', 'bf', 'tf', 'tw', 'r')
+
+
+class ResultStore:
+    """Persistent cache of member phiMbx results stored in a SQLite file.
+
+    Results are addressed by a SHA-256 hash of every input of the check: the section geometry and
+    properties, the steel grade and its strength table, the design code parameters, the member
+    length, the restraints, the load positions, the alpha_m overrides and the bytes of the bending
+    moment diagram, salted with a hash of the calculation modules (see :func:`calc_source_hash`).
+    Unchanged checks are therefore read back across runs while any change to an input, or to the
+    calculations, computes a new result. Once the store holds more than *max_entries* results the
+    least recently used are evicted.
+
+    Writes are committed by :meth:`commit`, :meth:`close` or on leaving a ``with`` block.
+
+    :param string path: Path to the SQLite file, created if it does not exist
+    :param int max_entries: Maximum number of results kept
+    :param string salt: Salt of the keys, defaults to :func:`calc_source_hash`
+
+    :cvar stats: Hit/miss statistics of the store
+    :vartype stats: :class:`~steeldesign.cache.CacheStats`
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES, salt=None):
+        """Inits the ResultStore class."""
+
+        self.path = path
+        self.max_entries = max_entries
+        self.salt = calc_source_hash() if salt is None else str(salt)
+        self.stats = CacheStats()
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, used INTEGER)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+
+        # access counter recording the order in which results were last used
+        self._clock = self.connection.execute(
+            'SELECT COALESCE(MAX(used), 0) FROM results').fetchone()[0]
+        self._size = self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def __enter__(self):
+        """Returns the store."""
+
+        return self
+
+    def __exit__(self, *args):
+        """Commits the results and closes the store."""
+
+        self.close()
+
+    def __len__(self):
+        """Returns the number of results in the store."""
+
+        return self._size
+
+    def make_key(self, member, bmd, load_position, alpha_m=None):
+        """Returns the key of a member check.
+
+        :param member: Member to check
+        :type member: :class:`~steeldesign.member.Member`
+        :param bmd: Bending moment diagram for the member of size *(n x 2)*
+        :type bmd: :class:`numpy.ndarray`
+        :param load_position: List of strings defining the load position within each segment
+        :type load_position: list[string]
+        :param alpha_m: Optional list of alpha_m values
+        :type alpha_m: list[float]
+        :returns: Hexadecimal SHA-256 digest
+        :rtype: string
+        """
+
+        section = member.section
+        grade = section.grade
+        code = section.code
+        (edges, fy, fu) = grade.get_grade_table()
+
+        inputs = {
+            'salt': self.salt,
+            'section': [type(section).__name__] +
+                       [_number(getattr(section, field, None)) for field in GEOMETRY_FIELDS] +
+                       [_number(getattr(section, field)) for field in PROPS_FIELDS],
+            'grade': [grade.grade, edges.tolist(), fy.tolist(), _number(fu)],
+            'code': [code.name, _number(code.phi_member), _number(code.elastic_modulus),
+                     _number(code.shear_modulus)],
+            'length': _number(member.length),
+            'restraints': [[r.rtype, _number(r.pos)] for r in member.restraints],
+            'load_position': list(load_position),
+            'alpha_m': None if alpha_m is None else [_number(a) for a in alpha_m],
+        }
+
+        bmd = np.ascontiguousarray(bmd, dtype='<f8')
+        digest = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode())
+        digest.update(repr(bmd.shape).encode())
+        digest.update(bmd.tobytes())
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns the result stored under a key and marks it as recently used.
+
+        :param string key: Key of the result
+        :returns: Stored result, *None* if there is no result for the key
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        row = self.connection.execute(
+            'SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self._clock += 1
+        self.connection.execute('UPDATE results SET used = ? WHERE key = ?', (self._clock, key))
+
+        return np.frombuffer(row[0], dtype='<f8').copy()
+
+    def put(self, key, value):
+        """Stores a result under a key, evicting the least recently used results if the store is
+        full.
+
+        :param string key: Key of the result
+        :param value: Result to store
+        :type value: list[float] or :class:`numpy.ndarray`
+        """
+
+        self._clock += 1
+        inserted = self.connection.execute(
+            'INSERT OR IGNORE INTO results (key, value, used) VALUES (?, ?, ?)',
+            (key, np.asarray(value, dtype='<f8').tobytes(), self._clock)).rowcount
+        self._size += inserted
+
+        if self._size > self.max_entries:
+            self.connection.execute(
+                'DELETE FROM results WHERE key IN '
+                '(SELECT key FROM results ORDER BY used LIMIT ?)',
+                (self._size - self.max_entries,))
+            self._size = self.max_entries
+
+    def calc_phi_mbx(self, member, bmd, load_position, alpha_m=None):
+        """Returns phiMbx of each segment of a member, read from the store if the same check has
+        been run before and calculated with :meth:`~steeldesign.member.Member.calc_phi_mbx`
+        otherwise.
+
+        :param member: Member to check
+        :type member: :class:`~steeldesign.member.Member`
+        :param bmd: Bending moment diagram for the member of size *(n x 2)*
+        :type bmd: :class:`numpy.ndarray`
+        :param load_position: List of strings defining the load position within each segment
+        :type load_position: list[string]
+        :param alpha_m: Optional list of alpha_m values to override those calculated from the bmd
+        :type alpha_m: list[float]
+        :returns: A list of phiMbx values for each segment
+        :rtype: list[float]
+        """
+
+        key = self.make_key(member, bmd, load_position, alpha_m)
+        phi_mbx = self.get(key)
+
+        if phi_mbx is None:
+            phi_mbx = member.calc_phi_mbx(bmd=bmd, load_position=load_position, alpha_m=alpha_m)
+            self.put(key, phi_mbx)
+
+        return [float(phi) for phi in phi_mbx]
+
+    def clear(self):
+        """Discards all stored results."""
+
+        self.connection.execute('DELETE FROM results')
+        self._size = 0
+
+    def commit(self):
+        """Writes the stored results to disk."""
+
+        self.connection.commit()
+
+    def close(self):
+        """Commits the stored results and closes the store."""
+
+        self.connection.commit()
+        self.connection.close()
+
+
+def calc_source_hash(modules=CALC_MODULES):
+    """Returns a SHA-256 digest of the source of the calculation modules of the package, which
+    changes with any change to the calculations.
+
+    :param modules: Names of the modules of the package
+    :type modules: list[string]
+    :returns: Hexadecimal SHA-256 digest
+    :rtype: string
+    """
+
+    digest = hashlib.sha256()
+
+    for name in modules:
+        with open(os.path.join(os.path.dirname(__file__), name + '.py'), 'rb') as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def _number(value):
+    """Returns a value as a float for hashing, *None* is returned unchanged."""
+
+    return None if value is None else float(value)
@@ -0,0 +1,336 @@
+import csv
+import itertools
+import os
+import numpy as np
+from steeldesign.batch import calc_phi_mbx_batch
+from steeldesign.columnar import get_format, read_batches, write_rows
+from steeldesign.member import calc_design_moments
+
+
+# extension of the block table written next to a binary bending moment diagram file
+BLOCKS_EXTENSION = '.blocks.npy'
+
+# columns of a bending moment diagram csv file
+BMD_COLUMNS = ('member', 'case', 'pos', 'moment')
+
+# columns of a results csv file
+RESULT_COLUMNS = ('member', 'case', 'segment', 'm_star', 'phi_mbx', 'utilisation')
+
+# column types of a results Parquet or Arrow IPC file
+RESULT_DTYPE = np.dtype([
+    ('member', 'U32'),
+    ('case', 'U32'),
+    ('segment', 'i8'),
+    ('m_star', 'f8'),
+    ('phi_mbx', 'f8'),
+    ('utilisation', 'f8'),
+])
+
+# number of rows of a memory mapped file read at once
+CHUNK_ROWS = 65536
+
+
+def read_bmd_csv(path):
+    """Reads bending moment diagrams from a csv file with the columns *member, case, pos, moment*
+    in which the rows of each (member, case) block are contiguous and in ascending order of
+    *pos*. Only one block is held in memory at a time.
+
+    :param string path: Path to the csv file
+    :returns: Generator of *(member id, case id, bmd)* with the bmd of size *(n x 2)*
+    :rtype: generator
+    """
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = [heading.strip() for heading in next(reader)]
+        cols = [header.index(column) for column in BMD_COLUMNS]
+
+        rows = ((row[cols[0]], row[cols[1]], row[cols[2]], row[cols[3]])
+                for row in reader if row)
+
+        for ((member, case), block) in itertools.groupby(rows, key=lambda row: row[:2]):
+            bmd = np.array([(row[2], row[3]) for row in block], dtype=float)
+
+            yield (member, case, bmd)
+
+
+def get_blocks_path(npy_path):
+    """Returns the path of the block table of a binary bending moment diagram file.
+
+    :param string npy_path: Path to the binary file
+    :returns: Path to the block table
+    :rtype: string
+    """
+
+    return os.path.splitext(npy_path)[0] + BLOCKS_EXTENSION
+
+
+def make_block_dtype(id_length):
+    """Returns the dtype of the block table of a binary bending moment diagram file, one row per
+    (member, case) block with the ids of the block and the range of its rows in the stations
+    array.
+
+    :param int id_length: Number of characters of the longest member or case id
+    :returns: Block table dtype
+    :rtype: :class:`numpy.dtype`
+    """
+
+    return np.dtype([
+        ('member', 'U{0}'.format(max(id_length, 1))),
+        ('case', 'U{0}'.format(max(id_length, 1))),
+        ('start', 'i8'),
+        ('stop', 'i8'),
+    ])
+
+
+def read_bmd_npy(path, chunk_rows=CHUNK_ROWS):
+    """Reads bending moment diagrams from a binary ``.npy`` file written by
+    :func:`convert_bmd_csv`: an array of size *(n_stations x 2)* of positions and moments and its
+    block table (see :func:`get_blocks_path`) holding the ids of each (member, case) block once.
+    The stations are memory mapped and read whole blocks at a time, up to *chunk_rows* rows
+    unless a single block is longer.
+
+    :param string path: Path to the ``.npy`` file
+    :param int chunk_rows: Number of rows read at once
+    :returns: Generator of *(member id, case id, bmd)* with the bmd of size *(n x 2)*
+    :rtype: generator
+    """
+
+    stations = np.load(path, mmap_mode='r')
+    blocks = np.load(get_blocks_path(path))
+    i = 0
+
+    while i < len(blocks):
+        # blocks ending within chunk_rows rows of the first block read, at least one
+        first = blocks['start'][i]
+        j = max(int(np.searchsorted(blocks['stop'], first + chunk_rows, side='right')), i + 1)
+        chunk = np.array(stations[first:blocks['stop'][j - 1]])
+
+        for block in blocks[i:j]:
+            yield (str(block['member']), str(block['case']),
+                   chunk[block['start'] - first:block['stop'] - first])
+
+        i = j
+
+
+def read_bmd_arrow(path, chunk_rows=CHUNK_ROWS):
+    """Reads bending moment diagrams from a Parquet or Arrow IPC file with the columns *member,
+    case, pos, moment* in which the rows of each (member, case) block are contiguous and in
+    ascending order of *pos*. The file is read *chunk_rows* rows at a time.
+
+    :param string path: Path to the file
+    :param int chunk_rows: Number of rows read at once
+    :returns: Generator of *(member id, case id, bmd)* with the bmd of size *(n x 2)*
+    :rtype: generator
+    """
+
+    yield from _split_blocks(read_batches(path, BMD_COLUMNS, chunk_rows))
+
+
+def read_bmd(path, chunk_rows=CHUNK_ROWS):
+    """Reads bending moment diagrams from a csv (:func:`read_bmd_csv`), binary ``.npy``
+    (:func:`read_bmd_npy`), Parquet or Arrow IPC (:func:`read_bmd_arrow`) file.
+
+    :param string path: Path to the file
+    :param int chunk_rows: Number of rows of a binary, Parquet or Arrow IPC file read at once
+    :returns: Generator of *(member id, case id, bmd)* with the bmd of size *(n x 2)*
+    :rtype: generator
+
+    :raises Exception: If the format of the file is not supported
+    """
+
+    fmt = get_format(path)
+
+    if fmt == 'csv':
+        return read_bmd_csv(path)
+    elif fmt == 'npy':
+        return read_bmd_npy(path, chunk_rows)
+
+    return read_bmd_arrow(path, chunk_rows)
+
+
+def _split_blocks(chunks):
+    """Splits chunks of the columns *member, case, pos, moment* into *(member id, case id, bmd)*
+    blocks, joining blocks that continue into the next chunk. Member and case ids are converted
+    to strings."""
+
+    # block being read, it may continue into the next chunk
+    (key, parts) = (None, [])
+
+    for chunk in chunks:
+        (member, case) = (chunk['member'], chunk['case'])
+        bmd = np.column_stack((chunk['pos'], chunk['moment'])).astype(float)
+
+        # rows at which a new (member, case) block starts within the chunk
+        new_block = np.ones(len(bmd), dtype=bool)
+        new_block[1:] = (member[1:] != member[:-1]) | (case[1:] != case[:-1])
+        bounds = np.append(np.flatnonzero(new_block), len(bmd))
+
+        for (i, j) in zip(bounds[:-1], bounds[1:]):
+            block_key = (str(member[i]), str(case[i]))
+
+            if block_key != key:
+                if key is not None:
+                    yield key + (np.vstack(parts),)
+
+                (key, parts) = (block_key, [])
+
+            parts.append(bmd[i:j])
+
+    if key is not None:
+        yield key + (np.vstack(parts),)
+
+
+def convert_bmd_csv(csv_path, npy_path):
+    """Converts a bending moment diagram csv file to a binary ``.npy`` file of size
+    *(n_stations x 2)* and its block table (see :func:`get_blocks_path`), which holds the member
+    and case ids once per block, as wide as the longest id. The data is streamed so that the file
+    is never fully held in memory.
+
+    :param string csv_path: Path to the csv file
+    :param string npy_path: Path to the binary file
+    :returns: Number of stations written
+    :rtype: int
+    """
+
+    (n_rows, n_blocks, id_length) = (0, 0, 0)
+
+    for (member, case, bmd) in read_bmd_csv(csv_path):
+        (n_rows, n_blocks) = (n_rows + len(bmd), n_blocks + 1)
+        id_length = max(id_length, len(member), len(case))
+
+    stations = np.lib.format.open_memmap(npy_path, mode='w+', dtype='f8', shape=(n_rows, 2))
+    blocks = np.empty(n_blocks, dtype=make_block_dtype(id_length))
+    i = 0
+
+    for (k, (member, case, bmd)) in enumerate(read_bmd_csv(csv_path)):
+        stations[i:i + len(bmd)] = bmd
+        blocks[k] = (member, case, i, i + len(bmd))
+        i += len(bmd)
+
+    stations.flush()
+    del stations
+    np.save(get_blocks_path(npy_path), blocks)
+
+    return n_rows
+
+
+def check_stream(blocks, members, load_positions, chunk_size=256, stats=None):
+    """Checks a stream of bending moment diagrams chunk by chunk.
+
+    Up to *chunk_size* blocks are read at a time and the load cases of each member within the
+    chunk are checked in a single batch, so memory use is bounded by the chunk size regardless of
+    the length of the stream.
+
+    A segment with a hogging or zero bending moment has no meaningful phiMbx (zero, negative or
+    *nan*). Its phiMbx and utilisation are *nan*, written as null to Parquet and Arrow IPC files,
+    and the segment is counted in *stats*.
+
+    :param blocks: Iterable of *(member id, case id, bmd)*, e.g. from :func:`read_bmd_csv` or
+        :func:`read_bmd_npy`
+    :param members: Members keyed by member id
+    :type members: dict[string, :class:`~steeldesign.member.Member`]
+    :param load_positions: List of load position strings of each member keyed by member id
+    :type load_positions: dict[string, list[string]]
+    :param int chunk_size: Number of blocks checked at once
+    :param stats: Counters updated as the stream is checked, the number of segments with an
+        undefined phiMbx is added to *stats['undefined']*
+    :type stats: dict[string, int]
+    :returns: Generator of result rows *(member id, case id, segment, M*, phiMbx, utilisation)*
+    :rtype: generator
+
+    :raises Exception: If a block refers to an unknown member
+    """
+
+    blocks = iter(blocks)
+
+    if stats is not None:
+        stats.setdefault('undefined', 0)
+
+    while True:
+        chunk = list(itertools.islice(blocks, chunk_size))
+
+        if not chunk:
+            return
+
+        # group the load cases of the chunk by member, keeping the order of the stream
+        groups = {}
+
+        for (member_id, case_id, bmd) in chunk:
+            if member_id not in members:
+                raise Exception('Member {0} is not defined'.format(member_id))
+
+            groups.setdefault(member_id, []).append((case_id, bmd))
+
+        results = {}
+
+        for (member_id, cases) in groups.items():
+            member = members[member_id]
+            positions = np.array([restraint.pos for restraint in member.restraints])
+            bmds = [bmd for (case_id, bmd) in cases]
+            n_seg = len(positions) - 1
+
+            phi_mbx = calc_phi_mbx_batch(
+                [member], [bmds], [load_positions[member_id]])[0, :, :n_seg]
+            m_star = calc_design_moments(bmds, positions)
+
+            # hogging or zero moment segments have no meaningful phiMbx
+            undefined = ~(np.isfinite(phi_mbx) & (phi_mbx > 0))
+            phi_mbx = np.where(undefined, np.nan, phi_mbx)
+            utilisation = m_star / np.where(undefined, 1, phi_mbx)
+            utilisation[undefined] = np.nan
+
+            if stats is not None:
+                stats['undefined'] += int(undefined.sum())
+
+            for (k, (case_id, bmd)) in enumerate(cases):
+                results[(member_id, case_id)] = (m_star[k], phi_mbx[k], utilisation[k])
+
+        for (member_id, case_id, bmd) in chunk:
+            (m_star, phi_mbx, utilisation) = results[(member_id, case_id)]
+
+            for segment in range(len(phi_mbx)):
+                yield (member_id, case_id, segment, m_star[segment], phi_mbx[segment],
+                       utilisation[segment])
+
+
+def write_results_csv(rows, path):
+    """Writes result rows to a csv file as they are produced.
+
+    :param rows: Iterable of result rows, e.g. from :func:`check_stream`
+    :param string path: Path to the csv file
+    :returns: Number of rows written
+    :rtype: int
+    """
+
+    n_rows = 0
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_COLUMNS)
+
+        for row in rows:
+            writer.writerow(row)
+            n_rows += 1
+
+    return n_rows
+
+
+def write_results(rows, path, chunk_rows=CHUNK_ROWS):
+    """Writes result rows to a csv, Parquet or Arrow IPC file as they are produced, see
+    :func:`write_results_csv`. Parquet and Arrow IPC files are written *chunk_rows* rows at a
+    time with the column types of :data:`RESULT_DTYPE`.
+
+    :param rows: Iterable of result rows, e.g. from :func:`check_stream`
+    :param string path: Path to the file
+    :param int chunk_rows: Number of rows written at once
+    :returns: Number of rows written
+    :rtype: int
+
+    :raises Exception: If the format of the file is not supported
+    """
+
+    if get_format(path) == 'csv':
+        return write_results_csv(rows, path)
+
+    return write_rows(rows, path, RESULT_DTYPE, chunk_rows)
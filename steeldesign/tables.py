@@ -0,0 +1,419 @@
+import numpy as np
+from steeldesign.codes import COMPACT, NON_COMPACT, PLATE_TYPES, SLENDER, get_labels
+from steeldesign.sections import (UBSection, calc_compactness_x, calc_compactness_y,
+                                  calc_i_section_properties, calc_le_from_m0, calc_moment_ratio)
+
+
+# structured array layout used to store a catalogue of I-sections, one column per property
+SECTION_DTYPE = np.dtype([
+    ('name', 'U32'),
+    ('d', 'f8'),
+    ('bf', 'f8'),
+    ('tf', 'f8'),
+    ('tw', 'f8'),
+    ('r', 'f8'),
+    ('area', 'f8'),
+    ('mass', 'f8'),
+    ('ixx', 'f8'),
+    ('zxx', 'f8'),
+    ('sxx', 'f8'),
+    ('rx', 'f8'),
+    ('iyy', 'f8'),
+    ('zyy', 'f8'),
+    ('syy', 'f8'),
+    ('ry', 'f8'),
+    ('j', 'f8'),
+    ('iw', 'f8'),
+    ('kf', 'f8'),
+])
+
+# order of the section properties in the *props* list of a SteelSection
+PROPS_FIELDS = ('area', 'mass', 'ixx', 'zxx', 'sxx', 'rx', 'iyy', 'zyy', 'syy', 'ry', 'j', 'iw',
+                'kf')
+
+
+class SectionTable:
+    """Columnar table of Universal Beam type sections allowing the capacity of a whole catalogue
+    to be evaluated in single array operations. The methods mirror those of
+    :class:`~steeldesign.sections.UBSection` and return one value per section.
+
+    :param code: Design code
+    :type code: :class:`~steeldesign.codes.DesignCode`
+    :param grade: Steel grade of all sections in the table
+    :type grade: :class:`~steeldesign.codes.SteelGrade`
+    :param data: Section data with dtype :data:`SECTION_DTYPE`
+    :type data: :class:`numpy.ndarray`
+    :param string res_stress: Residual stress class of the sections used to classify their
+        compactness - 'SR', 'HR', 'LW', 'CF', 'HW'
+
+    :cvar fyf: Yield stress of the flanges of each section
+    :vartype fyf: :class:`numpy.ndarray`
+    :cvar fyw: Yield stress of the webs of each section
+    :vartype fyw: :class:`numpy.ndarray`
+    """
+
+    def __init__(self, code, grade, data, res_stress='HR'):
+        """Inits the SectionTable class."""
+
+        self.code = code
+        self.grade = grade
+        self.data = np.asarray(data, dtype=SECTION_DTYPE)
+        self.res_stress = res_stress
+
+        # calculate yield stresses
+        self.fyf = self.grade.get_yield_stress(self.data['tf'])
+        self.fyw = self.grade.get_yield_stress(self.data['tw'])
+
+    @classmethod
+    def from_sections(cls, sections):
+        """Builds a SectionTable from a list of
+        :class:`~steeldesign.sections.UBSection` objects.
+
+        :param sections: List of sections sharing the same design code and steel grade
+        :type sections: list[:class:`~steeldesign.sections.UBSection`]
+        :returns: Section table
+        :rtype: :class:`~steeldesign.tables.SectionTable`
+
+        :raises Exception: If the sections do not share the same design code and steel grade
+        """
+
+        code = sections[0].code
+        grade = sections[0].grade
+
+        for section in sections:
+            if section.code is not code or section.grade.grade != grade.grade:
+                raise Exception('All sections in a SectionTable must share the same code and grade')
+
+        data = np.empty(len(sections), dtype=SECTION_DTYPE)
+
+        for (i, section) in enumerate(sections):
+            data[i] = tuple(
+                np.nan if getattr(section, field) is None else getattr(section, field)
+                for field in SECTION_DTYPE.names
+            )
+
+        return cls(code, grade, data)
+
+    @classmethod
+    def from_geometry(cls, code, grade, d, bf, tf, tw, names=None, res_stress='HW'):
+        """Builds a SectionTable of welded I-sections from arrays of plate dimensions, the section
+        properties are calculated with :func:`~steeldesign.sections.calc_i_section_properties`.
+
+        :param code: Design code
+        :type code: :class:`~steeldesign.codes.DesignCode`
+        :param grade: Steel grade
+        :type grade: :class:`~steeldesign.codes.SteelGrade`
+        :param d: Total depth(s) [mm]
+        :type d: float or :class:`numpy.ndarray`
+        :param bf: Flange width(s) [mm]
+        :type bf: float or :class:`numpy.ndarray`
+        :param tf: Flange thickness(es) [mm]
+        :type tf: float or :class:`numpy.ndarray`
+        :param tw: Web thickness(es) [mm]
+        :type tw: float or :class:`numpy.ndarray`
+        :param names: Name of each section
+        :type names: list[string]
+        :param string res_stress: Residual stress class of the sections, defaults to heavily
+            welded
+        :returns: Section table with one section per broadcast combination of the plate
+            dimensions
+        :rtype: :class:`~steeldesign.tables.SectionTable`
+        """
+
+        (d, bf, tf, tw) = (a.ravel() for a in np.broadcast_arrays(d, bf, tf, tw))
+        data = np.zeros(len(d), dtype=SECTION_DTYPE)
+
+        if names is not None:
+            data['name'] = names
+
+        (data['d'], data['bf'], data['tf'], data['tw']) = (d, bf, tf, tw)
+
+        for (field, values) in calc_i_section_properties(d, bf, tf, tw).items():
+            data[field] = values
+
+        data['kf'] = np.nan
+
+        return cls(code, grade, data, res_stress)
+
+    def __len__(self):
+        """Returns the number of sections in the table."""
+
+        return len(self.data)
+
+    def get_section(self, i):
+        """Returns a :class:`~steeldesign.sections.UBSection` object for the *i*-th row of the
+        table. Its compactness is classified with the hot-rolled limits of a UBSection whatever
+        the residual stress class of the table.
+
+        :param int i: Row index
+        :returns: Section object
+        :rtype: :class:`~steeldesign.sections.UBSection`
+        """
+
+        return build_section(self.code, self.grade, self.data[i])
+
+    def _column(self, name, ndim=1):
+        """Returns the column *name* reshaped to broadcast against an array with *ndim*
+        dimensions whose leading axis is the section axis."""
+
+        return self.data[name].reshape((-1,) + (1,) * (ndim - 1))
+
+    def calc_dw(self):
+        """Returns the depth of the web (d - 2 * tf) of each section.
+
+        :returns: Depth of the web [mm]
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self.data['d'] - 2 * self.data['tf']
+
+    def calc_web_slenderness(self):
+        """Returns the slenderness of the web (dw / tw) of each section.
+
+        :returns: Web slenderness
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self.calc_dw() / self.data['tw']
+
+    def calc_flange_slenderness(self):
+        """Returns the slenderness of the flange ((bf - tw) / (2 * tf)) of each section.
+
+        :returns: Flange slenderness
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return (self.data['bf'] - self.data['tw']) / (2 * self.data['tf'])
+
+    def get_yield_stress(self):
+        """Returns the yield stress of each section, fy = min(fyf, fyw).
+
+        :returns: Yield stress of each section
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return np.minimum(self.fyf, self.fyw)
+
+    def bending_compact_x(self):
+        """Returns the compactness of each section for bending about the x-axis.
+
+        :returns: Compactness code of each section
+            *(COMPACT, NON_COMPACT, SLENDER)*, section slenderness, slenderness limits of size
+            *(n x 3)* and the plate type
+        :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`,
+            :class:`numpy.ndarray`)
+        """
+
+        (compact, lambda_s, lambda_lims, plate_type) = calc_compactness_x(
+            self.calc_flange_slenderness(), self.calc_web_slenderness(), self.fyf, self.fyw,
+            self.code, self.res_stress)
+
+        return (compact, lambda_s, lambda_lims, get_labels(plate_type, PLATE_TYPES))
+
+    def bending_compact_y(self):
+        """Returns the compactness of each section for bending about the y-axis.
+
+        :returns: Compactness code of each section
+            *(COMPACT, NON_COMPACT, SLENDER)*, section slenderness, slenderness limits of size
+            *(n x 3)* and the plate type
+        :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`,
+            :class:`numpy.ndarray`)
+        """
+
+        (compact, lambda_s, lambda_lims, plate_type) = calc_compactness_y(
+            self.calc_flange_slenderness(), self.fyf, self.code, self.res_stress)
+
+        return (compact, lambda_s, lambda_lims, get_labels(plate_type, PLATE_TYPES))
+
+    def calc_ze(self, axis):
+        """Returns the effective section modulus of each section.
+
+        Cl. 5.2.3, Cl. 5.2.4, Cl. 5.2.5 AS4100-1998
+
+        :param string axis: Axis of bending - 'x' or 'y'
+        :returns: Effective section modulus of each section
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        if axis == 'x':
+            z = self.data['zxx']
+            s = self.data['sxx']
+            (compact, lambda_s, lambda_lims, plate_type) = self.bending_compact_x()
+
+        elif axis == 'y':
+            z = self.data['zyy']
+            s = self.data['syy']
+            (compact, lambda_s, lambda_lims, plate_type) = self.bending_compact_y()
+
+        zc = np.minimum(1.5 * z, s)
+        lambda_sp = lambda_lims[:, 0]
+        lambda_sy = lambda_lims[:, 1]
+
+        ze_nc = z + (zc - z) * (lambda_sy - lambda_s) / (lambda_sy - lambda_sp)
+
+        ze_s = np.where(
+            np.isin(plate_type, ['Uniform1', 'Uniform2']),
+            z * lambda_sy / lambda_s,
+            z * (lambda_sy / lambda_s) ** 2
+        )
+
+        return np.select([compact == COMPACT, compact == NON_COMPACT, compact == SLENDER],
+                         [zc, ze_nc, ze_s])
+
+    def calc_phi_msx(self):
+        """Returns the design section moment capacity of each section about the x-axis.
+
+        :returns: phiMsx [kN.m]
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self.code.phi_member * self.get_yield_stress() * self.calc_ze(axis='x') / 1e6
+
+    def calc_phi_msy(self):
+        """Returns the design section moment capacity of each section about the y-axis.
+
+        :returns: phiMsy [kN.m]
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self.code.phi_member * self.get_yield_stress() * self.calc_ze(axis='y') / 1e6
+
+    def calc_m0(self, le):
+        """Returns the reference buckling moment, M0, of each section.
+
+        *le* is broadcast against the section axis: a scalar gives one value per section, an
+        array of size *(n)* gives one value per section for its own length and an array of size
+        *(1 x m)* or *(n x m)* gives a *(n x m)* table.
+
+        :param le: Effective length of the segment under consideration
+        :type le: float or :class:`numpy.ndarray`
+        :returns: Reference buckling moment [kN.m]
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        le = np.asarray(le, dtype=float)
+        ndim = max(le.ndim, 1)
+        e = self.code.elastic_modulus
+        g = self.code.shear_modulus
+        iyy = self._column('iyy', ndim)
+        j = self._column('j', ndim)
+        iw = self._column('iw', ndim)
+
+        return 1e-6 * np.sqrt(((np.pi ** 2 * e * iyy) / (le ** 2)) * (
+            g * j + (np.pi ** 2 * e * iw / (le ** 2)))
+        )
+
+    def calc_phi_mbx(self, le, alpha_m=1):
+        """Returns the design member moment capacity of each section about the x-axis.
+
+        *le* and *alpha_m* are broadcast against the section axis as described in
+        :meth:`calc_m0`.
+
+        :param le: Effective length of the segment under consideration
+        :type le: float or :class:`numpy.ndarray`
+        :param alpha_m: Moment modification factor
+        :type alpha_m: float or :class:`numpy.ndarray`
+        :returns: phiMbx [kN.m]
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        # get section capacity
+        m0 = self.calc_m0(le)
+        msx = (self.calc_phi_msx() / self.code.phi_member).reshape(
+            (-1,) + (1,) * (m0.ndim - 1))
+
+        # calculate alpha_s
+        alpha_s = 0.6 * (np.sqrt((msx / m0) ** 2 + 3) - msx / m0)
+
+        return self.code.phi_member * alpha_m * alpha_s * msx
+
+    def calc_le(self, m0):
+        """Returns the effective length at which the reference buckling moment of each section
+        equals *m0*, i.e. the inverse of :meth:`calc_m0`. *m0* is broadcast against the section
+        axis as described in :meth:`calc_m0`.
+
+        :param m0: Reference buckling moment [kN.m]
+        :type m0: float or :class:`numpy.ndarray`
+        :returns: Effective length [mm]
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        m0 = np.asarray(m0, dtype=float)
+        ndim = max(m0.ndim, 1)
+
+        return calc_le_from_m0(m0, self._column('iyy', ndim), self._column('j', ndim),
+                               self._column('iw', ndim), self.code.elastic_modulus,
+                               self.code.shear_modulus)
+
+    def full_restraint_length(self, alpha_m):
+        """Returns the segment length at which phiMbx equals phiMsx for each section and each
+        value of *alpha_m*.
+
+        phiMbx = phiMsx when alpha_m * alpha_s = 1, which is inverted in closed form for Ms / M0
+        and then for le, so the whole table is solved at once without iteration. No solution
+        exists when alpha_m * max(alpha_s) <= 1, i.e. alpha_m <= 1 / (0.6 * sqrt(3)).
+
+        :param alpha_m: Moment modification factor(s)
+        :type alpha_m: float or :class:`numpy.ndarray`
+        :returns: Full restraint lengths, of size *(n)* for a scalar *alpha_m* or *(n x m)* for
+            *m* values of *alpha_m*, and a boolean array of the same size indicating whether a
+            solution exists for each entry *(le is nan where it does not)*
+        :rtype: tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+        """
+
+        alpha_m = np.asarray(alpha_m, dtype=float)
+        ms = self.calc_phi_msx() / self.code.phi_member
+
+        if alpha_m.ndim > 0:
+            alpha_m = alpha_m.reshape(1, -1)
+            ms = ms[:, None]
+
+        # ratio ms / m0 at which alpha_m * alpha_s = 1
+        ratio = calc_moment_ratio(1 / alpha_m)
+        le = self.calc_le(ms / ratio)
+
+        return (le, np.isfinite(le))
+
+    def full_restraint_length_simple(self, beta_m=-1):
+        """Returns the maximum segment length for which each section is considered fully
+        laterally restrained as defined by Cl. 5.3.2.4 AS4100-1998.
+
+        :param float beta_m: Factor dependent on the bending moments within the segment
+        :returns: Maximum segment length for which each section is considered fully laterally
+            restrained
+        :rtype: :class:`numpy.ndarray`
+        """
+
+        return self.data['ry'] * (80 + 50 * beta_m) * np.sqrt(250 / self.get_yield_stress())
+
+
+def build_section(code, grade, row):
+    """Builds a :class:`~steeldesign.sections.UBSection` object from a section record.
+
+    :param code: Design code
+    :type code: :class:`~steeldesign.codes.DesignCode`
+    :param grade: Steel grade
+    :type grade: :class:`~steeldesign.codes.SteelGrade`
+    :param row: Section record with dtype :data:`SECTION_DTYPE`
+    :type row: :class:`numpy.void`
+    :returns: Section object
+    :rtype: :class:`~steeldesign.sections.UBSection`
+    """
+
+    return UBSection(code=code, name=str(row['name']), d=float(row['d']), bf=float(row['bf']),
+                     tf=float(row['tf']), tw=float(row['tw']), r=float(row['r']), grade=grade,
+                     props=get_props(row))
+
+
+def get_props(row):
+    """Returns the list of section properties expected by
+    :class:`~steeldesign.sections.SteelSection` from a section record, with *nan* replaced by
+    *None*.
+
+    :param row: Section record with dtype :data:`SECTION_DTYPE`
+    :type row: :class:`numpy.void`
+    :returns: List of section properties
+    :rtype: list[float]
+    """
+
+    return [None if np.isnan(row[field]) else float(row[field]) for field in PROPS_FIELDS]
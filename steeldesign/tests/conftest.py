@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from steeldesign.codes import DesignCode, SteelGrade, Restraint
+from steeldesign.sections import UBSection
+from steeldesign.member import Member
+
+
+# catalogue shipped with the tests
+UB_CSV = 'steeldesign/tests/ub.csv'
+
+
+@pytest.fixture(scope='session')
+def code():
+    return DesignCode()
+
+
+@pytest.fixture(scope='session')
+def grade():
+    return SteelGrade('3679.1-300')
+
+
+@pytest.fixture
+def section(code, grade):
+    """250UB37.3 section of tests/test.py."""
+
+    props = [4750, None, 55700000, 435000, 486000, 108, 5660000, 77500, 119000, 34.5, 158000,
+             85200000000, 1]
+
+    return UBSection(code=code, name='250UB37.3', d=256, bf=146, tf=10.9, tw=6.4, r=8.9,
+                     grade=grade, props=props)
+
+
+@pytest.fixture
+def member(section):
+    """12 m F-L-L-F member of tests/test.py."""
+
+    restraints = [Restraint('F', 0), Restraint('L', 0.4), Restraint('L', 0.7), Restraint('F', 1)]
+
+    return Member(section=section, length=12000, restraints=restraints)
+
+
+def make_bmd(scale, offset=0, n_points=21):
+    """Returns a parabolic bending moment diagram with peak *scale* plus a linear moment rising
+    to *offset*, sampled at *n_points* stations."""
+
+    x = np.linspace(0, 1, n_points)
+
+    return np.column_stack((x, 4 * scale * x * (1 - x) + offset * x))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from steeldesign.batch import calc_phi_mbx_batch, calc_phi_mbx_ragged
+from steeldesign.codes import Restraint
+from steeldesign.member import Member, calc_design_moments
+
+
+def make_checks(section, n_members=40, seed=1):
+    """Returns members with varying restraints, numbers of load cases and bmd stations."""
+
+    rng = np.random.default_rng(seed)
+    (members, bmds, load_positions) = ([], [], [])
+
+    for i in range(n_members):
+        n_seg = int(rng.integers(1, 5))
+        positions = [0] + sorted(rng.choice(np.arange(1, 20), n_seg - 1, replace=False) / 20) + [1]
+        rtypes = ['F'] + list(rng.choice(['F', 'L', 'P'], n_seg - 1)) + ['F']
+        members.append(Member(section, 3000 + 1000 * rng.random(),
+                              [Restraint(rtype, pos) for (rtype, pos) in zip(rtypes, positions)]))
+
+        cases = []
+
+        for case in range(int(rng.integers(1, 4))):
+            # some diagrams do not span the member or include the restraint positions
+            x = np.sort(np.concatenate(([0, 1], rng.random(int(rng.integers(0, 12))))))
+
+            if case == 1:
+                x = np.linspace(0.1, 0.9, 5)
+            elif case == 2:
+                x = np.unique(np.concatenate((x, positions)))
+
+            cases.append(np.column_stack((x, 100 * rng.standard_normal(len(x)))))
+
+        bmds.append(cases)
+        load_positions.append(list(rng.choice(['WS', 'WT', 'ES'], n_seg)))
+
+    return (members, bmds, load_positions)
+
+
+def test_ragged_matches_batch(section):
+    (members, bmds, load_positions) = make_checks(section)
+
+    with np.errstate(all='ignore'):
+        results = calc_phi_mbx_ragged(members, bmds, load_positions)
+
+        for (i, member) in enumerate(members):
+            positions = np.array([restraint.pos for restraint in member.restraints])
+            (m_star, phi_mbx) = results[i]
+
+            np.testing.assert_allclose(m_star, calc_design_moments(bmds[i], positions))
+            np.testing.assert_allclose(
+                phi_mbx, calc_phi_mbx_batch([member], [bmds[i]], [load_positions[i]])[0])
+
+
+def test_ragged_load_position_size(section):
+    (members, bmds, load_positions) = make_checks(section, n_members=3)
+    load_positions[1] = load_positions[1] + ['WS']
+
+    with pytest.raises(Exception, match='Size of load_position'):
+        calc_phi_mbx_ragged(members, bmds, load_positions)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from steeldesign import buckling
+from steeldesign.codes import Restraint
+from steeldesign.member import Member
+from steeldesign.tests.conftest import make_bmd
+
+
+LOAD_POSITION = ['WS', 'WS', 'WS']
+
+
+def test_segment_buckling_two_l_ends(member):
+    # the middle segment of the F-L-L-F member of tests/test.py has two L ends
+    bmd = make_bmd(50)
+    phi_mbx = member.calc_phi_mbx(bmd=bmd, load_position=LOAD_POSITION, buckling_analysis=True)
+    code = member.calc_phi_mbx(bmd=bmd, load_position=LOAD_POSITION)
+
+    assert np.isfinite(phi_mbx).all()
+
+    # L ends are analysed as F, as kt = 1 in Cl. 5.6.3
+    assert np.allclose(phi_mbx, code, rtol=0.15)
+
+
+def test_segment_buckling_without_twist_restraint(section):
+    member = Member(section=section, length=6000, restraints=[Restraint('U', 0),
+                                                               Restraint('U', 1)])
+
+    with pytest.raises(Exception, match='do not prevent twist'):
+        member.calc_phi_mbx(bmd=make_bmd(50), load_position=['WS'], buckling_analysis=True)
+
+
+def test_shift_halving_limit(member, monkeypatch):
+    monkeypatch.setattr(buckling, 'SHIFT_RATIO', 1e6)
+    monkeypatch.setattr(buckling, 'MAX_SHIFT_HALVINGS', 2)
+    buckling.STIFFNESS_CACHE.clear()
+
+    with pytest.raises(Exception, match='within 2 halvings'):
+        member.calc_phi_mbx(bmd=make_bmd(50), load_position=LOAD_POSITION,
+                            buckling_analysis=True)
+
+
+def test_member_buckling_alpha_m(member):
+    # alpha_m of the magnitude of the moments, as used for the effective lengths
+    bmd = make_bmd(50)
+    hogging = bmd * [1, -1]
+    phi_mbx = member.calc_phi_mbx(bmd=bmd, load_position=LOAD_POSITION,
+                                  buckling_analysis='member')
+
+    assert np.allclose(member.calc_phi_mbx(bmd=hogging, load_position=LOAD_POSITION,
+                                           buckling_analysis='member'), phi_mbx)
+
+    (load_factor, mob, le, alpha_m) = buckling.calc_member_buckling(member, hogging,
+                                                                    LOAD_POSITION)
+
+    assert (alpha_m > 0).all()
+    assert np.allclose([member.section.calc_m0(le=le_i) * am for (le_i, am) in zip(le, alpha_m)],
+                       mob)
+
+
+@pytest.mark.parametrize('mode', [True, 'segment', 'member'])
+def test_buckling_rejects_alpha_m(member, mode):
+    with pytest.raises(Exception, match='cannot be overridden'):
+        member.calc_phi_mbx(bmd=make_bmd(50), load_position=LOAD_POSITION, alpha_m=[1, 1, 1],
+                            buckling_analysis=mode)
@@ -0,0 +1,59 @@
+import csv
+import numpy as np
+import pytest
+from steeldesign import cli
+from steeldesign.tests.conftest import UB_CSV, make_bmd
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('STEELDESIGN_CACHE_DIR', str(tmp_path))
+
+
+def write_csv(path, header, rows):
+    """Writes a csv file and returns its path."""
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+    return str(path)
+
+
+def run_cli(tmp_path, scales):
+    """Runs the command on a 6 m F-L-F member with a parabolic bending moment diagram of each
+    scale and returns the exit status and the result rows."""
+
+    bmds = [('M1', 'C{0}'.format(i), x, m)
+            for (i, scale) in enumerate(scales) for (x, m) in make_bmd(scale)]
+    output = tmp_path / 'results.csv'
+    status = cli.main([
+        '--sections', UB_CSV,
+        '--members', write_csv(tmp_path / 'members.csv', ('member', 'section', 'length'),
+                               [('M1', '250UB37.3', 6000)]),
+        '--restraints', write_csv(tmp_path / 'restraints.csv', ('member', 'pos', 'rtype'),
+                                  [('M1', 0, 'F'), ('M1', 0.5, 'L'), ('M1', 1, 'F')]),
+        '--bmd', write_csv(tmp_path / 'bmd.csv', ('member', 'case', 'pos', 'moment'), bmds),
+        '--output', str(output),
+        '--quiet',
+    ])
+
+    with open(output, newline='') as f:
+        return (status, list(csv.DictReader(f)))
+
+
+def test_cli_sagging(tmp_path, capsys):
+    (status, rows) = run_cli(tmp_path, [50])
+
+    assert status == 0 and capsys.readouterr().err == ''
+    assert len(rows) == 2 and all(float(row['phi_mbx']) > 0 for row in rows)
+
+
+def test_cli_reports_hogging(tmp_path, capsys):
+    (status, rows) = run_cli(tmp_path, [50, -50])
+
+    assert status == cli.UNDEFINED_STATUS
+    assert '2 segments with an undefined phiMbx' in capsys.readouterr().err
+    assert [np.isnan(float(row['phi_mbx'])) for row in rows] == [False, False, True, True]
+    assert all(np.isnan(float(row['utilisation'])) for row in rows if row['case'] == 'C1')
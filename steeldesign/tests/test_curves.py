@@ -0,0 +1,22 @@
+import pytest
+from steeldesign import curves
+from steeldesign.curves import PhiMbxCurve
+
+
+def test_curve_within_tolerance(section):
+    curve = PhiMbxCurve(section, tol=1e-6)
+
+    assert curve.verify() <= 1e-6
+
+
+@pytest.mark.parametrize('tol', [0, 1e-16, -1e-5, 1])
+def test_curve_rejects_tolerance(section, tol):
+    with pytest.raises(Exception, match='tol must be between'):
+        PhiMbxCurve(section, tol=tol)
+
+
+def test_curve_refinement_limit(section, monkeypatch):
+    monkeypatch.setattr(curves, 'MAX_REFINEMENTS', 2)
+
+    with pytest.raises(Exception, match='within 2 refinements'):
+        PhiMbxCurve(section, tol=1e-8)
@@ -0,0 +1,81 @@
+import numpy as np
+from steeldesign.batch import calc_effective_lengths
+from steeldesign.envelope import check_governing
+from steeldesign.member import calc_alpha_m_segments, calc_design_moments
+from steeldesign.tests.conftest import make_bmd
+
+
+LOAD_POSITION = ['WS', 'WS', 'WT']
+
+
+def check_each_case(member, bmds, load_position):
+    """Returns the utilisation of each segment from checking every case one by one, checking
+    cases without a sagging moment in the segment against phiMsx alone."""
+
+    positions = np.array([restraint.pos for restraint in member.restraints])
+    le = calc_effective_lengths(member, load_position)
+    phi_msx = member.section.calc_phi_msx()
+    utilisation = []
+
+    for bmd in bmds:
+        m_star = calc_design_moments(bmd, positions)
+        alpha_m = calc_alpha_m_segments(bmd, positions)
+
+        with np.errstate(invalid='ignore'):
+            valid = np.isfinite(alpha_m) & (alpha_m > 0)
+
+        phi_mbx = member.section.calc_phi_mbx(le=le, alpha_m=np.where(valid, alpha_m, 1))
+        utilisation.append(m_star / np.where(valid, np.minimum(phi_mbx, phi_msx), phi_msx))
+
+    return np.array(utilisation)
+
+
+def assert_governing(member, bmds):
+    expected = check_each_case(member, bmds, LOAD_POSITION)
+    (cases, utilisation, phi_mbx) = check_governing(member, np.array(bmds), LOAD_POSITION)
+
+    np.testing.assert_allclose(utilisation, expected.max(axis=0))
+    np.testing.assert_allclose(expected[cases, np.arange(len(cases))], utilisation)
+
+
+def test_governing_matches_each_case(member):
+    bmds = [make_bmd(scale, offset) for scale in (20, 50, 80) for offset in (-30, 0, 40)]
+
+    assert_governing(member, bmds)
+
+
+def test_governing_skips_zero_moment(member):
+    bmd = make_bmd(50)
+    zeros = make_bmd(0)
+
+    for (bmds, governing) in (([bmd, zeros], 0), ([zeros, bmd], 1)):
+        assert_governing(member, bmds)
+        (cases, utilisation, phi_mbx) = check_governing(member, np.array(bmds), LOAD_POSITION)
+
+        assert np.isfinite(utilisation).all() and (cases == governing).all()
+
+
+def test_governing_checks_hogging_section(member):
+    bmd = make_bmd(50)
+    hogging = make_bmd(-200)
+    positions = np.array([restraint.pos for restraint in member.restraints])
+    exceeds = calc_design_moments(hogging, positions) > member.section.calc_phi_msx()
+
+    assert_governing(member, [hogging, bmd])
+    (cases, utilisation, phi_mbx) = check_governing(member, np.array([hogging, bmd]),
+                                                    LOAD_POSITION)
+
+    assert exceeds.any()
+    assert (cases[exceeds] == 0).all() and np.isnan(phi_mbx[exceeds]).all()
+    assert (utilisation[exceeds] > 1).all()
+
+
+def test_governing_without_valid_case(member):
+    hogging = make_bmd(-50)
+    (cases, utilisation, phi_mbx) = check_governing(
+        member, np.array([make_bmd(0), hogging]), LOAD_POSITION)
+    positions = np.array([restraint.pos for restraint in member.restraints])
+
+    np.testing.assert_allclose(
+        utilisation, calc_design_moments(hogging, positions) / member.section.calc_phi_msx())
+    assert np.isnan(phi_mbx).all() and (cases == 1).all()
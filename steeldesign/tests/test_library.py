@@ -0,0 +1,29 @@
+import pytest
+from steeldesign.library import SectionLibrary
+from steeldesign.tests.conftest import UB_CSV
+
+
+@pytest.fixture
+def library(code, grade, tmp_path, monkeypatch):
+    monkeypatch.setenv('STEELDESIGN_CACHE_DIR', str(tmp_path))
+
+    return SectionLibrary(UB_CSV, code, grade)
+
+
+def test_library_index(library):
+    assert library[-1] is library[len(library) - 1]
+    assert library[0].name == library.get_names()[0]
+
+    for i in (len(library), -len(library) - 1):
+        with pytest.raises(IndexError):
+            library[i]
+
+
+def test_library_matches_table(library):
+    table = library.get_table()
+
+    for i in (0, len(library) - 1):
+        (section, row) = (library[i], table.get_section(i))
+
+        assert section.name == row.name and section.ixx == row.ixx and section.iw == row.iw
+        assert section.calc_phi_msx() == row.calc_phi_msx()
@@ -0,0 +1,18 @@
+import pytest
+
+
+def test_section_yield_stress_assignment(section):
+    phi_msx = section.calc_phi_msx()
+
+    assert (section.fyf, section.fyw) == (320, 320)
+
+    section.fyf = 250
+    section.fyw = 250
+
+    assert (section.fyf, section.fyw) == (250, 250)
+    assert section.calc_phi_msx() == pytest.approx(phi_msx * 250 / 320)
+
+    section.fyf = None
+    section.fyw = None
+
+    assert section.fyf == 320 and section.calc_phi_msx() == phi_msx
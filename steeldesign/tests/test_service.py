@@ -0,0 +1,80 @@
+import asyncio
+import json
+import pytest
+from steeldesign.service import DesignService
+from steeldesign.tests.conftest import UB_CSV
+
+
+CHECK = {
+    'section': '310UB40.4',
+    'length': 6000,
+    'restraints': [['F', 0], ['L', 0.5], ['F', 1]],
+    'load_position': 'WS',
+}
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('STEELDESIGN_CACHE_DIR', str(tmp_path))
+
+
+async def post(port, data):
+    """Posts a check to the service and returns the status code and response."""
+
+    (reader, writer) = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(data).encode()
+    writer.write('POST /check HTTP/1.1\r\nHost: localhost\r\nContent-Length: {0}\r\n'
+                 'Connection: close\r\n\r\n'.format(len(body)).encode() + body)
+    await writer.drain()
+
+    (head, body) = (await reader.read()).split(b'\r\n\r\n', 1)
+    writer.close()
+
+    return (int(head.split()[1]), json.loads(body))
+
+
+def check(*requests):
+    """Starts a service, posts the requests concurrently and returns the responses."""
+
+    async def run():
+        service = DesignService(UB_CSV, max_workers=0)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+
+        try:
+            return await asyncio.gather(*[post(port, data) for data in requests])
+        finally:
+            server.close()
+            service.close()
+
+    return asyncio.run(run())
+
+
+def test_service_sagging():
+    ((status, response),) = check(dict(CHECK, bmd=[[0, 50], [0.5, 100], [1, 50]]))
+
+    assert status == 200 and response['warnings'] == []
+    assert response['m_star'] == [[100, 100]]
+    assert all(phi > 0 for phi in response['phi_mbx'][0])
+    assert response['utilisation'][0][0] == pytest.approx(100 / response['phi_mbx'][0][0])
+
+
+def test_service_hogging_undefined():
+    ((status, response), (status2, response2)) = check(
+        dict(CHECK, bmds=[[[0, -50], [0.5, -100], [1, -50]], [[0, 50], [0.5, 100], [1, 50]]]),
+        dict(CHECK, bmd=[[0, 0], [0.5, 0], [1, 0]]))
+
+    # a hogging case does not pass with a negative utilisation
+    assert status == 200
+    assert response['phi_mbx'][0] == [None, None] and response['utilisation'][0] == [None, None]
+    assert all(phi > 0 for phi in response['phi_mbx'][1])
+    assert len(response['warnings']) == 2 and 'load case 0 segment 1' in response['warnings'][1]
+
+    assert status2 == 200 and response2['utilisation'] == [[None, None]]
+    assert len(response2['warnings']) == 2
+
+
+def test_service_invalid_request():
+    ((status, response),) = check(dict(CHECK, section='XX', bmd=[[0, 1], [1, 1]]))
+
+    assert status == 400 and response['error'] == 'Section XX is not in the library'
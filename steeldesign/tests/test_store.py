@@ -0,0 +1,31 @@
+import numpy as np
+from steeldesign.store import ResultStore, calc_source_hash
+from steeldesign.tests.conftest import make_bmd
+
+
+LOAD_POSITION = ['WS', 'WS', 'WT']
+
+
+def test_store_salted_with_source(tmp_path):
+    with ResultStore(str(tmp_path / 'results.db')) as store:
+        assert store.salt == calc_source_hash()
+
+    assert calc_source_hash(('codes', 'sections')) != calc_source_hash(('codes', 'member'))
+
+
+def test_store_salt_changes_keys(tmp_path, member):
+    bmd = make_bmd(50)
+    path = str(tmp_path / 'results.db')
+
+    with ResultStore(path) as store:
+        phi_mbx = store.calc_phi_mbx(member, bmd, LOAD_POSITION)
+        key = store.make_key(member, bmd, LOAD_POSITION)
+
+    with ResultStore(path) as store:
+        assert store.calc_phi_mbx(member, bmd, LOAD_POSITION) == phi_mbx
+        assert store.stats.hits == 1
+
+    with ResultStore(path, salt='other') as store:
+        assert store.make_key(member, bmd, LOAD_POSITION) != key
+        assert np.allclose(store.calc_phi_mbx(member, bmd, LOAD_POSITION), phi_mbx)
+        assert store.stats.hits == 0
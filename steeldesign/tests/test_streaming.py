@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from steeldesign.streaming import check_stream, write_results
+from steeldesign.tests.conftest import make_bmd
+
+
+LOAD_POSITIONS = {'M1': ['WS', 'WS', 'WT']}
+
+
+def stream_cases(member, stats=None):
+    blocks = [('M1', 'sagging', make_bmd(50)), ('M1', 'hogging', make_bmd(-50)),
+              ('M1', 'zero', make_bmd(0))]
+
+    return check_stream(blocks, {'M1': member}, LOAD_POSITIONS, chunk_size=2, stats=stats)
+
+
+def test_stream_undefined_phi_mbx(member):
+    stats = {}
+    rows = list(stream_cases(member, stats))
+    results = {case: np.array([row[3:] for row in rows if row[1] == case], dtype=float)
+               for case in ('sagging', 'hogging', 'zero')}
+
+    assert len(rows) == 9 and stats['undefined'] == 6
+    assert (results['sagging'][:, 1] > 0).all()
+    np.testing.assert_allclose(results['sagging'][:, 2],
+                               results['sagging'][:, 0] / results['sagging'][:, 1])
+
+    for case in ('hogging', 'zero'):
+        assert np.isnan(results[case][:, 1:]).all()
+
+
+def test_stream_writes_undefined_phi_mbx(member, tmp_path):
+    path = tmp_path / 'results.csv'
+
+    assert write_results(stream_cases(member), str(path)) == 9
+
+    lines = path.read_text().splitlines()
+
+    assert lines[0] == 'member,case,segment,m_star,phi_mbx,utilisation'
+    assert all(line.endswith(',nan,nan') for line in lines[4:])
+
+
+def test_stream_writes_undefined_phi_mbx_as_null(member, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'results.parquet'
+
+    write_results(stream_cases(member), str(path))
+    table = pq.read_table(str(path))
+
+    assert table.column('phi_mbx').null_count == 6
+    assert table.column('utilisation').null_count == 6
@@ -0,0 +1,21 @@
+from steeldesign.codes import COMPACT, NON_COMPACT
+from steeldesign.tables import SectionTable
+
+
+def test_from_geometry_welded_limits(code, grade):
+    welded = SectionTable.from_geometry(code, grade, 600, 250, 16, 10)
+    hot_rolled = SectionTable(code, grade, welded.data, res_stress='HR')
+
+    assert welded.res_stress == 'HW'
+
+    # flange slenderness of 8.2 is within the hot-rolled plasticity limit of 9 only
+    for method in ('bending_compact_x', 'bending_compact_y'):
+        (compact, lambda_s, lambda_lims, plate_type) = getattr(welded, method)()
+        assert compact[0] == NON_COMPACT and lambda_lims[0, 0] == 8
+        assert getattr(hot_rolled, method)()[0][0] == COMPACT
+
+
+def test_from_geometry_res_stress(code, grade):
+    table = SectionTable.from_geometry(code, grade, 600, 250, 16, 10, res_stress='HR')
+
+    assert table.bending_compact_x()[0][0] == COMPACT